@@ -0,0 +1,188 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows.
+    resource = None
+
+try:
+    from time import perf_counter as clock
+except ImportError:
+    from timeit import default_timer as clock
+
+
+MODULE_TEMPLATE = """\
+from benchmarks.trees import build_tree
+
+build_tree({name!r}, globals(), scale={scale!r})
+"""
+
+
+def peak_memory():
+    """The most memory this process has used so far, in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+def write_module(directory, name, scale):
+    """Write a test module that builds the tree, and return its name."""
+    module_name = "test_{}".format(name)
+    path = os.path.join(directory, module_name + ".py")
+    with open(path, "w") as f:
+        f.write(MODULE_TEMPLATE.format(name=name, scale=scale))
+    return module_name
+
+
+def run_unittest(directory, module_name):
+    start_time = clock()
+    sys.path.insert(0, directory)
+    module = __import__(module_name)
+    suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+    collected_time = clock()
+    with open(os.devnull, "w") as stream:
+        runner = unittest.TextTestRunner(stream=stream, verbosity=2)
+        result = runner.run(suite)
+    return (
+        collected_time - start_time,
+        clock() - collected_time,
+        result.testsRun,
+    )
+
+
+class PytestTimer(object):
+
+    def pytest_sessionstart(self, session):
+        self.start_time = clock()
+
+    def pytest_collection_finish(self, session):
+        self.collected_time = clock()
+        self.tests = len(session.items)
+
+    def pytest_sessionfinish(self, session):
+        self.finish_time = clock()
+
+
+def run_pytest(directory, module_name):
+    import pytest
+    timer = PytestTimer()
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        pytest.main(
+            [
+                os.path.join(directory, module_name + ".py"),
+                "-v",
+                "-p", "contextional.pytest_contextional",
+                "-p", "no:cacheprovider",
+            ],
+            plugins=[timer],
+        )
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return (
+        timer.collected_time - timer.start_time,
+        timer.finish_time - timer.collected_time,
+        timer.tests,
+    )
+
+
+def run_nose(directory, module_name):
+    import nose
+
+    class NoseRunner(nose.core.TextTestRunner):
+
+        def run(self, test):
+            self.result = super(NoseRunner, self).run(test)
+            return self.result
+
+    # nose collects lazily while it runs the tests, so the module is imported
+    # (which is when Contextional builds the tests) before nose starts.
+    start_time = clock()
+    sys.path.insert(0, directory)
+    __import__(module_name)
+    collected_time = clock()
+    with open(os.devnull, "w") as stream:
+        runner = NoseRunner(stream=stream, verbosity=2)
+        nose.core.TestProgram(
+            argv=[
+                "nosetests",
+                os.path.join(directory, module_name + ".py"),
+                "-v",
+            ],
+            exit=False,
+            testRunner=runner,
+        )
+    return (
+        collected_time - start_time,
+        clock() - collected_time,
+        runner.result.testsRun,
+    )
+
+
+RUNNERS = {
+    "unittest": run_unittest,
+    "pytest": run_pytest,
+    "nose": run_nose,
+}
+
+
+def measure(name, runner, scale=1.0):
+    """Measure how Contextional handles one of the trees with one runner.
+
+    :param name: The name of the tree.
+    :type name: str
+    :param runner: The name of the testing framework to run it with.
+    :type runner: str
+    :param scale: How big the tree should be, compared to its full size.
+    :type scale: float
+    :returns: The number of ``"tests"``, the seconds spent on ``"collect"``,
+        the seconds spent on each test (``"per_test"``), and the bytes of
+        ``"memory"`` used beyond what the interpreter started with.
+    :rtype: dict
+
+    This should be run in a fresh process for each measurement, as
+    Contextional keeps the tests and groups it has seen for the life of the
+    process.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        module_name = write_module(directory, name, scale)
+        start_memory = peak_memory()
+        collect, run, tests = RUNNERS[runner](directory, module_name)
+        end_memory = peak_memory()
+    finally:
+        shutil.rmtree(directory)
+    return {
+        "tree": name,
+        "runner": runner,
+        "scale": scale,
+        "tests": tests,
+        "collect": collect,
+        "run": run,
+        "per_test": run / tests if tests else None,
+        "memory": (
+            None if start_memory is None else end_memory - start_memory
+        ),
+    }
+
+
+if __name__ == "__main__":
+    name, runner, scale, output = sys.argv[1:]
+    # make Contextional's output go nowhere, so only its work is measured.
+    sys.stderr = open(os.devnull, "w")
+    result = measure(name, runner, float(scale))
+    with open(output, "w") as f:
+        json.dump(result, f)
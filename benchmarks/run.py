@@ -0,0 +1,121 @@
+"""Measure Contextional's own overhead on synthetic trees of groups.
+
+Each tree is run with each testing framework in a fresh process, and the time
+spent collecting the tests, the time spent per test, and the extra peak memory
+are reported, so changes to Contextional can be compared with numbers.
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.measure import RUNNERS
+from benchmarks.trees import TREES
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_measurement(name, runner, scale):
+    """Take a measurement in a fresh process.
+
+    :returns: The measurement, or ``None`` if it couldn't be taken (e.g.
+        because the testing framework isn't installed).
+    """
+    handle, output = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [ROOT] + [p for p in [env.get("PYTHONPATH")] if p],
+    )
+    try:
+        code = subprocess.call(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.measure",
+                name,
+                runner,
+                repr(scale),
+                output,
+            ],
+            env=env,
+            cwd=ROOT,
+        )
+        if code != 0:
+            return None
+        with open(output, "r") as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def format_row(result):
+    per_test = result["per_test"]
+    memory = result["memory"]
+    return "{:<14} {:<10} {:>7} {:>11.3f} {:>13} {:>11}".format(
+        result["tree"],
+        result["runner"],
+        result["tests"],
+        result["collect"],
+        # there's no time per test if no tests were run.
+        "n/a" if per_test is None else "{:.1f}".format(per_test * 1e6),
+        "?" if memory is None else "{:.1f}".format(memory / 1024.0 ** 2),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--trees",
+        nargs="+",
+        choices=sorted(TREES),
+        default=sorted(TREES),
+    )
+    parser.add_argument(
+        "--runners",
+        nargs="+",
+        choices=sorted(RUNNERS),
+        default=sorted(RUNNERS),
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="how big the trees should be, compared to their full size.",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="PATH",
+        help="also write the measurements to PATH.",
+    )
+    args = parser.parse_args(argv)
+
+    print("{:<14} {:<10} {:>7} {:>11} {:>13} {:>11}".format(
+        "tree", "runner", "tests", "collect (s)", "per test (us)",
+        "memory (MB)",
+    ))
+    results = []
+    for name in args.trees:
+        for runner in args.runners:
+            result = run_measurement(name, runner, args.scale)
+            if result is None:
+                print("{:<14} {:<10} failed (is it installed?)".format(
+                    name,
+                    runner,
+                ))
+                continue
+            results.append(result)
+            print(format_row(result))
+            sys.stdout.flush()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
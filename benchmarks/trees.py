@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+# every test and fixture is empty, so all of the time and memory they take is
+# spent by Contextional and the testing framework.
+
+
+def setup(*args):
+    pass
+
+
+def teardown():
+    pass
+
+
+def test(case):
+    pass
+
+
+def add_fixtures_and_test():
+    GCM.add_setup(setup)
+    GCM.add_teardown(teardown)
+    GCM.add_test("test")(test)
+
+
+def deep(scale=1.0):
+    """A single chain of nested groups, each with a setup, teardown, and test.
+
+    50 levels deep at full scale.
+    """
+    levels = max(1, int(50 * scale))
+
+    def add_levels(level):
+        if level == levels:
+            return
+        with GCM.add_group("Level {}".format(level)):
+            add_fixtures_and_test()
+            add_levels(level + 1)
+
+    with GCM("Deep") as root:
+        add_levels(0)
+    return root
+
+
+def wide(scale=1.0):
+    """A single group with lots of child groups, each with a single test.
+
+    10,000 children at full scale.
+    """
+    siblings = max(1, int(10000 * scale))
+    with GCM("Wide") as root:
+        GCM.add_setup(setup)
+        for i in range(siblings):
+            with GCM.add_group("Sibling {}".format(i)):
+                GCM.add_test("test")(test)
+    return root
+
+
+def parametrized(scale=1.0):
+    """A parametrized group with a couple of child groups.
+
+    1,000 sets of parameters at full scale.
+    """
+    params = [(i,) for i in range(max(1, int(1000 * scale)))]
+    with GCM("Parametrized") as root:
+        with GCM.add_group("Parameters", params=params):
+            add_fixtures_and_test()
+            with GCM.add_group("First Child"):
+                add_fixtures_and_test()
+            with GCM.add_group("Second Child"):
+                add_fixtures_and_test()
+    return root
+
+
+def included(scale=1.0):
+    """Lots of groups made of copies of a predefined group.
+
+    Half of the groups include it, and the other half combine it. 1,000
+    groups at full scale.
+    """
+    with GCM("Predefined Group") as predefined:
+        add_fixtures_and_test()
+        with GCM.add_group("Predefined Child"):
+            add_fixtures_and_test()
+
+    copies = max(1, int(1000 * scale))
+    with GCM("Included") as root:
+        for i in range(copies):
+            with GCM.add_group("Copy {}".format(i)):
+                if i % 2:
+                    GCM.includes(predefined)
+                else:
+                    GCM.combine(predefined)
+    return root
+
+
+TREES = {
+    "deep": deep,
+    "wide": wide,
+    "parametrized": parametrized,
+    "included": included,
+}
+
+
+def build_tree(name, mod, scale=1.0):
+    """Build one of the trees, and create its tests in the given namespace.
+
+    :param name: The name of the tree (one of :data:`TREES`).
+    :type name: str
+    :param mod: The namespace of the module the tests should be created in.
+    :param scale: How big the tree should be, compared to its full size.
+    :type scale: float
+    """
+    TREES[name](scale).create_tests(mod)
@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 from contextional.contextional import GroupContextManager
+from contextional.listener import Listener
 
 from contextional.__version__ import (
     __title__,
@@ -17,4 +18,5 @@ GCM = GroupContextManager
 
 __all__ = [
     "GCM",
+    "Listener",
 ]
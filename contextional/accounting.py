@@ -0,0 +1,118 @@
+from __future__ import absolute_import, division
+
+from contextional.tree import walk_groups
+
+
+USER = "user"
+CONTEXTIONAL = "contextional"
+FRAMEWORK = "framework"
+OUTPUT = "output"
+
+CATEGORIES = (
+    (USER, "user code"),
+    (CONTEXTIONAL, "contextional"),
+    (FRAMEWORK, "framework"),
+    (OUTPUT, "output"),
+)
+
+
+class _Accounting(object):
+    """Count the time spent in a ``with`` block towards a category."""
+
+    def __init__(self, accountant, category):
+        self._accountant = accountant
+        self._category = category
+
+    def __enter__(self):
+        self._accountant._enter(self._category)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._accountant._exit()
+
+
+class _NoAccounting(object):
+    """Count nothing, for when time isn't being accounted."""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        pass
+
+
+NO_ACCOUNTING = _NoAccounting()
+
+
+class TimeAccountant(object):
+    """Split the time the run took between who spent it.
+
+    :param groups: The root groups of the run.
+    :type groups: list of :class:`.Group`
+    :param clock: The clock to time the run with.
+
+    Contextional marks when it starts and stops running its own code, the
+    code of tests and fixtures, and writing output, by running them in
+    ``with`` blocks made by :meth:`_accounting` (which call :meth:`_enter`
+    and :meth:`_exit` around them). These nest, so, for
+    example, a test that's run while Contextional is dispatching it only
+    counts as user code. The rest of the time between the first thing
+    Contextional did and the last is the testing framework's.
+    """
+
+    def __init__(self, groups, clock):
+        self._groups = groups
+        self._clock = clock
+        self._totals = dict((category, 0.0) for category, _ in CATEGORIES)
+        self._stack = []
+        self._start_time = None
+        self._last_time = None
+        # the blocks hold no state of their own, so they're made once.
+        self._blocks = dict(
+            (category, _Accounting(self, category))
+            for category, _ in CATEGORIES
+        )
+
+    def _accounting(self, category):
+        """Count the time spent in a ``with`` block towards the category."""
+        return self._blocks[category]
+
+    def _enter(self, category):
+        now = self._clock()
+        if self._start_time is None:
+            self._start_time = now
+        else:
+            current = self._stack[-1] if self._stack else FRAMEWORK
+            self._totals[current] += now - self._last_time
+        self._stack.append(category)
+        self._last_time = now
+
+    def _exit(self):
+        now = self._clock()
+        self._totals[self._stack.pop()] += now - self._last_time
+        self._last_time = now
+
+    def _report(self, stream):
+        if self._start_time is None:
+            return
+        wall_time = self._last_time - self._start_time
+        tests = sum(
+            1
+            for group in walk_groups(self._groups)
+            for case in group._cases
+            if case._test_started
+        )
+        stream.write(
+            "\ncontextional: where the time went ({:.3f}s, {} "
+            "test(s)):\n".format(wall_time, tests),
+        )
+        for category, name in CATEGORIES:
+            total = self._totals[category]
+            stream.write(
+                "  {:<13}{:>9.3f}s {:>6.1f}% {:>15}\n".format(
+                    name,
+                    total,
+                    total / wall_time * 100 if wall_time else 0.0,
+                    "{:.1f}us/test".format(total / tests * 1e6)
+                    if tests else "",
+                ),
+            )
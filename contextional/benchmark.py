@@ -0,0 +1,391 @@
+from __future__ import absolute_import, division
+
+import json
+import math
+import os
+
+from contextional.tree import walk_groups
+
+
+def percentile(sorted_times, fraction):
+    """Find a percentile of some sorted times, interpolating between them.
+
+    :param sorted_times: The times, from fastest to slowest.
+    :type sorted_times: list of float
+    :param fraction: The percentile, as a fraction (e.g. ``0.95``).
+    :type fraction: float
+    """
+    position = (len(sorted_times) - 1) * fraction
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_times) - 1)
+    weight = position - lower
+    return sorted_times[lower] * (1 - weight) + sorted_times[upper] * weight
+
+
+def summarize(times):
+    """Summarize the time each round took per iteration.
+
+    :param times: The time per iteration of each round, in seconds.
+    :type times: list of float
+    :rtype: dict
+    """
+    sorted_times = sorted(times)
+    mean = sum(times) / len(times)
+    if len(times) > 1:
+        variance = sum((t - mean) ** 2 for t in times) / (len(times) - 1)
+    else:
+        variance = 0.0
+    return {
+        "min": sorted_times[0],
+        "max": sorted_times[-1],
+        "mean": mean,
+        "median": percentile(sorted_times, 0.5),
+        "p95": percentile(sorted_times, 0.95),
+        "p99": percentile(sorted_times, 0.99),
+        "stddev": math.sqrt(variance),
+    }
+
+
+def calibrate(func, round_time, clock):
+    """Find how many iterations it takes for a round to last long enough.
+
+    :param func: The function being benchmarked.
+    :param round_time: The fewest seconds a round should take.
+    :type round_time: float
+    :param clock: The clock to time the function with.
+    :returns: The number of iterations for each round.
+    :rtype: int
+
+    Really fast functions can't be timed accurately on their own, so they're
+    run in a loop enough times for the loop to take at least ``round_time``.
+    """
+    __tracebackhide__ = True
+    iterations = 1
+    while True:
+        start_time = clock()
+        for _ in range(iterations):
+            func()
+        duration = clock() - start_time
+        if duration >= round_time or iterations >= 10 ** 9:
+            return iterations
+        if duration <= 0:
+            iterations *= 10
+        else:
+            # aim a little past the round time, so this rarely loops again.
+            iterations = max(
+                iterations * 2,
+                int(math.ceil(iterations * round_time * 1.2 / duration)),
+            )
+
+
+def run_benchmark(func, rounds, warmup, round_time, clock):
+    """Time a function over a number of rounds.
+
+    :param func: The function to benchmark. It's called with no arguments.
+    :param rounds: The number of rounds to time.
+    :type rounds: int
+    :param warmup: The number of rounds to run (but not time) first.
+    :type warmup: int
+    :param round_time: The fewest seconds a round should take.
+    :type round_time: float
+    :param clock: The clock to time the function with.
+    :returns: The summary of the time taken per iteration, along with the
+        number of ``"rounds"``, ``"iterations"`` per round, and the time per
+        iteration of each round (``"times"``).
+    :rtype: dict
+    """
+    __tracebackhide__ = True
+    iterations = calibrate(func, round_time, clock)
+    for _ in range(warmup):
+        for _ in range(iterations):
+            func()
+    times = []
+    for _ in range(rounds):
+        start_time = clock()
+        for _ in range(iterations):
+            func()
+        times.append((clock() - start_time) / iterations)
+    stats = summarize(times)
+    stats["rounds"] = rounds
+    stats["iterations"] = iterations
+    stats["times"] = times
+    return stats
+
+
+def format_time(seconds):
+    """Format a duration with a unit that suits it."""
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds >= 1 / scale:
+            return "{:.3f}{}".format(seconds * scale, unit)
+    return "{:.3f}ns".format(seconds * 1e9)
+
+
+def format_stats(stats):
+    """Format the summary of a benchmark to fit on a single line."""
+    return (
+        "min {}  median {}  p95 {}  p99 {}  stddev {}  "
+        "({} rounds x {} iterations)".format(
+            format_time(stats["min"]),
+            format_time(stats["median"]),
+            format_time(stats["p95"]),
+            format_time(stats["p99"]),
+            format_time(stats["stddev"]),
+            stats["rounds"],
+            stats["iterations"],
+        )
+    )
+
+
+def benchmark_results(groups):
+    """Gather the results of the benchmarks that were run.
+
+    :param groups: The root groups to look through.
+    :type groups: list of :class:`.Group`
+    :returns: A dictionary for each benchmark that was run, with its stable
+        ID, description, and summary.
+    :rtype: list
+    """
+    results = []
+    for group in walk_groups(groups):
+        for case in group._cases:
+            stats = getattr(case, "_stats", None)
+            if stats is not None:
+                results.append({
+                    "id": case._id,
+                    "description": case._description,
+                    "stats": stats,
+                })
+    return results
+
+
+class BenchmarkResults(object):
+    """Write the results of the benchmarks to a file once they're all done.
+
+    :param groups: The root groups of the run.
+    :type groups: list of :class:`.Group`
+    :param path: The path of the JSON file to write the results to.
+    :type path: str
+    """
+
+    def __init__(self, groups, path):
+        self._groups = groups
+        self._path = path
+
+    def __call__(self, stream):
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(self._path, "w") as f:
+            json.dump(
+                {"benchmarks": benchmark_results(self._groups)},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+
+
+def _ranks(values):
+    """Rank the values from 1, giving ties the average of their ranks."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def mann_whitney_u(first, second):
+    """Test whether two sets of times come from the same distribution.
+
+    :param first: The first set of times.
+    :type first: list of float
+    :param second: The second set of times.
+    :type second: list of float
+    :returns: The U statistic of the first set, and the two-sided p-value.
+    :rtype: tuple
+
+    This doesn't assume the times are normally distributed (they rarely are),
+    only that each round is independent. The p-value uses the normal
+    approximation, with corrections for ties and continuity, so it needs at
+    least a handful of rounds on each side to mean much.
+    """
+    n1 = len(first)
+    n2 = len(second)
+    ranks = _ranks(list(first) + list(second))
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    counts = {}
+    for value in list(first) + list(second):
+        counts[value] = counts.get(value, 0) + 1
+    ties = sum(t ** 3 - t for t in counts.values())
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare_times(baseline, current, threshold=0.1, alpha=0.05):
+    """Compare the times of a benchmark against those of a baseline.
+
+    :param baseline: The time per iteration of each round of the baseline.
+    :type baseline: list of float
+    :param current: The time per iteration of each round of this run.
+    :type current: list of float
+    :param threshold: How much slower (or faster) the median has to be,
+        as a fraction of the baseline's, to count.
+    :type threshold: float
+    :param alpha: How unlikely the difference has to be to have happened by
+        chance (i.e. the p-value has to be lower than this).
+    :type alpha: float
+    :returns: The ``"baseline"`` and ``"current"`` medians, the fractional
+        ``"change"`` between them, the ``"p"`` value, and the ``"verdict"``
+        (``"regressed"``, ``"improved"``, or ``"unchanged"``).
+    :rtype: dict
+
+    If the baseline's median is 0 (i.e. too quick for the clock to tell),
+    any time at all is an infinite change.
+    """
+    baseline_median = percentile(sorted(baseline), 0.5)
+    current_median = percentile(sorted(current), 0.5)
+    if baseline_median:
+        change = current_median / baseline_median - 1
+    elif current_median:
+        change = float("inf")
+    else:
+        change = 0.0
+    _, p = mann_whitney_u(baseline, current)
+    verdict = "unchanged"
+    if p < alpha:
+        if change > threshold:
+            verdict = "regressed"
+        elif change < -threshold:
+            verdict = "improved"
+    return {
+        "baseline": baseline_median,
+        "current": current_median,
+        "change": change,
+        "p": p,
+        "verdict": verdict,
+    }
+
+
+def format_comparison(comparison):
+    """Format a comparison to fit on a single line."""
+    return "{} -> {} ({:+.1f}%, p={:.3g}) {}".format(
+        format_time(comparison["baseline"]),
+        format_time(comparison["current"]),
+        comparison["change"] * 100,
+        comparison["p"],
+        comparison["verdict"].upper(),
+    )
+
+
+def baseline_path(directory, name):
+    """The path of the file a named baseline is kept in."""
+    return os.path.join(directory, name + ".json")
+
+
+class BenchmarkBaseline(object):
+    """Compare each benchmark against the results of a saved baseline.
+
+    :param groups: The root groups of the run.
+    :type groups: list of :class:`.Group`
+    :param name: The name of the baseline.
+    :type name: str
+    :param directory: The directory the baselines are kept in.
+    :type directory: str
+    :param threshold: How much slower the median has to be, as a fraction
+        of the baseline's, for a benchmark to fail.
+    :type threshold: float
+    :param alpha: How unlikely the difference has to be to have happened by
+        chance for it to count.
+    :type alpha: float
+    :param fail: Fail benchmarks that regressed.
+    :type fail: bool
+    :raises ValueError: If there's no baseline with that name.
+
+    Benchmarks that aren't in the baseline aren't compared.
+    """
+
+    def __init__(self, groups, name, directory=".contextional_benchmarks",
+                 threshold=0.1, alpha=0.05, fail=True):
+        self._groups = groups
+        self._name = name
+        self._threshold = threshold
+        self._alpha = alpha
+        self._fail = fail
+        path = baseline_path(directory, name)
+        if not os.path.isfile(path):
+            raise ValueError(
+                "there is no benchmark baseline named '{}' (no {}); save one "
+                "first".format(name, path),
+            )
+        with open(path, "r") as f:
+            self._results = {
+                result["id"]: result["stats"]
+                for result in json.load(f)["benchmarks"]
+            }
+        self._comparisons = {}
+
+    def _compare(self, case):
+        """Compare a benchmark that was just run against the baseline.
+
+        :raises AssertionError: If the benchmark regressed and ``fail`` is
+            ``True``.
+        """
+        stats = self._results.get(case._id)
+        if stats is None or case._stats is None:
+            return
+        comparison = compare_times(
+            stats["times"],
+            case._stats["times"],
+            threshold=self._threshold,
+            alpha=self._alpha,
+        )
+        self._comparisons[case] = comparison
+        if self._fail and comparison["verdict"] == "regressed":
+            raise AssertionError(
+                "regressed against baseline '{}': {}".format(
+                    self._name,
+                    format_comparison(comparison),
+                ),
+            )
+
+    def _report(self, stream):
+        """Show the comparisons in a tree, like the tests are shown."""
+        if not self._comparisons:
+            return
+        stream.write(
+            "\ncontextional: benchmarks compared to baseline '{}':\n".format(
+                self._name,
+            ),
+        )
+
+        def add_lines(groups, level):
+            lines = []
+            for group in groups:
+                group_lines = []
+                for case in group._cases:
+                    comparison = self._comparisons.get(case)
+                    if comparison is not None:
+                        group_lines.append(
+                            "{}{}  {}".format(
+                                "  " * (level + 1),
+                                case._description,
+                                format_comparison(comparison),
+                            ),
+                        )
+                group_lines += add_lines(group._children, level + 1)
+                if group_lines:
+                    lines.append("  " * level + group._description)
+                    lines += group_lines
+            return lines
+
+        stream.write("\n".join(add_lines(self._groups, 0)) + "\n")
+
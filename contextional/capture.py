@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+
+import logging
+import sys
+import tempfile
+
+from contextional.listener import Listener
+
+
+class _SpoolWriter(object):
+    """Write text to a spooled temporary file, as UTF-8."""
+
+    def __init__(self, spool):
+        self._spool = spool
+
+    def write(self, text):
+        if isinstance(text, type(u"")):
+            text = text.encode("utf-8")
+        self._spool.write(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class OutputCapture(Listener):
+    """Capture the output of group fixtures and tests, and keep what failed.
+
+    :param max_size: The most bytes of output to keep in memory for
+        each fixture or test before spilling it to a temporary file.
+    :type max_size: int
+
+    Everything written to ``sys.stdout`` and ``sys.stderr``, and logged (at
+    levels the root logger lets through), while a group fixture, or a test
+    and its test setups and teardowns, is running is written to a
+    :class:`tempfile.SpooledTemporaryFile` of its own. As soon as the
+    fixture or test is done, its output is thrown away if it passed, or kept
+    if it didn't, so only the output of what failed is ever held on to. Once
+    all the tests are done, that output is shown.
+    """
+
+    def __init__(self, max_size=1024 * 1024):
+        self._max_size = max_size
+        # the captures in progress, innermost last.
+        self._stack = []
+        self._captured_case = None
+        self._case_spool = None
+        # the label and spool of each failure's output.
+        self._kept = []
+
+    def _start(self):
+        spool = tempfile.SpooledTemporaryFile(
+            max_size=self._max_size,
+            mode="w+b",
+        )
+        writer = _SpoolWriter(spool)
+        handler = logging.StreamHandler(writer)
+        handler.setFormatter(
+            logging.Formatter("%(levelname)s %(name)s: %(message)s"),
+        )
+        self._stack.append((spool, sys.stdout, sys.stderr, handler))
+        sys.stdout = sys.stderr = writer
+        logging.getLogger().addHandler(handler)
+
+    def _stop(self):
+        spool, sys.stdout, sys.stderr, handler = self._stack.pop()
+        logging.getLogger().removeHandler(handler)
+        return spool
+
+    def _keep_if_failed(self, label, spool, failed):
+        if failed and spool.tell():
+            self._kept.append((label, spool))
+        else:
+            spool.close()
+
+    def fixture_start(self, fixture, timestamp):
+        self._start()
+
+    def fixture_end(self, fixture, timestamp):
+        self._keep_if_failed(
+            "{} ({})".format(fixture._group._id, fixture.description),
+            self._stop(),
+            fixture._error is not None,
+        )
+
+    def test_setup_start(self, case, timestamp):
+        self._start()
+        self._captured_case = case
+        self._case_spool = None
+
+    def test_teardown_end(self, case, timestamp):
+        # the outcome isn't known until the testing framework has reported
+        # it, which shouldn't be captured.
+        if self._captured_case is case:
+            self._case_spool = self._stop()
+
+    def case_finish(self, case, timestamp):
+        if self._captured_case is not case:
+            return
+        spool = self._case_spool
+        if spool is None:
+            # the test setups failed, so there were no teardowns.
+            spool = self._stop()
+        self._captured_case = self._case_spool = None
+        self._keep_if_failed(
+            case._id,
+            spool,
+            case._outcome in ("failed", "error"),
+        )
+
+    def _report(self, stream):
+        if not self._kept:
+            return
+        stream.write(
+            "\ncontextional: captured output of {} failure(s):\n".format(
+                len(self._kept),
+            ),
+        )
+        for label, spool in self._kept:
+            stream.write("---- {} ----\n".format(label))
+            spool.seek(0)
+            output = spool.read()
+            if not isinstance(output, str):
+                output = output.decode("utf-8", "replace")
+            stream.write(output)
+            if not output.endswith("\n"):
+                stream.write("\n")
+            spool.close()
+        self._kept = []
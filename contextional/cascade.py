@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+
+def _cause(group):
+    """The group whose failure is cascading to the tests of a group.
+
+    That's the outermost group with a cascading failure in progress, since
+    its descendants only have one because it does.
+    """
+    for ancestor in reversed(group._ancestry):
+        if ancestor._cascading_failure_in_progress:
+            return ancestor
+    return group
+
+
+class CascadingFailureAggregator(object):
+    """Report each cascading failure once, rather than once for every test.
+
+    :param skip: Skip the tests that a cascading failure reaches, rather than
+        failing them.
+    :type skip: bool
+    :param max_paths: The most IDs of affected tests to show for each
+        cascading failure.
+    :type max_paths: int
+
+    When a group's fixture fails and its failure cascades, the tests it
+    reaches aren't set up, run, or torn down. Each is just given a short
+    failure (or skip), with no traceback, that points at the group. Once all
+    the tests are done, each group that failed is shown with the error that
+    caused it, the number of tests it reached, and some of their IDs. With
+    unittest (or nose), that's where the result shows its failures, in place
+    of a section for each of the tests that were reached.
+    """
+
+    def __init__(self, skip=False, max_paths=10):
+        self._skip = skip
+        self._max_paths = max_paths
+        # the cases reached by each group's failure, by group.
+        self._cases = {}
+        self._groups = []
+        self._results = []
+        self._reported = False
+
+    def _add(self, case):
+        """Note that a cascading failure reached a test.
+
+        :returns: The reason to give for failing (or skipping) the test.
+        :rtype: str
+        """
+        group = _cause(case._group)
+        if group not in self._cases:
+            self._cases[group] = []
+            self._groups.append(group)
+        self._cases[group].append(case)
+        return "cascading failure from {}".format(group._id)
+
+    def _report_in(self, result):
+        """Have a unittest result show the cascading failures once.
+
+        :param result: The result of the run.
+        :type result: :class:`unittest.TextTestResult`
+
+        The failures of the tests that were reached are left out of the
+        result's ``printErrors``, as they have nothing to show but the group
+        that failed, and the cascading failures are shown after the rest.
+        """
+        if any(r is result for r in self._results):
+            return
+        self._results.append(result)
+        print_errors = result.printErrors
+
+        def printErrors():
+            reached = set(
+                id(case) for cases in self._cases.values() for case in cases
+            )
+            failures = result.failures
+            result.failures = [
+                (test, text) for test, text in failures
+                if id(getattr(test, "_case", None)) not in reached
+            ]
+            try:
+                print_errors()
+            finally:
+                result.failures = failures
+            self._report(result.stream)
+
+        result.printErrors = printErrors
+
+    def _report(self, stream):
+        if self._reported or not self._groups:
+            return
+        self._reported = True
+        stream.write(
+            "\ncontextional: {} cascading failure(s) reached {} test(s):\n"
+            .format(
+                len(self._groups),
+                sum(len(cases) for cases in self._cases.values()),
+            ),
+        )
+        for group in self._groups:
+            cases = self._cases[group]
+            stream.write("  {}\n".format(group._id))
+            if group._cascading_failure_cause is not None:
+                stream.write(
+                    "    {}: {}\n".format(*group._cascading_failure_cause),
+                )
+            stream.write(
+                "    {} {} test(s):\n".format(
+                    "skipped" if self._skip else "failed",
+                    len(cases),
+                ),
+            )
+            for case in cases[:self._max_paths]:
+                stream.write("      {}\n".format(case._id))
+            if len(cases) > self._max_paths:
+                stream.write(
+                    "      (and {} more)\n".format(
+                        len(cases) - self._max_paths,
+                    ),
+                )
@@ -3,16 +3,59 @@ from __future__ import (
     with_statement,
 )
 
+import atexit
 import logging
 import sys
+import traceback
 import unittest
 import inspect
 from random import getrandbits
 from contextlib import contextmanager
+from functools import partial
 from copy import deepcopy
 from types import FunctionType
 from collections import Mapping
 
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    # Python 2 has no monotonic clock, so use the best one available.
+    from timeit import default_timer as _clock
+
+from contextional.accounting import (
+    CONTEXTIONAL,
+    NO_ACCOUNTING,
+    OUTPUT,
+    USER,
+    TimeAccountant,
+)
+from contextional.benchmark import (
+    BenchmarkBaseline,
+    BenchmarkResults,
+    baseline_path,
+    format_stats,
+    run_benchmark,
+)
+from contextional.capture import OutputCapture
+from contextional.cascade import CascadingFailureAggregator
+from contextional.events import EventStreamWriter
+from contextional.formatting import FormattedError, format_error
+from contextional.history import HistoryRecorder
+from contextional.htmlreport import HTMLReportWriter
+from contextional.incremental import IncrementalSelector
+from contextional.junit import JUnitXMLWriter
+from contextional.memory import MemoryTracker, NamespaceAuditor
+from contextional.output import BufferedStream, buffer_result_stream
+from contextional.profiling import SubtreeProfiler
+from contextional.progress import ProgressTracker
+from contextional.trace import TraceWriter
+from contextional.tracebacks import TracebackStore
+from contextional.timing import (
+    AmortizationReport,
+    DurationsReport,
+    TimingReport,
+)
+
 
 class CascadingFailureError(AssertionError):
     """Raise in tests during a cascading failure."""
@@ -33,7 +76,20 @@ class Helper(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         self._level_stack = []
+        # the groups the last group description written was shown under.
+        self._written_ancestry = []
         self._cases = []
+        self._ids = {}
+        self._root_groups = []
+        self._listeners = []
+        self._selector = None
+        self._benchmark_baseline = None
+        self._accountant = None
+        self._cascade_aggregator = None
+        self._traceback_store = None
+        self._output_buffering = None
+        self._finish_callbacks = []
+        self._finished = False
         super(Helper, self).__init__(*args, **kwargs)
 
     def __del__(self):
@@ -65,6 +121,7 @@ class Helper(unittest.TestCase):
 
     def _add_case(self, case):
         """Add a test case to the queue."""
+        case._queued = True
         self._cases.append(case)
 
     def _get_next_test(self):
@@ -74,11 +131,110 @@ class Helper(unittest.TestCase):
         except IndexError:
             raise IndexError("more test classes than test cases")
 
+    def _make_id(self, base):
+        """Make a stable ID that's unique within the run.
+
+        The ID is based on the name of the module the root group is in (or
+        the session group was made in), and the descriptions of the object and
+        its ancestors, so it stays the same across runs, no matter what other
+        modules are run alongside it. If more than one object ends up with the
+        same ID (e.g. the same :class:`.Context` was included twice), the ones
+        after the first will have their occurrence number appended.
+        """
+        count = self._ids.get(base, 0) + 1
+        self._ids[base] = count
+        if count == 1:
+            return base
+        return "{}#{}".format(base, count)
+
+    def _emit(self, event, obj, timestamp):
+        """Let the listeners know about an event.
+
+        Callers should check that there are listeners before calling this, so
+        that it costs nothing when there are none.
+        """
+        for listener in self._listeners:
+            getattr(listener, event)(obj, timestamp)
+
+    def _accounting(self, category):
+        """Count the time spent in a ``with`` block towards the category.
+
+        This does nothing unless the time is being accounted for (see
+        :meth:`.GcmMaker.account_time`).
+        """
+        if self._accountant is None:
+            return NO_ACCOUNTING
+        return self._accountant._accounting(category)
+
+    def _finish_run(self, stream=None):
+        """Run the callbacks that need to happen once all tests are done.
+
+        This is run by the pytest plugin at the end of the session, and, for
+        any other testing framework, when the interpreter exits. It only runs
+        once.
+
+        An error in one callback is written to the stream, rather than
+        stopping the callbacks after it from running.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        if stream is None:
+            stream = sys.stderr
+        self._teardown_session_groups(stream)
+        for callback in self._finish_callbacks:
+            try:
+                callback(stream)
+            except Exception:
+                LOGGER.debug("Finish callback failed.", exc_info=True)
+                stream.write(
+                    "contextional: error finishing the run\n{}".format(
+                        traceback.format_exc(),
+                    ),
+                )
+
+    def _teardown_session_groups(self, stream):
+        """Teardown the session groups once all tests are done.
+
+        There are no tests left to report errors against at this point, so
+        they're written to the stream instead.
+        """
+        for group in self._level_stack[::-1]:
+            group._result = None
+            group._write_to_result = False
+            try:
+                group._teardown_group()
+            except Exception:
+                LOGGER.debug("Session group teardown failed.", exc_info=True)
+                stream.write(
+                    "contextional: error tearing down {}\n{}".format(
+                        group._description,
+                        traceback.format_exc(),
+                    ),
+                )
+
+    def __getattr__(self, attr):
+        """Look for a lazy attribute of the groups that are set up.
+
+        The innermost group's lazy attributes take precedence.
+        """
+        for group in reversed(self.__dict__.get("_level_stack", ())):
+            for lazy in group._lazy_attributes:
+                if lazy._name == attr:
+                    return lazy._get_value()
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(
+                type(self).__name__,
+                attr,
+            ),
+        )
+
     def runTest(self):
         pass
 
 
 helper = Helper()
+atexit.register(helper._finish_run)
 
 
 def get_next_test_from_helper():
@@ -91,7 +247,16 @@ class ContextionalTestResultProxy(object):
         self._true_result = getattr(result, "result", result)
         self._result = result
         if hasattr(self._true_result, "stream"):
+            buffering = helper._output_buffering
+            if (buffering is not None and
+                    not isinstance(self._true_result.stream, BufferedStream)):
+                stream = buffer_result_stream(self._true_result, **buffering)
+                helper._finish_callbacks.append(stream.close)
             self.stream = self._true_result.stream
+        aggregator = helper._cascade_aggregator
+        if (aggregator is not None and
+                hasattr(self._true_result, "printErrors")):
+            aggregator._report_in(self._true_result)
 
     def __getattr__(self, name):
         if name == "showAll":
@@ -99,10 +264,64 @@ class ContextionalTestResultProxy(object):
         return getattr(self._result, name)
 
     def stopTest(self, test):
-        if not test._is_pytest:
-            test._teardown_to_level(test._case._teardown_level)
+        with helper._accounting(CONTEXTIONAL):
+            if not test._is_pytest and isinstance(test._case, BenchmarkCase):
+                test._case._write_stats()
+            if helper._listeners and isinstance(test, GroupTestCase):
+                # the outcome has been reported by now, and the test's groups
+                # haven't been torn down yet.
+                helper._emit("case_finish", test._case, _clock())
+            if not test._is_pytest:
+                test._teardown_to_level(test._case._teardown_level)
         self._result.stopTest(test)
 
+    def _record_outcome(self, test, outcome, add_outcome, *args):
+        # group fixture errors are also reported through here.
+        duplicate = None
+        store = helper._traceback_store
+        if (store is not None and outcome in ("failed", "error") and
+                isinstance(test, (GroupTestCase, Fixture))):
+            if isinstance(test, GroupTestCase):
+                location = test._case._id
+            else:
+                location = "{} ({})".format(test._group._id, test.description)
+            entry = store._add(args[0], test._group, location)
+            if entry._count > 1:
+                duplicate = entry
+                if isinstance(test, Fixture):
+                    test._error = entry._error
+                # pytest reports the duplicate itself (see
+                # pytest_runtest_makereport).
+                if not getattr(test, "_is_pytest", False):
+                    args = (entry._placeholder(),)
+        if isinstance(test, GroupTestCase):
+            test._case._outcome = outcome
+            test._case._duplicate_traceback = duplicate
+            if outcome in ("failed", "error"):
+                # only what the listeners need is kept, and not the
+                # traceback, so the test's frames can be let go of.
+                if duplicate is not None:
+                    test._case._error = duplicate._error
+                elif helper._listeners:
+                    test._case._error = FormattedError(args[0])
+            elif outcome == "skipped":
+                test._case._skip_reason = args[0]
+        # the result writes the outcome.
+        with helper._accounting(OUTPUT):
+            add_outcome(test, *args)
+
+    def addSuccess(self, test):
+        self._record_outcome(test, "passed", self._result.addSuccess)
+
+    def addFailure(self, test, err):
+        self._record_outcome(test, "failed", self._result.addFailure, err)
+
+    def addError(self, test, err):
+        self._record_outcome(test, "error", self._result.addError, err)
+
+    def addSkip(self, test, reason):
+        self._record_outcome(test, "skipped", self._result.addSkip, reason)
+
 
 class GcmMaker(object):
 
@@ -111,8 +330,60 @@ class GcmMaker(object):
     def __init__(self):
         self._current_context = None
 
-    def __call__(self, description, cascading_failure=True):
-        new_context = Context(description, cascading_failure)
+    def __call__(self, description, cascading_failure=True,
+                 session_group=None):
+        new_context = Context(description, cascading_failure, session_group)
+        new_context._parent_context = self._current_context
+        new_context._gcm = self
+        self._current_context = new_context
+        return self._current_context
+
+    def session_group(self, description, cascading_failure=True):
+        """Create a group that can be shared by the tests of many modules.
+
+        :param description: The description of the session group.
+        :type description: str
+        :param cascading_failure: Cascade the failure to all tests within the
+            session group, in every module that uses it.
+        :type cascading_failure: bool
+
+        A session group can only have setups, teardowns, and lazy attributes.
+        It is used by passing it as the ``session_group`` of the root
+        :class:`.Context` of any module that needs it. Its setups are run
+        before the first test that needs them, and, rather than being torn
+        down at the end of each module, it is only torn down once all the
+        tests have been run (at the end of the pytest session, or when the
+        interpreter exits for any other testing framework).
+
+        Example::
+
+            with GCM.session_group("Local Services") as LS:
+
+                @GCM.add_setup
+                def setUp():
+                    GCM.server = start_server()
+
+                @GCM.add_teardown
+                def tearDown():
+                    GCM.server.stop()
+
+            with GCM("Main Group", session_group=LS) as MG:
+
+                @GCM.add_test("server is running")
+                def test(case):
+                    case.assertTrue(GCM.server.is_running())
+
+            MG.create_tests()
+
+        .. note::
+            Session groups are torn down after all other groups, in the
+            reverse order that they were set up.
+        """
+        new_context = SessionContext(description, cascading_failure)
+        module = inspect.currentframe().f_back.f_globals["__name__"]
+        new_context._group._id = self._helper._make_id(
+            module + "::" + description,
+        )
         new_context._parent_context = self._current_context
         new_context._gcm = self
         self._current_context = new_context
@@ -152,6 +423,17 @@ class GcmMaker(object):
             raise AttributeError("No current context.")
         return self._current_context.add_test
 
+    @property
+    def add_benchmark(self):
+        """Forward the call to the current :class:`Context`.
+
+        For a more detailed description, go to :meth:`Context.add_benchmark`.
+        """
+
+        if self._current_context is None:
+            raise AttributeError("No current context.")
+        return self._current_context.add_benchmark
+
     @property
     def add_group(self):
         """Forward the call to the current :class:`Context`.
@@ -208,6 +490,17 @@ class GcmMaker(object):
             raise AttributeError("No current context.")
         return self._current_context.add_test_teardown
 
+    @property
+    def add_lazy(self):
+        """Forward the call to the current :class:`Context`.
+
+        For a more detailed description, go to :meth:`Context.add_lazy`.
+        """
+
+        if self._current_context is None:
+            raise AttributeError("No current context.")
+        return self._current_context.add_lazy
+
     @property
     def includes(self):
         """Forward the call to the current :class:`Context`.
@@ -298,6 +591,684 @@ class GcmMaker(object):
             if name.startswith("assert"):
                 setattr(Helper, name, method)
 
+    def enable_incremental(self, cache_path=".contextional_cache",
+                           modules=False):
+        """Only run the tests that changed or didn't pass last time.
+
+        :param cache_path: The file to keep fingerprints and outcomes in.
+        :type cache_path: str
+        :param modules: Also consider the source of the modules referenced by
+            the test and fixture functions.
+        :type modules: bool
+
+        Each test is fingerprinted using the code of its function, every
+        fixture in its setup ancestry, and the parameters of its groups. If a
+        test's fingerprint is the same as it was in the last run it was run
+        in, and it passed in that run, it will not be created, so only the
+        setups needed by the remaining tests will be run.
+
+        This must be called before :meth:`.create_tests` is called for the
+        tests it should apply to. When using pytest, the
+        ``--contextional-incremental`` option can be used instead.
+
+        Example::
+
+            GCM.enable_incremental()
+
+            with GCM("Main Group") as MG:
+
+                @GCM.add_test("unchanged since it last passed")
+                def test(case):
+                    case.assertTrue(True)
+
+            MG.create_tests()
+
+        .. warning::
+            Tests that rely on the side effects of tests before them will not
+            behave as expected if those earlier tests are skipped.
+        """
+        selector = IncrementalSelector(cache_path, modules=modules)
+        self._helper._selector = selector
+        self._helper._finish_callbacks.append(selector._save)
+
+    def report_timing(self, show=True, path=None):
+        """Report where the time went once all the tests are done.
+
+        :param show: Write the timing tree to the output once the tests are
+            done.
+        :type show: bool
+        :param path: The path of a file to write the timing tree to as JSON.
+        :type path: str
+
+        Every setup, teardown, test setup, test, and test teardown is timed as
+        it runs. This reports those times in a tree that's structured the same
+        way the tests are shown as they're run. Each group shows its
+        inclusive time (including everything within it) and its exclusive
+        time (only its own fixtures and tests).
+
+        When using pytest, the ``--contextional-timing`` and
+        ``--contextional-timing-json`` options can be used instead.
+
+        Example output:
+
+        .. code-block:: none
+
+            contextional timing:
+             inclusive  exclusive
+                1.502s     0.501s  Main Group
+                0.001s             thing is 1
+                1.001s     1.001s    Child Group
+                1.000s                 slow thing
+        """
+        self._helper._finish_callbacks.append(
+            TimingReport(self._helper._root_groups, show=show, path=path),
+        )
+
+    def report_durations(self, count=10):
+        """Report the slowest group fixtures once all the tests are done.
+
+        :param count: The number of fixtures to report. All of them are
+            reported if ``0``.
+        :type count: int
+
+        Each of the slowest setups and teardowns is shown with the full path
+        of its group, its description (or its type and position, if it has no
+        description), and the number of tests it served (i.e. the tests run
+        within its group, including those of the group's descendants), so the
+        cost per test can be seen.
+
+        When using pytest, the ``--contextional-durations`` option can be
+        used instead.
+
+        Example output:
+
+        .. code-block:: none
+
+            contextional: 10 slowest group fixtures:
+                2.000s     0.500s/test      4 test(s)  Main Group  setup (1/2)
+                0.300s     0.300s/test      1 test(s)  Main Group::Child  db
+        """
+        self._helper._finish_callbacks.append(
+            DurationsReport(self._helper._root_groups, count=count),
+        )
+
+    def report_amortization(self, count=10, min_savings=0.01):
+        """Report where restructuring the groups would save the most time.
+
+        :param count: The number of groups to show the fixture costs of. All
+            of them are shown if ``0``.
+        :type count: int
+        :param min_savings: The fewest seconds that making a group's test
+            setups into group setups would have to save for it to be shown.
+        :type min_savings: float
+
+        Once all the tests are done, three things are reported:
+
+        - The groups whose setups and teardowns took the longest, along with
+          the number of tests they served (including those of their
+          descendants), and their cost per test.
+        - The groups whose test setups took long enough that running them
+          once as group setups instead would save at least ``min_savings``
+          seconds. Only the cost is considered, so it's up to you to decide
+          whether or not the tests can share what the test setups make.
+        - Sibling groups with the same arguments and fixtures (e.g. copies
+          made by ``includes`` or ``combine``, or fixtures with identical
+          code), whose fixtures could be moved to a group they share, so
+          they'd only be run once.
+
+        When using pytest, the ``--contextional-amortization`` option can be
+        used instead.
+        """
+        self._helper._finish_callbacks.append(
+            AmortizationReport(
+                self._helper._root_groups,
+                count=count,
+                min_savings=min_savings,
+            ),
+        )
+
+    def profile_group(self, group_path, directory="."):
+        """Profile a group and its descendants with :mod:`cProfile`.
+
+        :param group_path: The path of the group to profile, made of the
+            descriptions of the group and its ancestors, joined by ``::``
+            (e.g. ``"Main Group::Child Group"``), optionally starting with
+            the name of the group's module.
+        :type group_path: str
+        :param directory: The directory to write the profiles to.
+        :type directory: str
+
+        Each group in the subtree gets its own profile, which is only enabled
+        while that group's setups, teardowns, test setups, tests, and test
+        teardowns are running, so the overhead of the testing framework and
+        Contextional itself isn't included. Once a group is torn down, its
+        profile is written to a ``.pstats`` file (named after the group's
+        path) that can be loaded with :mod:`pstats`.
+
+        When using pytest, the ``--contextional-profile`` option can be used
+        instead.
+        """
+        self.add_listener(SubtreeProfiler(group_path, directory=directory))
+
+    def track_memory(self, threshold=1024 * 1024, top=5):
+        """Report groups that hold on to memory after they're torn down.
+
+        :param threshold: The number of bytes a group can hold on to before
+            it's reported.
+        :type threshold: int
+        :param top: The number of allocation sites to show for each group.
+        :type top: int
+
+        A :mod:`tracemalloc` snapshot is taken as each group is set up, and
+        another once it's been torn down. Once all the tests are done, any
+        groups that still held on to more than ``threshold`` bytes of what
+        was allocated between the two are reported, along with the places
+        most of that memory was allocated. This is usually caused by
+        teardowns that don't remove what their setups put in the shared
+        namespace.
+
+        Taking the snapshots can slow the tests down quite a bit, so this
+        shouldn't be left on. This requires Python 3.4+.
+
+        When using pytest, the ``--contextional-memtrack`` option can be used
+        instead.
+        """
+        tracker = MemoryTracker(threshold=threshold, top=top)
+        self.add_listener(tracker)
+        self._helper._finish_callbacks.append(tracker._report)
+
+    def audit_namespace(self, remove=False):
+        """Report attributes that groups' setups leave in the namespace.
+
+        :param remove: Remove the attributes that are left behind once their
+            group has been torn down.
+        :type remove: bool
+
+        The attributes each group's setups add to the namespace (e.g.
+        ``GCM.thing = Thing()``) are noted, and any that are still there once
+        the group has been torn down are reported when all the tests are
+        done, along with roughly how much memory they're holding on to. These
+        stay around for the rest of the run, along with anything they refer
+        to.
+
+        If ``remove`` is ``True``, the leftover attributes are also removed
+        as soon as their group has been torn down, as if the group's
+        teardowns had done it.
+
+        When using pytest, the ``--contextional-audit-namespace`` and
+        ``--contextional-remove-residue`` options can be used instead.
+        """
+        auditor = NamespaceAuditor(remove=remove)
+        self.add_listener(auditor)
+        self._helper._finish_callbacks.append(auditor._report)
+
+    def write_trace(self, path, process_name=None):
+        """Write a timeline of the run that can be opened in a trace viewer.
+
+        :param path: The path of the JSON file to write the trace to.
+        :type path: str
+        :param process_name: The name to show for this process's track.
+        :type process_name: str
+
+        Once all the tests are done, a file in the Trace Event Format is
+        written with a span for every group (from when it's set up to when
+        it's torn down), group fixture, test setup, test, and test teardown.
+        It can be opened in ``chrome://tracing`` or https://ui.perfetto.dev to
+        see where the time went, including any gaps between them.
+
+        When using pytest, the ``--contextional-trace`` option can be used
+        instead.
+        """
+        writer = TraceWriter(path, process_name=process_name)
+        self.add_listener(writer)
+        self._helper._finish_callbacks.append(writer)
+
+    def write_junit_xml(self, path):
+        """Write the outcome of the run to a JUnit XML file as it happens.
+
+        :param path: The path of the XML file to write to.
+        :type path: str
+
+        Each group is written as a ``testsuite``, nested inside the
+        ``testsuite`` of its parent, with its tests as ``testcase`` elements.
+        Group setups and teardowns that have descriptions, or that raised an
+        error, are also written as ``testcase`` elements, so errors in them
+        aren't lost.
+
+        Each group's ``testsuite`` is written as the group runs, and the file
+        is flushed as each group is torn down, so nothing needs to be held on
+        to until the end. If the run is cut short (e.g. the process is
+        killed), everything written in full so far can be kept by repairing
+        the file::
+
+            python -m contextional.junit report.xml
+
+        When using pytest, the ``--contextional-junitxml`` option can be used
+        instead.
+        """
+        writer = JUnitXMLWriter(path)
+        self.add_listener(writer)
+        self._helper._finish_callbacks.append(writer)
+
+    def write_html_report(self, path):
+        """Write the outcome of the run to a collapsible HTML tree.
+
+        :param path: The path of the HTML file to write to.
+        :type path: str
+
+        Each group is shown as a collapsible node, with its tests, and its
+        fixtures that have descriptions or raised an error, beneath it. Each
+        node shows its outcome, how long it took (including its descendants),
+        and its share of its parent's time, and is coloured by how long it
+        took, compared to the slowest node, like a heatmap.
+
+        The page is written as the run goes, so even very big runs don't
+        need to be held on to until the end, and the page needs nothing
+        else to be viewed.
+
+        When using pytest, the ``--contextional-html`` option can be used
+        instead.
+        """
+        writer = HTMLReportWriter(path)
+        self.add_listener(writer)
+        self._helper._finish_callbacks.append(writer)
+
+    def write_events(self, target, batch_size=100, interval=1.0):
+        """Write each event of the run as a line of JSON, as it happens.
+
+        :param target: The path of the file to write to, or the number of a
+            file descriptor that's already open.
+        :type target: str or int
+        :param batch_size: The most lines to hold on to before flushing them.
+        :type batch_size: int
+        :param interval: The most seconds to hold on to a line before
+            flushing it.
+        :type interval: float
+
+        Groups being set up and torn down, group fixtures starting, ending,
+        and raising errors, and tests starting and ending (with their
+        outcome and duration) are each written as a JSON object on a line of
+        its own, along with the stable ID of the group or test, e.g.:
+
+        .. code-block:: none
+
+            {"description": "Main Group", "event": "group_enter", ...}
+            {"description": "thing is 1", "event": "case_start", ...}
+            {"duration": 0.001, "event": "case_end", "outcome": "passed", ...}
+
+        See :class:`.EventStreamWriter` for the fields of each event. The
+        lines are flushed in batches, so the file can be followed (e.g. with
+        ``tail -f``) while the tests run.
+
+        When using pytest, the ``--contextional-events`` option can be used
+        instead.
+        """
+        writer = EventStreamWriter(
+            target,
+            batch_size=batch_size,
+            interval=interval,
+        )
+        self.add_listener(writer)
+        self._helper._finish_callbacks.append(writer)
+
+    def capture_output(self, max_size=1024 * 1024):
+        """Capture the output of fixtures and tests, and show it if they fail.
+
+        :param max_size: The most bytes of output to keep in memory for
+            each group fixture or test before spilling it to a temporary
+            file.
+        :type max_size: int
+
+        While each group fixture runs, and while each test runs along with
+        its test setups and teardowns, what's written to ``sys.stdout`` and
+        ``sys.stderr``, and what's logged, is captured into a
+        :class:`tempfile.SpooledTemporaryFile` of its own, so a fixture that
+        writes a lot of output doesn't use a lot of memory. The output is
+        thrown away as soon as the fixture or test passes. Once all the tests
+        are done, the output of each that failed is shown, e.g.:
+
+        .. code-block:: none
+
+            contextional: captured output of 1 failure(s):
+            ---- tests.test_app::Main Group::Database (setup (1/1)) ----
+            connecting to localhost:5432
+            WARNING db: connection refused
+
+        When using pytest, the ``--contextional-capture`` option can be used
+        instead.
+        """
+        capture = OutputCapture(max_size=max_size)
+        self.add_listener(capture)
+        self._helper._finish_callbacks.append(capture._report)
+
+    def record_history(self, path=".contextional_history.sqlite",
+                       label=None):
+        """Add the outcomes and durations of the run to a history database.
+
+        :param path: The path of the sqlite database to add the run to.
+        :type path: str
+        :param label: Something to tell the run apart by (e.g. a commit
+            hash).
+        :type label: str
+
+        The outcome and duration of each test, and the fixture and inclusive
+        durations of each group, are recorded by their stable IDs, and added
+        to the database once all the tests are done, along with when the run
+        happened, where, and the ``label``. The database can then be queried
+        for the slowest groups, the tests whose duration grew the most, and
+        flaky tests, over the most recent runs, e.g.:
+
+        .. code-block:: none
+
+            $ python -m contextional.history .contextional_history.sqlite flaky
+             passed  failed   flips  test
+                 17       3       5  tests.test_app::Network::can reconnect
+
+        When using pytest, the ``--contextional-history`` and
+        ``--contextional-history-label`` options can be used instead.
+        """
+        recorder = HistoryRecorder(path, label=label)
+        self.add_listener(recorder)
+        self._helper._finish_callbacks.append(recorder._save)
+
+    def show_progress(self, history_path=None, interval=1.0, stream=None):
+        """Show how far along the run is, and roughly how long is left.
+
+        :param history_path: The path of a file to load the durations of
+            previous runs from, and save the durations of this one to.
+        :type history_path: str
+        :param interval: The fewest seconds between progress lines.
+        :type interval: float
+        :param stream: The stream to write the progress lines to. Defaults to
+            the stream the test runner writes its results to.
+
+        As tests finish, a line like this is written (at most once every
+        ``interval`` seconds):
+
+        .. code-block:: none
+
+            contextional: 1200/100000 tests, 0:01:05 elapsed, 1:30:12 left
+
+        If ``history_path`` is given, the time left is estimated using how
+        long each remaining test and group fixture took the last time it was
+        run. Otherwise, or for tests that haven't been run before, it's based
+        on how long the tests of this run have taken on average. Tests left
+        out by an incremental run (see :meth:`enable_incremental`) aren't
+        counted.
+
+        When using pytest, the ``--contextional-progress`` option can be used
+        instead.
+        """
+        tracker = ProgressTracker(
+            self._helper._root_groups,
+            history_path=history_path,
+            interval=interval,
+            stream=stream,
+            result_stream=stream is None,
+        )
+        self.add_listener(tracker)
+        self._helper._finish_callbacks.append(tracker._save)
+
+    def account_time(self):
+        """Report how much of the run's time was spent by whom.
+
+        From when Contextional first sets up a group to when it's done with
+        the last test, the time is split between:
+
+        - user code: the tests, and the setups and teardowns of tests and
+          groups.
+        - contextional: Contextional's own bookkeeping, like working out
+          which groups to set up and tear down for each test, and building
+          their descriptions.
+        - framework: the testing framework's machinery, i.e. everything
+          between when Contextional hands a test back and when it's given the
+          next one.
+        - output: writing the groups, tests, and their outcomes.
+
+        Once all the tests are done, each is shown with its share of the
+        time, and its time per test. When tests are fast, this shows whether
+        it's Contextional or the testing framework that's slowing the run
+        down. Checking whether this is enabled is all it costs when it isn't.
+
+        When using pytest, the ``--contextional-time-accounting`` option can
+        be used instead.
+
+        Example output:
+
+        .. code-block:: none
+
+            contextional: where the time went (2.482s, 10000 test(s)):
+              user code        0.212s    8.5%     21.2us/test
+              contextional     1.203s   48.5%    120.3us/test
+              framework        0.610s   24.6%     61.0us/test
+              output           0.457s   18.4%     45.7us/test
+        """
+        accountant = TimeAccountant(self._helper._root_groups, _clock)
+        self._helper._accountant = accountant
+        self._helper._finish_callbacks.append(accountant._report)
+
+    def buffer_output(self, size=64 * 1024, interval=0.5):
+        """Write the output of the run in batches, rather than bit by bit.
+
+        :param size: The number of characters to hold on to before writing
+            them out, once a line is finished.
+        :type size: int
+        :param interval: The most seconds to hold on to anything before
+            writing it out, even if it's only part of a line.
+        :type interval: float
+
+        Normally, each group, test, and outcome is written to the result's
+        stream as soon as it's known, one piece at a time, which adds up when
+        there are a lot of fast tests (especially when the stream is a
+        terminal). With this, everything written to the result's stream (by
+        both Contextional and the result) is held on to, and written out in
+        one go whenever there's ``size`` of it, or it's been held on to for
+        ``interval`` seconds. The output looks just the same, and a test that
+        hangs still shows up, ``...`` and all, after ``interval`` seconds.
+
+        Everything is written out before the errors and summary of the run.
+        This only affects the output of testing frameworks that write it
+        through a result's stream, like unittest and nose.
+        """
+        self._helper._output_buffering = {
+            "size": size,
+            "interval": interval,
+        }
+
+    def aggregate_cascading_failures(self, skip=False, max_paths=10):
+        """Report each cascading failure once, rather than for every test.
+
+        :param skip: Skip the tests a cascading failure reaches, rather than
+            failing them.
+        :type skip: bool
+        :param max_paths: The most IDs of affected tests to show for each
+            cascading failure.
+        :type max_paths: int
+
+        Normally, every test that a cascading failure reaches still goes
+        through its setup, run, and teardown, only to fail with its own
+        :class:`CascadingFailureError` and traceback. With this, those tests
+        are failed (or skipped) straight away, with a one line reason that
+        names the group that failed, and no traceback.
+
+        Once all the tests are done, each group that failed is shown with the
+        error that caused it, and the tests it reached, e.g.:
+
+        .. code-block:: none
+
+            contextional: 1 cascading failure(s) reached 20000 test(s):
+              tests.test_app::Main Group::Database
+                setup (1/1): OperationalError: could not connect
+                failed 20000 test(s):
+                  tests.test_app::Main Group::Database::Users::can be created
+                  ...
+                  (and 19990 more)
+
+        When using pytest, the ``--contextional-cascade`` option can be used
+        instead.
+        """
+        aggregator = CascadingFailureAggregator(
+            skip=skip,
+            max_paths=max_paths,
+        )
+        self._helper._cascade_aggregator = aggregator
+        self._helper._finish_callbacks.append(aggregator._report)
+
+    def deduplicate_tracebacks(self, path=None, max_paths=10):
+        """Only report each distinct traceback once.
+
+        :param path: The path of a JSON file to write the distinct tracebacks
+            to once all the tests are done.
+        :type path: str
+        :param max_paths: The most groups to show for each distinct
+            traceback.
+        :type max_paths: int
+
+        A broken fixture that many tests share (or a cascading failure) can
+        make thousands of failures with the same traceback, each of which is
+        normally formatted, held on to, and shown on its own. With this, each
+        failure and error is fingerprinted by its type, the frames it was
+        raised through, and its message (with any numbers taken out). Only
+        the first of each is reported as usual; the rest are reported as a
+        one line :class:`.DuplicateTraceback` that points at the first, and
+        share its traceback.
+
+        Once all the tests are done, each distinct traceback is shown with
+        how many times it happened, and in which groups, e.g.:
+
+        .. code-block:: none
+
+            contextional: 5001 failure(s) and error(s), 2 distinct:
+              OperationalError: could not connect (5000 occurrence(s))
+                tests.test_app::Main Group::Database::Users
+                tests.test_app::Main Group::Database::Orders
+              AssertionError: 1 != 2 (1 occurrence(s))
+                tests.test_app::Main Group::Math
+
+        When using pytest, the ``--contextional-dedup`` and
+        ``--contextional-dedup-json`` options can be used instead.
+        """
+        store = TracebackStore(path=path, max_paths=max_paths)
+        self._helper._traceback_store = store
+        self._helper._finish_callbacks.append(store._report)
+
+    def save_benchmarks(self, path):
+        """Write the results of the benchmarks to a file.
+
+        :param path: The path of the JSON file to write the results to.
+        :type path: str
+
+        Once all the tests are done, the stable ID, description, and summary
+        of each benchmark that was run (see :meth:`Context.add_benchmark`) is
+        written to the file, with its times in seconds.
+
+        When using pytest, the ``--contextional-benchmark-json`` option can be
+        used instead.
+        """
+        self._helper._finish_callbacks.append(
+            BenchmarkResults(self._helper._root_groups, path),
+        )
+
+    def save_benchmark_baseline(self, name,
+                                directory=".contextional_benchmarks"):
+        """Save the results of the benchmarks as a named baseline.
+
+        :param name: The name of the baseline.
+        :type name: str
+        :param directory: The directory the baselines are kept in.
+        :type directory: str
+
+        Once all the tests are done, the results of the benchmarks are written
+        to ``<directory>/<name>.json``, so later runs can be compared against
+        them using :meth:`compare_benchmarks`.
+
+        When using pytest, the ``--contextional-benchmark-save`` option can be
+        used instead.
+        """
+        self.save_benchmarks(baseline_path(directory, name))
+
+    def compare_benchmarks(self, name, directory=".contextional_benchmarks",
+                           threshold=0.1, alpha=0.05, fail=True):
+        """Compare the benchmarks against a saved baseline.
+
+        :param name: The name of the baseline.
+        :type name: str
+        :param directory: The directory the baselines are kept in.
+        :type directory: str
+        :param threshold: How much slower (or faster) a benchmark's median
+            has to be, as a fraction of the baseline's, to count as a
+            regression (or improvement).
+        :type threshold: float
+        :param alpha: How unlikely the difference has to be to have happened
+            by chance (i.e. the largest p-value that counts).
+        :type alpha: float
+        :param fail: Fail benchmarks that regressed.
+        :type fail: bool
+        :raises ValueError: If there's no baseline with that name.
+
+        As each benchmark is run, the times of its rounds are compared with
+        those of the baseline using the Mann-Whitney U test, which doesn't
+        assume the times are normally distributed. A benchmark has only
+        regressed if the difference is significant, and its median is more
+        than ``threshold`` slower than the baseline's. If ``fail`` is
+        ``True``, it then fails, just like a test would.
+
+        Once all the tests are done, the comparisons are shown in a tree, with
+        each benchmark under its groups. Benchmarks that aren't in the
+        baseline aren't compared.
+
+        When using pytest, the ``--contextional-benchmark-compare`` option can
+        be used instead.
+        """
+        baseline = BenchmarkBaseline(
+            self._helper._root_groups,
+            name,
+            directory=directory,
+            threshold=threshold,
+            alpha=alpha,
+            fail=fail,
+        )
+        self._helper._benchmark_baseline = baseline
+        self._helper._finish_callbacks.append(baseline._report)
+
+    def add_listener(self, listener):
+        """Let a listener know about groups, fixtures, and tests as they run.
+
+        :param listener: The listener to add.
+        :type listener: :class:`contextional.Listener`
+
+        The listener's methods are called with the group, fixture, or test
+        case each event is about, and the time it happened at:
+
+        - ``group_enter`` and ``group_exit``, when a group is about to be set
+          up, and once it's been torn down
+        - ``fixture_start`` and ``fixture_end``, around each group setup and
+          teardown
+        - ``test_setup_start`` and ``test_setup_end``, around a test's test
+          setups
+        - ``case_start`` and ``case_end``, around the test itself
+        - ``test_teardown_start`` and ``test_teardown_end``, around a test's
+          test teardowns
+        - ``case_finish``, once a test's outcome has been reported
+
+        The times all come from the same monotonic clock, so they're only
+        meaningful in relation to each other. The events are the same whether
+        the tests are run with unittest, nose, or pytest. In a dry run, only
+        ``group_enter`` and ``group_exit`` happen, since nothing else is run.
+
+        When there are no listeners, each of these events costs no more than
+        a single check.
+        """
+        self._helper._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop letting a listener know about events.
+
+        :param listener: The listener to remove.
+        :type listener: :class:`contextional.Listener`
+        """
+        self._helper._listeners.remove(listener)
+
 
 GroupContextManager = GcmMaker()
 
@@ -310,6 +1281,9 @@ class Context(object):
     :param cascading_failure: Cascade the failure to all tests within the root
         group.
     :type cascading_failure: bool.
+    :param session_group: The session group this context's root group should
+        be run in.
+    :type session_group: :class:`.SessionContext`
 
     A :class:`Context` is used to handle constructing groups, their fixtures,
     child groups, and tests through the various decorators and methods
@@ -345,11 +1319,18 @@ class Context(object):
     _helper = helper
     _current_manager = None
 
-    def __init__(self, description, cascading_failure=True):
+    def __init__(self, description, cascading_failure=True,
+                 session_group=None):
         self.__dict__["_group"] = Group(
             description,
             cascading_failure=cascading_failure,
         )
+        if session_group is not None:
+            if not isinstance(session_group, SessionContext):
+                raise TypeError(
+                    "session_group only accepts session group Contexts",
+                )
+            self._group._parent = session_group._group
         self.__dict__["_gcm"] = None
         self.__dict__["_parent_context"] = None
         self.__dict__["_old_manager"] = None
@@ -427,6 +1408,70 @@ class Context(object):
         else:
             return decorator
 
+    def add_benchmark(self, func, rounds=10, warmup=1, round_time=0.01):
+        """Add the decorated function to the current group as a benchmark.
+
+        :param func: The benchmark description or the benchmark function
+            itself
+        :type func: str or function
+        :param rounds: The number of rounds to time.
+        :type rounds: int
+        :param warmup: The number of rounds to run before the timed ones.
+        :type warmup: int
+        :param round_time: The fewest seconds each round should take.
+        :type round_time: float
+
+        A benchmark is a test that runs its function over and over, within its
+        group like any other test, so it can use what the group's setups made.
+        Before it's timed, the number of times the function needs to be run
+        for each round to take at least ``round_time`` seconds is worked out,
+        so even really fast functions can be timed accurately. Then it's run
+        for ``warmup`` rounds, and finally for ``rounds`` timed rounds.
+
+        The min, median, 95th and 99th percentiles, and standard deviation of
+        the time taken per call are shown beneath the benchmark in the test
+        output, and can be written to a file using
+        :meth:`GcmMaker.save_benchmarks`.
+
+        The description works the same way as :meth:`add_test`.
+
+        Example::
+
+            with GCM("Main Group") as MG:
+
+                @GCM.add_setup
+                def setUp():
+                    GCM.payload = make_large_payload()
+
+                @GCM.add_benchmark("parse large payload", rounds=20)
+                def test(case):
+                    parse(GCM.payload)
+
+        If the function fails, the benchmark fails like a test would.
+        """
+
+        if isinstance(func, FunctionType):
+            # use the function's __name__ if it has no docstring.
+            desc = func.__doc__ or func.__name__
+        else:
+            desc = func
+
+        def decorator(f):
+            case = BenchmarkCase(
+                self._group,
+                f,
+                desc,
+                rounds=rounds,
+                warmup=warmup,
+                round_time=round_time,
+            )
+            self._group._cases.append(case)
+
+        if isinstance(func, FunctionType):
+            decorator(func)
+        else:
+            return decorator
+
     @contextmanager
     def add_group(self, description, cascading_failure=True, params=()):
         """Use a new child group of the parent group for this context.
@@ -536,7 +1581,9 @@ class Context(object):
             group_identifiers = range(len(params))
         for gid in group_identifiers:
             args = () if no_params else params[gid]
-            new_group = deepcopy(self._group)
+            # the parent is shared rather than copied, along with the rest of
+            # the tree it leads to.
+            new_group = deepcopy(self._group, {id(last_group): last_group})
             new_group._parent = last_group
             new_group._args = args
             if isinstance(params, Mapping):
@@ -798,6 +1845,56 @@ class Context(object):
         """
         self._group._test_teardowns.append(func)
 
+    def add_lazy(self, name, factory=None, teardown=None):
+        """Add a lazy attribute to the shared namespace for the current group.
+
+        :param name: The name of the attribute
+        :type name: str
+        :param factory: A function that returns the attribute's value
+        :type factory: function
+        :param teardown: A function that cleans up the attribute's value,
+            which is passed to it
+        :type teardown: function
+
+        Unlike values assigned to the namespace in a setup, the factory is
+        only called the first time the attribute is accessed by a fixture or
+        test of the current group (or any of its descendants). That value is
+        then used until the current group is torn down, at which point the
+        teardown function is called with it (after the group's teardowns).
+        If the attribute was never accessed, neither function is called.
+
+        Like setups, the factory is passed the parameters of the current
+        group, if it has any.
+
+        This can be used as a decorator for the factory, too.
+
+        Example::
+
+            with GCM("Main Group") as MG:
+
+                @GCM.add_lazy("client", teardown=lambda client: client.close())
+                def make_client():
+                    return Client()
+
+                @GCM.add_test("client is connected")
+                def test(case):
+                    case.assertTrue(GCM.client.is_connected())
+
+        .. note::
+            To avoid any extra functions running by accident, this decorator
+            will NOT return any replacement function. The decorated function
+            will no longer exist in the global namespace of the module it was
+            declared in once the decorator is evaluated.
+        """
+
+        def decorator(f):
+            lazy = LazyAttribute(self._group, f, name, teardown)
+            self._group._lazy_attributes.append(lazy)
+
+        if factory is None:
+            return decorator
+        decorator(factory)
+
     @classmethod
     def utilize_asserts(cls, container):
         """Allow the use of custom assert method in tests.
@@ -943,6 +2040,10 @@ class Context(object):
                 raise TypeError(
                     "method only accepts Context objects",
                 )
+            if isinstance(context, SessionContext):
+                raise TypeError(
+                    "session groups can't be included in other groups",
+                )
             group_copy = deepcopy(context._group)
             group_copy._parent = self._group
             self._group._children.append(group_copy)
@@ -1020,6 +2121,10 @@ class Context(object):
                 raise TypeError(
                     "method only accepts Context objects",
                 )
+            if isinstance(context, SessionContext):
+                raise TypeError(
+                    "session groups can't be combined with other groups",
+                )
             group_copy = deepcopy(context._group)
             for setup in group_copy._setups:
                 setup._group = self._group
@@ -1033,6 +2138,9 @@ class Context(object):
             for test_teardown in group_copy._test_teardowns:
                 test_teardown._group = self._group
                 self._group._test_teardowns.append(test_teardown)
+            for lazy in group_copy._lazy_attributes:
+                lazy._group = self._group
+                self._group._lazy_attributes.append(lazy)
             for case in group_copy._cases:
                 case._group = self._group
                 self._group._cases.append(case)
@@ -1102,6 +2210,34 @@ class Context(object):
         self._group._build_test_cases(mod)
         if self._helper._get_test_count() > start_test_count:
             self._helper._set_teardown_level_for_last_case(NullGroup)
+        session_group = self._group._parent
+        if session_group is None:
+            self._helper._root_groups.append(self._group)
+        else:
+            # the session group is what actually runs the root group, so it
+            # should be treated as the root of the tree for reports.
+            session_group._children.append(self._group)
+            if session_group not in self._helper._root_groups:
+                self._helper._root_groups.append(session_group)
+
+
+class SessionContext(Context):
+    """A context manager for a session group and its fixtures.
+
+    See :meth:`.GcmMaker.session_group` for more details.
+    """
+
+    def __init__(self, description, cascading_failure=True):
+        super(SessionContext, self).__init__(description, cascading_failure)
+        self.__dict__["_group"] = SessionGroup(
+            description,
+            cascading_failure=cascading_failure,
+        )
+
+    def create_tests(self, mod=None):
+        raise TypeError(
+            "session groups are run through the Contexts that use them",
+        )
 
 
 class GroupTestCase(object):
@@ -1267,79 +2403,128 @@ class GroupTestCase(object):
         output provides the complete context for this test case.
         """
         __tracebackhide__ = True
-        self._auto_fail = any(
-            group._cascading_failure_in_progress
-            for group in self._group._ancestry,
-        )
-        self._case._test_started = True
-        if self._auto_fail is True:
+        with self._helper._accounting(CONTEXTIONAL):
+            self._auto_fail = any(
+                group._cascading_failure_in_progress
+                for group in self._group._ancestry,
+            )
+            self._case._test_started = True
+            if self._auto_fail is True:
+                LOGGER.debug(
+                    "CASCADING FAILURE - Not setting up for test:\n{}".format(
+                        self._group._get_full_ancestry_description(
+                            indented=True,
+                        ),
+                        ("  " * (self._group._level + 1)),
+                        self._case._description,
+                    ),
+                )
+                return
             LOGGER.debug(
-                "CASCADING FAILURE - Not setting up for test:\n{}".format(
+                "Running test setUps for test:\n{}\n{}{}".format(
                     self._group._get_full_ancestry_description(indented=True),
                     ("  " * (self._group._level + 1)),
                     self._case._description,
                 ),
             )
-            return
-        LOGGER.debug(
-            "Running test setUps for test:\n{}\n{}{}".format(
-                self._group._get_full_ancestry_description(indented=True),
-                ("  " * (self._group._level + 1)),
-                self._case._description,
-            ),
-        )
-        try:
-            for i, setup in enumerate(self._group._test_setups):
-                LOGGER.debug("Running test setUp #{}".format(i))
-                setup()
-                LOGGER.debug("test setUp #{} complete.".format(i))
-        except Exception:
-            LOGGER.debug(
-                "Couldn't complete setups for the test due to exception.",
-                exc_info=True,
-            )
-            if self._group._cascading_failure:
-                LOGGER.debug("Preparing for cascading failure.")
-                self.__class__._auto_fail = True
-                self._group._cascading_failure_in_progress = True
-            raise
-        LOGGER.debug("Test setups complete.")
+            listeners = self._helper._listeners
+            start_time = _clock()
+            if listeners:
+                self._helper._emit("test_setup_start", self._case, start_time)
+            try:
+                for i, setup in enumerate(self._group._test_setups):
+                    LOGGER.debug("Running test setUp #{}".format(i))
+                    with self._helper._accounting(USER):
+                        setup()
+                    LOGGER.debug("test setUp #{} complete.".format(i))
+            except Exception:
+                LOGGER.debug(
+                    "Couldn't complete setups for the test due to exception.",
+                    exc_info=True,
+                )
+                if self._group._cascading_failure:
+                    LOGGER.debug("Preparing for cascading failure.")
+                    self.__class__._auto_fail = True
+                    self._group._cascading_failure_in_progress = True
+                    self._group._cascading_failure_cause = (
+                        "test setup ({}/{})".format(
+                            i + 1,
+                            len(self._group._test_setups),
+                        ),
+                        format_error(sys.exc_info()),
+                    )
+                raise
+            finally:
+                end_time = _clock()
+                self._case._setup_duration = end_time - start_time
+                if listeners:
+                    self._helper._emit("test_setup_end", self._case, end_time)
+            LOGGER.debug("Test setups complete.")
 
     def tearDown(self):
         """The cleanup required to be run after each test in the group."""
         __tracebackhide__ = True
-        if self._auto_fail is True:
+        with self._helper._accounting(CONTEXTIONAL):
+            if self._auto_fail is True:
+                LOGGER.debug(
+                    "CASCADING FAILURE - Not tearing down test:\n{}".format(
+                        self._group._get_full_ancestry_description(
+                            indented=True,
+                        ),
+                        ("  " * (self._group._level + 1)),
+                        self._case._description,
+                    ),
+                )
+                return
             LOGGER.debug(
-                "CASCADING FAILURE - Not tearing down test:\n{}".format(
+                "Running test tearDowns for test:\n{}\n{}{}".format(
                     self._group._get_full_ancestry_description(indented=True),
                     ("  " * (self._group._level + 1)),
                     self._case._description,
                 ),
             )
-            return
-        LOGGER.debug(
-            "Running test tearDowns for test:\n{}\n{}{}".format(
-                self._group._get_full_ancestry_description(indented=True),
-                ("  " * (self._group._level + 1)),
-                self._case._description,
-            ),
-        )
-        try:
-            for i, teardown in enumerate(self._group._test_teardowns):
-                LOGGER.debug("Running test tearDown #{}".format(i))
-                teardown()
-                LOGGER.debug("test tearDown #{} complete.".format(i))
-        except Exception:
-            LOGGER.debug(
-                "Couldn't complete teardowns for the test due to exception.",
-                exc_info=True,
-            )
-            if self._group._cascading_failure:
-                LOGGER.debug("Preparing for cascading failure.")
-                self.__class__._auto_fail = True
-                self._group._cascading_failure_in_progress = True
-            raise
-        LOGGER.debug("Test teardowns complete.")
+            listeners = self._helper._listeners
+            start_time = _clock()
+            if listeners:
+                self._helper._emit(
+                    "test_teardown_start",
+                    self._case,
+                    start_time,
+                )
+            try:
+                for i, teardown in enumerate(self._group._test_teardowns):
+                    LOGGER.debug("Running test tearDown #{}".format(i))
+                    with self._helper._accounting(USER):
+                        teardown()
+                    LOGGER.debug("test tearDown #{} complete.".format(i))
+            except Exception:
+                LOGGER.debug(
+                    "Couldn't complete teardowns for the test due to "
+                    "exception.",
+                    exc_info=True,
+                )
+                if self._group._cascading_failure:
+                    LOGGER.debug("Preparing for cascading failure.")
+                    self.__class__._auto_fail = True
+                    self._group._cascading_failure_in_progress = True
+                    self._group._cascading_failure_cause = (
+                        "test teardown ({}/{})".format(
+                            i + 1,
+                            len(self._group._test_teardowns),
+                        ),
+                        format_error(sys.exc_info()),
+                    )
+                raise
+            finally:
+                end_time = _clock()
+                self._case._teardown_duration = end_time - start_time
+                if listeners:
+                    self._helper._emit(
+                        "test_teardown_end",
+                        self._case,
+                        end_time,
+                    )
+            LOGGER.debug("Test teardowns complete.")
 
     def _teardown_to_level(self, td_level):
         if td_level is None:
@@ -1355,14 +2540,26 @@ class GroupTestCase(object):
                 )
         teardown_groups = self._helper._level_stack[:stop_index:-1]
         for group in teardown_groups:
+            if group._session_scoped:
+                # session groups are only torn down once all tests are done.
+                continue
             group._teardown_group()
         LOGGER.debug("Teardowns complete.")
 
     def _teardown_to_common_level(self):
+        # session groups stay at the bottom of the level stack until all tests
+        # are done, so they shouldn't be considered when looking for where the
+        # current stack and this test's group branch off from each other.
         self._teardown_to_level(
             self._find_common_ancestor(
-                self._helper._level_stack,
-                self._group._setup_ancestry,
+                [
+                    g for g in self._helper._level_stack
+                    if not g._session_scoped
+                ],
+                [
+                    g for g in self._group._setup_ancestry
+                    if not g._session_scoped
+                ],
             ),
         )
 
@@ -1383,17 +2580,56 @@ class GroupTestCase(object):
         # attribute of the proxy object
         self.temp_result = ContextionalTestResultProxy(result)
 
-        LOGGER.debug("Setting up group:\n{}".format(str(self._group)))
-        self._teardown_to_common_level()
+        with self._helper._accounting(CONTEXTIONAL):
+            LOGGER.debug("Setting up group:\n{}".format(str(self._group)))
+            self._teardown_to_common_level()
 
-        for group in self._group._setup_ancestry:
-            group._result = self.temp_result
-            group._setup_group()
+            for group in self._group._setup_ancestry:
+                group._result = self.temp_result
+                group._setup_group()
+
+            aggregator = self._helper._cascade_aggregator
+            if aggregator is not None and any(
+                group._cascading_failure_in_progress
+                for group in self._group._ancestry,
+            ):
+                self._report_cascading_failure(self.temp_result, aggregator)
+                return
 
         LOGGER.debug("Setups complete.")
 
         return super(GroupTestCase, self).run(self.temp_result)
 
+    def _report_cascading_failure(self, result, aggregator):
+        """Fail (or skip) the test straight away, for a cascading failure.
+
+        It isn't set up, run, or torn down, and its failure has no traceback
+        to speak of, so it costs next to nothing.
+        """
+        LOGGER.debug(
+            "CASCADING FAILURE - Not running test:\n{}".format(
+                self._case._full_description,
+            ),
+        )
+        reason = aggregator._add(self._case)
+        result.startTest(self)
+        self._case._test_started = True
+        try:
+            if aggregator._skip:
+                result.addSkip(self, reason)
+            elif self._is_pytest:
+                # pytest needs a traceback, but only shows the reason (see
+                # pytest_runtest_makereport).
+                try:
+                    raise CascadingFailureError(reason)
+                except CascadingFailureError:
+                    result.addFailure(self, sys.exc_info())
+            else:
+                error = CascadingFailureError(reason)
+                result.addFailure(self, (CascadingFailureError, error, None))
+        finally:
+            result.stopTest(self)
+
     def _dry_run_teardown(self):
         # clean up level stack
         for group in self._case._teardown_groups:
@@ -1402,24 +2638,27 @@ class GroupTestCase(object):
 
     def runTest(self):
         __tracebackhide__ = True
-        if self._auto_fail is True:
-            LOGGER.debug(
-                "CASCADING FAILURE - Not running test:\n{}".format(
-                    self._case._full_description,
-                ),
-            )
-            raise CascadingFailureError()
-        LOGGER.debug("Running test:\n{}".format(self._case._full_description))
-        # Execute the actual test case function.
-        try:
-            self._case(self)
-        except Exception:
+        with self._helper._accounting(CONTEXTIONAL):
+            if self._auto_fail is True:
+                LOGGER.debug(
+                    "CASCADING FAILURE - Not running test:\n{}".format(
+                        self._case._full_description,
+                    ),
+                )
+                raise CascadingFailureError()
             LOGGER.debug(
-                "Test completed unsuccessfully.",
-                exc_info=True,
+                "Running test:\n{}".format(self._case._full_description),
             )
-            raise
-        LOGGER.debug("Test completed successfully.")
+            # Execute the actual test case function.
+            try:
+                self._case(self)
+            except Exception:
+                LOGGER.debug(
+                    "Test completed unsuccessfully.",
+                    exc_info=True,
+                )
+                raise
+            LOGGER.debug("Test completed successfully.")
 
 
 TEST_CLASS_NAME_TEMPLATE = "ContextionalCase_{}"
@@ -1430,6 +2669,8 @@ class Group(object):
 
     _helper = helper
     _pytest_dry_run = False
+    _id = None
+    _session_scoped = False
 
     def __init__(self, description, cascading_failure=True, args=(),
                  parent=None):
@@ -1438,12 +2679,16 @@ class Group(object):
         self._cascading_failure = cascading_failure
         self._cascading_failure_in_progress = False
         self._cascading_failure_root = False
+        # the description of the fixture that started this group's cascading
+        # failure, and its error (as text, so its frames can be let go of).
+        self._cascading_failure_cause = None
         self._args = args
         self._cases = []
         self._setups = []
         self._teardowns = []
         self._test_setups = []
         self._test_teardowns = []
+        self._lazy_attributes = []
         self._children = []
         self._teardown_level = self
         self._last_test_case = None
@@ -1573,10 +2818,55 @@ class Group(object):
     def _inline_description(self):
         return "  " * self._level + self._description
 
+    @property
+    def _setup_duration(self):
+        """Time spent running the setups of this group."""
+        return sum(
+            setup._duration
+            for setup in self._setups
+            if setup._duration is not None
+        )
+
+    @property
+    def _teardown_duration(self):
+        """Time spent running the teardowns of this group.
+
+        This includes the teardowns of its lazy attributes.
+        """
+        return sum(
+            teardown._duration
+            for teardown in self._teardowns + self._lazy_attributes
+            if teardown._duration is not None
+        )
+
+    @property
+    def _exclusive_duration(self):
+        """Time spent on this group's own fixtures and tests."""
+        return (
+            self._setup_duration +
+            self._teardown_duration +
+            sum(case._duration for case in self._cases)
+        )
+
+    @property
+    def _inclusive_duration(self):
+        """Time spent on this group, including its descendants."""
+        return self._exclusive_duration + sum(
+            child._inclusive_duration for child in self._children
+        )
+
     @property
     def _root_group(self):
-        """The root group of the :class:`.Context` instance."""
-        return self._ancestry[-1]
+        """The root group of the :class:`.Context` instance.
+
+        If the :class:`.Context` was run in a session group, this is the
+        group just below it.
+        """
+        ancestry = self._ancestry
+        for group in reversed(ancestry):
+            if not group._session_scoped:
+                return group
+        return ancestry[-1]
 
     def _build_test_cases(self, mod):
         """Build the test cases for this :class:`.Group`.
@@ -1590,6 +2880,17 @@ class Group(object):
         branches, then it's considered useless, and nothing will happen with
         it, even if it has setups or teardowns.
         """
+        if self._parent is None:
+            # the module is part of the ID, so that root groups with the same
+            # description in different modules don't get mixed up.
+            self._id = self._helper._make_id(
+                mod["__name__"] + "::" + self._description,
+            )
+        else:
+            self._id = self._helper._make_id(
+                self._parent._id + "::" + self._description,
+            )
+        selector = self._helper._selector
         if self._cases:
             # build test cases
             bases = (
@@ -1597,6 +2898,11 @@ class Group(object):
                 unittest.TestCase,
             )
             for case in self._cases:
+                case._id = self._helper._make_id(
+                    self._id + "::" + case._description,
+                )
+                if selector is not None and selector._should_skip(case):
+                    continue
                 self._helper._add_case(case)
                 case_name = TEST_CLASS_NAME_TEMPLATE.format(getrandbits(128))
                 _test = type(case_name, bases, {})
@@ -1627,14 +2933,16 @@ class Group(object):
         return child
 
     def _write(self, text):
-        if self._write_to_result:
-            self._result.stream.write(text)
-        elif self._pytest_writer is not None:
-            self._pytest_writer.write_ensure_prefix(text, "")
+        with self._helper._accounting(OUTPUT):
+            if self._write_to_result:
+                self._result.stream.write(text)
+            elif self._pytest_writer is not None:
+                self._pytest_writer.write_ensure_prefix(text, "")
 
     def _writeln(self):
         if self._write_to_result:
-            self._result.stream.writeln()
+            with self._helper._accounting(OUTPUT):
+                self._result.stream.writeln()
 
     def _setup_group(self):
         """Setup the :class:`Group`.
@@ -1646,7 +2954,14 @@ class Group(object):
         __tracebackhide__ = True
 
         if self in self._helper._level_stack:
-            # setup for this group has already been attempted
+            # setup for this group has already been attempted, but another
+            # root group may have been written since (e.g. between the
+            # modules that share a session group), so its description is
+            # written again for its tests to show up under.
+            if self not in self._helper._written_ancestry:
+                self._write(self._inline_description)
+                self._writeln()
+                self._helper._written_ancestry = self._setup_ancestry
             return
 
         self._write_to_result = False
@@ -1656,7 +2971,10 @@ class Group(object):
                     self._write_to_result = True
 
         self._helper._level_stack.append(self)
+        if self._helper._listeners:
+            self._helper._emit("group_enter", self, _clock())
         self._write(self._inline_description)
+        self._helper._written_ancestry = self._setup_ancestry
 
         self._cascading_failure_in_progress = any(
             group._cascading_failure_in_progress for group in self._ancestry,
@@ -1697,6 +3015,10 @@ class Group(object):
                 LOGGER.debug("Triggering cascading failure.")
                 self._cascading_failure_in_progress = True
                 self._cascading_failure_root = True
+                self._cascading_failure_cause = (
+                    setup.description,
+                    format_error(sys.exc_info()),
+                )
             if self._result is not None and self._pytest_writer is None:
                 if hasattr(self._result, "_result"):
                     if hasattr(self._result._result, "test"):
@@ -1731,43 +3053,92 @@ class Group(object):
                         str(self),
                     ),
                 )
-                self._helper._level_stack.remove(self)
+                self._leave_level_stack()
                 return
-        if self._teardowns:
+        # lazy attributes are cleaned up after the teardowns, but only if they
+        # were ever accessed.
+        lazy_attributes = [
+            lazy for lazy in self._lazy_attributes if lazy._realized
+        ]
+        if self._teardowns or lazy_attributes:
             LOGGER.debug("Running tearDowns for group:\n{}".format(str(self)))
+        try:
+            self._run_teardowns(self._teardowns)
+        finally:
             try:
-                for i, teardown in enumerate(self._teardowns):
-                    LOGGER.debug("Running tearDown #{}".format(i))
-                    self._last_location = teardown
-                    if teardown._description is not None:
-                        self._write(teardown._inline_description + " ")
-                    if not self._dry_run:
-                        teardown()
-                    if teardown._description is not None:
-                        # new line is only needed if teardown has a description
-                        # and no error was thrown.
-                        self._writeln()
-                LOGGER.debug("tearDown #{} complete.".format(i))
-            except:
-                LOGGER.debug("Group teardown failed.", exc_info=True)
-                if teardown._description is None:
-                    # make sure the teardown has something displayed if it
-                    # failed.
+                # what the lazy attributes hold is torn down even if one of
+                # the group's teardowns failed.
+                self._run_lazy_teardowns(lazy_attributes)
+            finally:
+                self._leave_level_stack()
+        LOGGER.debug("Done tearing down group.")
+
+    def _run_teardowns(self, teardowns):
+        """Run teardowns in order, until one of them fails.
+
+        The failure is reported to the result, or raised if there isn't one
+        to report it to (e.g. with pytest).
+        """
+        __tracebackhide__ = True
+        try:
+            for i, teardown in enumerate(teardowns):
+                LOGGER.debug("Running tearDown #{}".format(i))
+                self._last_location = teardown
+                if teardown._description is not None:
                     self._write(teardown._inline_description + " ")
-                if self._result is not None and self._pytest_writer is None:
-                    if hasattr(self._result, "_result"):
-                        if hasattr(self._result._result, "test"):
-                            old_result_test = self._result._result.test
-                            self._result._result.test = teardown
-                    self._result.addError(teardown, sys.exc_info())
-                    if hasattr(self._result, "_result"):
-                        if hasattr(self._result._result, "test"):
-                            self._result._result.test = old_result_test
-                else:
-                    self._helper._level_stack.remove(self)
-                    raise
+                if not self._dry_run:
+                    teardown()
+                if teardown._description is not None:
+                    # new line is only needed if teardown has a description
+                    # and no error was thrown.
+                    self._writeln()
+                LOGGER.debug("tearDown #{} complete.".format(i))
+        except:
+            LOGGER.debug("Group teardown failed.", exc_info=True)
+            if teardown._description is None:
+                # make sure the teardown has something displayed if it
+                # failed.
+                self._write(teardown._inline_description + " ")
+            if self._result is not None and self._pytest_writer is None:
+                if hasattr(self._result, "_result"):
+                    if hasattr(self._result._result, "test"):
+                        old_result_test = self._result._result.test
+                        self._result._result.test = teardown
+                self._result.addError(teardown, sys.exc_info())
+                if hasattr(self._result, "_result"):
+                    if hasattr(self._result._result, "test"):
+                        self._result._result.test = old_result_test
+            else:
+                raise
+
+    def _run_lazy_teardowns(self, lazy_attributes):
+        """Tear down lazy attributes, each even if one before it failed."""
+        __tracebackhide__ = True
+        if not lazy_attributes:
+            return
+        try:
+            self._run_teardowns(lazy_attributes[:1])
+        finally:
+            self._run_lazy_teardowns(lazy_attributes[1:])
+
+    def _leave_level_stack(self):
+        if self._helper._listeners:
+            self._helper._emit("group_exit", self, _clock())
         self._helper._level_stack.remove(self)
-        LOGGER.debug("Done tearing down group.")
+
+
+class SessionGroup(Group):
+    """A group that's shared by the root groups of many :class:`Context`\ s.
+
+    Copying a session group (e.g. when a :class:`Context` that uses it is
+    included in another) doesn't make a new one, so there is only ever one of
+    it to set up and tear down.
+    """
+
+    _session_scoped = True
+
+    def __deepcopy__(self, memo):
+        return self
 
 
 class NullGroup(object):
@@ -1792,9 +3163,22 @@ class Case(object):
     """
 
     _helper = helper
-    _exc_info = None
+    _error = None
     _dry_run_description_cache = None
     _pytest_dry_run = False
+    _id = None
+    _fingerprint = None
+    _outcome = None
+    _skip_reason = None
+    _duplicate_traceback = None
+    # whether it's been queued up to run (i.e. it wasn't left out by an
+    # incremental run).
+    _queued = False
+    _setup_duration = None
+    _call_duration = None
+    _teardown_duration = None
+    # overridden by subclasses that don't just call the test function once.
+    _call_func = None
 
     def __init__(self, group, func, description):
         self._group = group
@@ -1812,9 +3196,39 @@ class Case(object):
         else:
             funcargs = inspect.getargspec(self._func)[0]
         if funcargs:
-            self._func(testcase, *args)
+            args = (testcase,) + args
         else:
-            self._func()
+            args = ()
+        listeners = helper._listeners
+        start_time = _clock()
+        if listeners:
+            helper._emit("case_start", self, start_time)
+        try:
+            with helper._accounting(USER):
+                if self._call_func is None:
+                    # the function is called directly, so that there's no
+                    # extra frame in its tracebacks.
+                    self._func(*args)
+                else:
+                    self._call_func(self._func, *args)
+        finally:
+            end_time = _clock()
+            self._call_duration = end_time - start_time
+            if listeners:
+                helper._emit("case_end", self, end_time)
+
+    @property
+    def _duration(self):
+        """Time spent on the test setups, the test, and the test teardowns."""
+        return sum(
+            duration
+            for duration in (
+                self._setup_duration,
+                self._call_duration,
+                self._teardown_duration,
+            )
+            if duration is not None
+        )
 
     def __str__(self):
         if self._pytest_dry_run:
@@ -1864,7 +3278,11 @@ class Case(object):
                             "current stack."
                         ),
                     )
-            teardown_groups = self._helper._level_stack[:stop_index:-1]
+            teardown_groups = [
+                group
+                for group in self._helper._level_stack[:stop_index:-1]
+                if not group._session_scoped
+            ]
 
         return teardown_groups
 
@@ -1888,6 +3306,44 @@ class Case(object):
         return getattr(self._helper, attr)
 
 
+class BenchmarkCase(Case):
+    """A test case that times its function over a number of rounds.
+
+    Once it's run, the summary of the time each call took is in
+    :attr:`_stats`.
+    """
+
+    _stats = None
+
+    def __init__(self, group, func, description, rounds=10, warmup=1,
+                 round_time=0.01):
+        super(BenchmarkCase, self).__init__(group, func, description)
+        self._rounds = rounds
+        self._warmup = warmup
+        self._round_time = round_time
+
+    def _call_func(self, func, *args):
+        """Run the test function repeatedly, and summarize how long it took."""
+        __tracebackhide__ = True
+        self._stats = run_benchmark(
+            partial(func, *args),
+            rounds=self._rounds,
+            warmup=self._warmup,
+            round_time=self._round_time,
+            clock=_clock,
+        )
+        if helper._benchmark_baseline is not None:
+            helper._benchmark_baseline._compare(self)
+
+    def _write_stats(self):
+        """Show the stats beneath the benchmark's line in the test output."""
+        if self._stats is not None:
+            self._group._write(
+                "  " * (self._group._level + 2) + format_stats(self._stats),
+            )
+            self._group._writeln()
+
+
 class Fixture(object):
     """Information about the fixture.
 
@@ -1901,9 +3357,10 @@ class Fixture(object):
     """
 
     _helper = helper
-    _exc_info = None
+    _error = None
     _dry_run_description_cache = None
     _pytest_dry_run = False
+    _duration = None
 
     def __init__(self, group, func, description=None):
         self._group = group
@@ -1913,7 +3370,32 @@ class Fixture(object):
     def __call__(self, *args, **kwargs):
         """Performs the actual test."""
         __tracebackhide__ = True
-        self._func(*args, **kwargs)
+        self._call(self._func, *args, **kwargs)
+
+    def _call(self, func, *args, **kwargs):
+        """Call one of the fixture's functions, timed, as user code.
+
+        :returns: What the function returned.
+        """
+        __tracebackhide__ = True
+        listeners = self._helper._listeners
+        # test fixtures are called for every test.
+        self._error = None
+        start_time = _clock()
+        if listeners:
+            self._helper._emit("fixture_start", self, start_time)
+        try:
+            with self._helper._accounting(USER):
+                return func(*args, **kwargs)
+        except Exception:
+            if listeners:
+                self._error = FormattedError(sys.exc_info())
+            raise
+        finally:
+            end_time = _clock()
+            self._duration = end_time - start_time
+            if listeners:
+                self._helper._emit("fixture_end", self, end_time)
 
     def __str__(self):
         if self._pytest_dry_run:
@@ -1924,8 +3406,7 @@ class Fixture(object):
     @property
     def _parent_collection(self):
         """List of fixtures of this type belonging to the parent group."""
-        collection_name = "_" + self._fixture_type.lower() + "s"
-        return getattr(self._group, collection_name)
+        return getattr(self._group, self._collection_name)
 
     @property
     def _position(self):
@@ -1969,14 +3450,72 @@ class Fixture(object):
         return getattr(self._helper, attr)
 
 
+class LazyAttribute(Fixture):
+    """An attribute of the shared namespace that's made when it's needed.
+
+    The factory function is only called the first time the attribute is
+    looked up while its :class:`Group` is set up, and the value is kept until
+    the :class:`Group` is torn down. Calling the :class:`LazyAttribute` lets
+    go of the value, and passes it to the teardown function, if there is one.
+    Both functions are timed and reported to listeners like any fixture.
+    """
+
+    _fixture_type = "lazy attribute"
+    _collection_name = "_lazy_attributes"
+
+    def __init__(self, group, func, name, teardown=None):
+        super(LazyAttribute, self).__init__(group, func)
+        self._name = name
+        self._teardown_func = teardown
+        self._realized = False
+        self._value = None
+        self._tearing_down = False
+
+    def __call__(self):
+        """Let go of the value and tear it down."""
+        __tracebackhide__ = True
+        value = self._value
+        self._forget()
+        if self._teardown_func is not None:
+            self._tearing_down = True
+            try:
+                self._call(self._teardown_func, value)
+            finally:
+                self._tearing_down = False
+
+    def _get_value(self):
+        __tracebackhide__ = True
+        if not self._realized:
+            LOGGER.debug("Making lazy attribute '{}'".format(self._name))
+            if isinstance(self._group._args, Mapping):
+                self._value = self._call(self._func, **self._group._args)
+            else:
+                self._value = self._call(self._func, *self._group._args)
+            self._realized = True
+        return self._value
+
+    def _forget(self):
+        self._realized = False
+        self._value = None
+
+    @property
+    def description(self):
+        """Description of the lazy attribute's factory, or its teardown."""
+        if self._tearing_down:
+            return "teardown of lazy attribute '{}'".format(self._name)
+        return "lazy attribute '{}'".format(self._name)
+
+
 class SetUpFixture(Fixture):
 
     _fixture_type = "setup"
+    _collection_name = "_setups"
 
 
 class TearDownFixture(Fixture):
 
     _fixture_type = "teardown"
+    _collection_name = "_teardowns"
 
 
 class GroupRepr(object):
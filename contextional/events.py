@@ -0,0 +1,137 @@
+from __future__ import absolute_import
+
+import io
+import json
+
+from contextional.listener import Listener
+
+
+class EventStreamWriter(Listener):
+    """Write each event of the run as a line of JSON.
+
+    :param target: The path of the file to write to, or the number of a file
+        descriptor that's already open (e.g. ``1`` for stdout).
+    :type target: str or int
+    :param batch_size: The most lines to hold on to before flushing them.
+    :type batch_size: int
+    :param interval: The most seconds to hold on to a line before flushing.
+    :type interval: float
+
+    Every line is a complete JSON object with the ``"event"``, the
+    ``"time"`` it happened at (from a monotonic clock), and the ``"id"`` of
+    the group or test it's about:
+
+    - ``group_enter`` and ``group_exit``, with the group's ``"description"``,
+      ``"parent"`` ID, and ``"level"``
+    - ``fixture_start`` and ``fixture_end``, with the fixture's
+      ``"description"``, its ``"type"``, and (at the end) its
+      ``"duration"``. If it raised an error, ``fixture_error`` comes right
+      before its ``fixture_end``, with the ``"error"``.
+    - ``case_start``, with the test's ``"description"``, before its test
+      setups (tests that fail because of a cascading failure don't have one)
+    - ``case_end``, with its ``"outcome"``, ``"duration"`` (including its
+      test setups and teardowns), and ``"error"`` if it failed or errored
+
+    Lines are written to the file whole, and are flushed in batches, so
+    another process can follow the file as the run goes.
+    """
+
+    def __init__(self, target, batch_size=100, interval=1.0):
+        if isinstance(target, int):
+            self._file = io.open(
+                target,
+                "w",
+                encoding="utf-8",
+                closefd=False,
+            )
+        else:
+            self._file = io.open(target, "w", encoding="utf-8")
+        self._batch_size = batch_size
+        self._interval = interval
+        self._lines = []
+        self._last_flush = None
+
+    def _write(self, event, timestamp, obj_id, **fields):
+        fields["event"] = event
+        fields["time"] = timestamp
+        fields["id"] = obj_id
+        line = json.dumps(fields, sort_keys=True)
+        if not isinstance(line, type(u"")):
+            line = line.decode("utf-8")
+        self._lines.append(line + u"\n")
+        if self._last_flush is None:
+            self._last_flush = timestamp
+        if (len(self._lines) >= self._batch_size or
+                timestamp - self._last_flush >= self._interval):
+            self._flush(timestamp)
+
+    def _flush(self, timestamp=None):
+        self._file.write(u"".join(self._lines))
+        self._file.flush()
+        self._lines = []
+        self._last_flush = timestamp
+
+    def group_enter(self, group, timestamp):
+        parent = group._parent
+        self._write(
+            "group_enter",
+            timestamp,
+            group._id,
+            description=group._description,
+            parent=None if parent is None else parent._id,
+            level=group._level,
+        )
+
+    def group_exit(self, group, timestamp):
+        self._write("group_exit", timestamp, group._id)
+
+    def fixture_start(self, fixture, timestamp):
+        self._write(
+            "fixture_start",
+            timestamp,
+            fixture._group._id,
+            description=fixture.description,
+            type=fixture._fixture_type,
+        )
+
+    def fixture_end(self, fixture, timestamp):
+        if fixture._error is not None:
+            self._write(
+                "fixture_error",
+                timestamp,
+                fixture._group._id,
+                description=fixture.description,
+                error=fixture._error.message,
+            )
+        self._write(
+            "fixture_end",
+            timestamp,
+            fixture._group._id,
+            description=fixture.description,
+            duration=fixture._duration,
+        )
+
+    def test_setup_start(self, case, timestamp):
+        self._write(
+            "case_start",
+            timestamp,
+            case._id,
+            description=case._description,
+        )
+
+    def case_finish(self, case, timestamp):
+        fields = {}
+        if case._outcome in ("failed", "error"):
+            fields["error"] = case._error.message
+        self._write(
+            "case_end",
+            timestamp,
+            case._id,
+            outcome=case._outcome,
+            duration=case._duration,
+            **fields
+        )
+
+    def __call__(self, stream):
+        self._flush()
+        self._file.close()
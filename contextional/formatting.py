@@ -0,0 +1,41 @@
+from __future__ import absolute_import
+
+import re
+import traceback
+
+
+# characters that aren't allowed anywhere in XML 1.0.
+INVALID_CHARACTERS = re.compile(u"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def format_error(exc_info):
+    """The last line of an exception's traceback (e.g. ``KeyError: 'a'``)."""
+    exc_type, exc_value = exc_info[:2]
+    return traceback.format_exception_only(exc_type, exc_value)[-1].strip()
+
+
+def xml_text(value):
+    """Make text safe to put in XML (or HTML).
+
+    Byte strings are decoded as UTF-8, and characters that aren't allowed in
+    XML are replaced. It still has to be escaped.
+    """
+    if not isinstance(value, type(u"")):
+        value = value.decode("utf-8", "replace")
+    return INVALID_CHARACTERS.sub(u"\ufffd", value)
+
+
+class FormattedError(object):
+    """What the reports need to know about an error, as text.
+
+    :param exc_info: The error, as returned by :func:`sys.exc_info`.
+    :type exc_info: tuple
+
+    The traceback itself isn't kept, so the frames it refers to (and their
+    locals) can be let go of as soon as the error has been reported.
+    """
+
+    def __init__(self, exc_info):
+        self.type_name = exc_info[0].__name__
+        self.message = format_error(exc_info)
+        self.text = "".join(traceback.format_exception(*exc_info))
@@ -0,0 +1,288 @@
+"""Query the history of runs recorded by ``GCM.record_history()``.
+
+e.g.::
+
+    python -m contextional.history .contextional_history.sqlite growing-tests
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import platform
+import socket
+import sqlite3
+import sys
+import time
+
+from contextional.listener import Listener
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL,
+    finished REAL,
+    hostname TEXT,
+    python TEXT,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id INTEGER,
+    id TEXT,
+    group_id TEXT,
+    outcome TEXT,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS groups (
+    run_id INTEGER,
+    id TEXT,
+    fixture_duration REAL,
+    inclusive_duration REAL
+);
+CREATE INDEX IF NOT EXISTS cases_by_id ON cases (id, run_id);
+CREATE INDEX IF NOT EXISTS groups_by_id ON groups (id, run_id);
+"""
+
+
+class HistoryRecorder(Listener):
+    """Record the outcome and duration of each test and group of the run.
+
+    :param path: The path of the sqlite database to add the run to.
+    :type path: str
+    :param label: Something to tell the run apart by (e.g. a commit hash).
+    :type label: str
+
+    Tests are recorded as their outcome is reported, and groups as they're
+    torn down, by their stable IDs. Once all the tests are done, they're
+    added to the database in one go, along with when the run started and
+    finished, the host it ran on, the version of Python, and the label.
+    """
+
+    def __init__(self, path, label=None):
+        self._path = path
+        self._label = label
+        self._started = None
+        self._cases = []
+        self._groups = []
+
+    def group_enter(self, group, timestamp):
+        if self._started is None:
+            self._started = time.time()
+
+    def group_exit(self, group, timestamp):
+        self._groups.append(
+            (
+                group._id,
+                group._setup_duration + group._teardown_duration,
+                group._inclusive_duration,
+            ),
+        )
+
+    def case_finish(self, case, timestamp):
+        if case._outcome is not None:
+            self._cases.append(
+                (case._id, case._group._id, case._outcome, case._duration),
+            )
+
+    def _save(self, stream):
+        if self._started is None:
+            return
+        connection = sqlite3.connect(self._path, timeout=60)
+        try:
+            with connection:
+                connection.executescript(SCHEMA)
+                run_id = connection.execute(
+                    "INSERT INTO runs (started, finished, hostname, python, "
+                    "label) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        self._started,
+                        time.time(),
+                        socket.gethostname(),
+                        platform.python_version(),
+                        self._label,
+                    ),
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO cases VALUES (?, ?, ?, ?, ?)",
+                    [(run_id,) + row for row in self._cases],
+                )
+                connection.executemany(
+                    "INSERT INTO groups VALUES (?, ?, ?, ?)",
+                    [(run_id,) + row for row in self._groups],
+                )
+        finally:
+            connection.close()
+
+
+def _recent_run_ids(connection, runs):
+    """The IDs of the most recent runs, oldest first."""
+    return [
+        row[0]
+        for row in connection.execute(
+            "SELECT id FROM runs ORDER BY id DESC LIMIT ?",
+            (runs,),
+        )
+    ][::-1]
+
+
+def _durations(connection, table, column, runs):
+    """The durations of each test (or group) over the most recent runs.
+
+    :returns: The durations of each, in the order of the runs, by ID.
+    :rtype: dict
+    """
+    run_ids = _recent_run_ids(connection, runs)
+    durations = {}
+    if not run_ids:
+        return durations
+    for obj_id, duration in connection.execute(
+        "SELECT id, {} FROM {} WHERE run_id >= ? ORDER BY run_id".format(
+            column,
+            table,
+        ),
+        (run_ids[0],),
+    ):
+        durations.setdefault(obj_id, []).append(duration)
+    return durations
+
+
+def _slope(values):
+    """How much the values grew per run, as a least squares fit."""
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    if not variance:
+        return 0.0
+    return sum(
+        (x - mean_x) * (y - mean_y)
+        for x, y in enumerate(values)
+    ) / variance
+
+
+def slowest_groups(connection, runs=10, limit=10):
+    """The groups that took the longest, on average, over recent runs.
+
+    :returns: The ID, mean inclusive duration, and growth per run (in
+        seconds) of each, slowest first.
+    :rtype: list of tuple
+    """
+    rows = [
+        (group_id, sum(values) / len(values), _slope(values))
+        for group_id, values in _durations(
+            connection,
+            "groups",
+            "inclusive_duration",
+            runs,
+        ).items()
+    ]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:limit]
+
+
+def growing_tests(connection, runs=10, limit=10):
+    """The tests whose duration grew the most over recent runs.
+
+    :returns: The ID, first duration, last duration, and growth per run (in
+        seconds) of each, fastest growing first.
+    :rtype: list of tuple
+    """
+    rows = [
+        (case_id, values[0], values[-1], _slope(values))
+        for case_id, values in _durations(
+            connection,
+            "cases",
+            "duration",
+            runs,
+        ).items()
+        if len(values) > 1
+    ]
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return [row for row in rows if row[3] > 0][:limit]
+
+
+def flaky_tests(connection, runs=10, limit=10):
+    """The tests that both passed and failed over recent runs.
+
+    :returns: The ID, number of runs it passed, number of runs it failed (or
+        errored), and number of times its outcome flipped, of each, flakiest
+        first.
+    :rtype: list of tuple
+    """
+    run_ids = _recent_run_ids(connection, runs)
+    outcomes = {}
+    if run_ids:
+        for case_id, outcome in connection.execute(
+            "SELECT id, outcome FROM cases WHERE run_id >= ? AND outcome IN "
+            "('passed', 'failed', 'error') ORDER BY run_id",
+            (run_ids[0],),
+        ):
+            outcomes.setdefault(case_id, []).append(outcome == "passed")
+    rows = []
+    for case_id, passes in outcomes.items():
+        passed = sum(passes)
+        if passed and passed < len(passes):
+            flips = sum(
+                1
+                for before, after in zip(passes, passes[1:])
+                if before != after
+            )
+            rows.append((case_id, passed, len(passes) - passed, flips))
+    rows.sort(key=lambda row: (row[3], row[2]), reverse=True)
+    return rows[:limit]
+
+
+QUERIES = {
+    "slowest-groups": (
+        slowest_groups,
+        "{:>11} {:>14}  {}",
+        ("mean (s)", "trend (s/run)", "group"),
+        "{1:>11.3f} {2:>+14.4f}  {0}",
+    ),
+    "growing-tests": (
+        growing_tests,
+        "{:>11} {:>11} {:>14}  {}",
+        ("first (s)", "last (s)", "trend (s/run)", "test"),
+        "{1:>11.3f} {2:>11.3f} {3:>+14.4f}  {0}",
+    ),
+    "flaky": (
+        flaky_tests,
+        "{:>7} {:>7} {:>7}  {}",
+        ("passed", "failed", "flips", "test"),
+        "{1:>7} {2:>7} {3:>7}  {0}",
+    ),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="the history database.")
+    parser.add_argument("query", choices=sorted(QUERIES))
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="how many of the most recent runs to look at.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="the most groups or tests to show.",
+    )
+    args = parser.parse_args(argv)
+
+    query, header_format, header, row_format = QUERIES[args.query]
+    connection = sqlite3.connect(args.path)
+    try:
+        connection.executescript(SCHEMA)
+        rows = query(connection, runs=args.runs, limit=args.limit)
+    finally:
+        connection.close()
+    print(header_format.format(*header))
+    for row in rows:
+        print(row_format.format(*row))
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+from __future__ import absolute_import
+
+import io
+from xml.sax.saxutils import escape, quoteattr
+
+from contextional.formatting import xml_text
+from contextional.tree import NestedWriter
+
+
+# the more that went wrong in a group, the higher its outcome ranks.
+OUTCOME_RANKS = {"passed": 0, "skipped": 1, "failed": 2, "error": 3}
+
+HEAD = u"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Contextional Report</title>
+<style>
+body { font-family: sans-serif; font-size: 14px; }
+details, .leaf { margin-left: 1.5em; }
+summary, .leaf { padding: 1px 4px; border-left: 4px solid #ccc; }
+.passed > summary, .leaf.passed { border-left-color: #2a2; }
+.skipped > summary, .leaf.skipped { border-left-color: #cc2; }
+.failed > summary, .leaf.failed { border-left-color: #d22; }
+.error > summary, .leaf.error { border-left-color: #a0a; }
+.stats { color: #555; font-size: 12px; margin-left: 1em; }
+</style>
+<script>
+// the writer only knows a group's time and outcome once it's torn down, so
+// they're at the end of the group, and are moved into place here.
+document.addEventListener("DOMContentLoaded", function () {
+  var ends = document.querySelectorAll("i.end");
+  for (var i = 0; i < ends.length; i++) {
+    var group = ends[i].parentNode;
+    group.setAttribute("data-t", ends[i].getAttribute("data-t"));
+    group.className = ends[i].getAttribute("data-o");
+  }
+  var nodes = document.querySelectorAll("details[data-t], .leaf");
+  var max = 0;
+  for (i = 0; i < nodes.length; i++) {
+    max = Math.max(max, parseFloat(nodes[i].getAttribute("data-t")));
+  }
+  for (i = 0; i < nodes.length; i++) {
+    var node = nodes[i];
+    var time = parseFloat(node.getAttribute("data-t"));
+    var parent = node.parentNode.closest("details[data-t]");
+    var stats = time.toFixed(3) + "s";
+    if (parent) {
+      var parentTime = parseFloat(parent.getAttribute("data-t"));
+      if (parentTime > 0) {
+        stats += " (" + (time / parentTime * 100).toFixed(1) + "%)";
+      }
+    }
+    var label = node.tagName == "DETAILS" ? node.firstElementChild : node;
+    var span = document.createElement("span");
+    span.className = "stats";
+    span.textContent = stats;
+    label.appendChild(span);
+    var heat = max > 0 ? Math.sqrt(time / max) : 0;
+    label.style.background = "rgba(255, 80, 0, " + heat.toFixed(3) + ")";
+  }
+});
+</script>
+</head>
+<body>
+<h1>Contextional Report</h1>
+"""
+
+FOOT = u"""</body>
+</html>
+"""
+
+
+def _seconds(duration):
+    return u"{:.6f}".format(duration or 0.0)
+
+
+class HTMLReportWriter(NestedWriter):
+    """Write the outcome of the run as an HTML page, as it happens.
+
+    :param path: The path of the HTML file to write to.
+    :type path: str
+
+    Each group is a collapsible ``details`` element, nested inside that of
+    its parent, with its tests, and its fixtures that have descriptions or
+    raised an error, inside it. The page shows each with its outcome, how
+    long it took (including descendants, for groups), and its share of its
+    group's time, and colours it by how long it took compared to the slowest
+    of them. A session group's element is split wherever another module's
+    tests run in between its modules, and each part shows how long it was
+    open for.
+
+    Everything is written as it finishes, and the page works out the shares
+    and colours when it's opened, so nothing but the outcomes of the groups
+    that are set up is held on to. The page needs nothing else to be viewed,
+    and can be viewed even if the run was cut short.
+    """
+
+    def __init__(self, path):
+        super(HTMLReportWriter, self).__init__()
+        self._path = path
+        self._file = None
+        # the worst outcome so far of each open group, and when it was
+        # opened.
+        self._outcomes = []
+        self._opened_at = []
+        # the session groups that were closed to make way for other modules,
+        # so their time is only that of each part.
+        self._split = set()
+
+    def _writeln(self, line):
+        if self._file is None:
+            self._file = io.open(self._path, "w", encoding="utf-8")
+            self._file.write(HEAD)
+        self._file.write(line + u"\n")
+
+    def _add_outcome(self, outcome):
+        if self._outcomes and (
+            OUTCOME_RANKS.get(outcome, 0) >
+            OUTCOME_RANKS[self._outcomes[-1]]
+        ):
+            self._outcomes[-1] = outcome
+
+    def _write_leaf(self, description, outcome, duration, error=None):
+        line = u"<div class={} data-t={}".format(
+            quoteattr(u"leaf " + (outcome or u"none")),
+            quoteattr(_seconds(duration)),
+        )
+        if error is not None:
+            line += u" title={}".format(quoteattr(xml_text(error.message)))
+        self._writeln(
+            line + u">" + escape(xml_text(description)) + u"</div>",
+        )
+        self._add_outcome(outcome)
+
+    def _open(self, group, child, timestamp):
+        self._writeln(
+            u"<details{}><summary>{}</summary>".format(
+                u"" if self._outcomes else u" open",
+                escape(xml_text(group._description)),
+            ),
+        )
+        self._outcomes.append("passed")
+        self._opened_at.append(timestamp)
+
+    def _close(self, group, timestamp, exited):
+        outcome = self._outcomes.pop()
+        opened_at = self._opened_at.pop()
+        if timestamp is None:
+            self._writeln(u"</details>")
+            return
+        if exited and group not in self._split:
+            duration = group._inclusive_duration
+        else:
+            duration = timestamp - opened_at
+            self._split.add(group)
+        self._writeln(
+            u"<i class=\"end\" data-t={} data-o={}></i></details>".format(
+                quoteattr(_seconds(duration)),
+                quoteattr(outcome),
+            ),
+        )
+        self._add_outcome(outcome)
+        if exited:
+            self._file.flush()
+
+    def fixture_end(self, fixture, timestamp):
+        if fixture._description is None and fixture._error is None:
+            return
+        self._nest(fixture._group, timestamp)
+        self._write_leaf(
+            fixture.description,
+            "passed" if fixture._error is None else "error",
+            fixture._duration,
+            fixture._error,
+        )
+
+    def case_finish(self, case, timestamp):
+        error = None
+        if case._outcome in ("failed", "error"):
+            error = case._error
+        self._nest(case._group, timestamp)
+        self._write_leaf(
+            case._description,
+            case._outcome,
+            case._duration,
+            error,
+        )
+
+    def __call__(self, stream):
+        if self._file is None:
+            return
+        self._nest(None, None)
+        self._file.write(FOOT)
+        self._file.close()
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+from types import CodeType, ModuleType
+
+
+def update_code_digest(digest, code):
+    """Hash a code object, ignoring its file name and line numbers.
+
+    This way, tests and fixtures that were only moved around don't have to be
+    run again.
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    digest.update(repr(code.co_varnames).encode("utf-8"))
+    digest.update(repr(code.co_freevars).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            update_code_digest(digest, const)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+class IncrementalSelector(object):
+    """Skip the test cases that haven't changed since they last passed.
+
+    :param cache_path: The path of the file used to store the fingerprints
+        and outcomes of previous runs.
+    :type cache_path: str
+    :param modules: Also fingerprint the source of modules referenced by the
+        test and fixture functions.
+    :type modules: bool
+
+    Each :class:`.Case` is identified by its stable ID, and is fingerprinted
+    using the code of its test function, the code of every fixture in its
+    setup ancestry (as well as the test setups and test teardowns of its own
+    :class:`.Group`), and the parameters of each of those groups. If
+    ``modules`` is ``True``, the source of every module referenced by name in
+    those functions is included as well.
+
+    If a case's fingerprint matches the one recorded for it in the previous
+    run, and it passed in that run, it will not be built, so neither it nor
+    any setups that only it would need will be run.
+    """
+
+    def __init__(self, cache_path, modules=False):
+        self._cache_path = cache_path
+        self._modules = modules
+        self._records = {}
+        self._selected = []
+        self._skipped = []
+        self._module_hashes = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, "r") as f:
+                self._records = json.load(f).get("cases", {})
+
+    def _should_skip(self, case):
+        """Fingerprint the case and decide whether it needs to be run."""
+        case._fingerprint = self._fingerprint(case)
+        record = self._records.get(case._id)
+        if (record is not None and
+                record["fingerprint"] == case._fingerprint and
+                record["outcome"] == "passed"):
+            self._skipped.append(case)
+            return True
+        self._selected.append(case)
+        return False
+
+    def _fingerprint(self, case):
+        digest = hashlib.sha1()
+        for group in case._group._setup_ancestry:
+            digest.update(repr(group._args).encode("utf-8"))
+            for fixture in group._setups + group._teardowns:
+                self._update(digest, fixture._func)
+        for func in case._group._test_setups + case._group._test_teardowns:
+            self._update(digest, func)
+        self._update(digest, case._func)
+        return digest.hexdigest()
+
+    def _update(self, digest, func):
+        code = getattr(func, "__code__", None)
+        if code is None:
+            # not a plain function, so the best that can be done is its repr.
+            digest.update(repr(func).encode("utf-8"))
+            return
+        update_code_digest(digest, code)
+        if self._modules:
+            func_globals = getattr(func, "__globals__", {})
+            for name in code.co_names:
+                obj = func_globals.get(name)
+                if isinstance(obj, ModuleType):
+                    digest.update(self._module_hash(obj).encode("utf-8"))
+
+    def _module_hash(self, module):
+        name = module.__name__
+        if name not in self._module_hashes:
+            digest = hashlib.sha1()
+            path = getattr(module, "__file__", None)
+            if path is not None:
+                if path.endswith((".pyc", ".pyo")):
+                    path = path[:-1]
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+            self._module_hashes[name] = digest.hexdigest()
+        return self._module_hashes[name]
+
+    def _save(self, stream=None):
+        """Record the fingerprints and outcomes of the cases that were run.
+
+        Cases that were skipped keep the records from the run they were last
+        run in.
+        """
+        for case in self._selected:
+            if case._outcome is None:
+                # never ran, so there's nothing new to learn about it.
+                continue
+            self._records[case._id] = {
+                "fingerprint": case._fingerprint,
+                "outcome": case._outcome,
+            }
+        with open(self._cache_path, "w") as f:
+            json.dump({"cases": self._records}, f, indent=1, sort_keys=True)
+        if stream is not None and self._skipped:
+            stream.write(
+                "contextional: skipped {} unchanged passing test(s)\n".format(
+                    len(self._skipped),
+                ),
+            )
@@ -0,0 +1,199 @@
+from __future__ import absolute_import
+
+import io
+import sys
+from xml.sax.saxutils import escape, quoteattr
+
+from contextional.formatting import xml_text
+from contextional.tree import NestedWriter, walk_groups
+
+
+# every element is written on a line of its own, so the file can be repaired
+# by dropping a partial last line, and closing the suites that were left open.
+NEWLINES = {"\n": "&#10;", "\r": "&#13;"}
+
+def _attr(value):
+    return quoteattr(xml_text(value), NEWLINES)
+
+
+def _classname(group):
+    return ".".join(g._description for g in group._setup_ancestry)
+
+
+def _suite_tests(group, child):
+    """How many tests a group's ``testsuite`` holds, when it's opened.
+
+    A session group's suite only holds the root groups that run one after
+    the other, starting with the child it's opened for, as it's closed when
+    another module's root group runs. Which ones those are comes from the
+    tests that are still queued up.
+    """
+    if not group._session_scoped:
+        return sum(len(g._cases) for g in walk_groups([group]))
+    roots = []
+    if child is not None:
+        roots.append(child)
+        for case in group._helper._cases:
+            ancestry = case._group._setup_ancestry
+            if ancestry[0] is not group:
+                break
+            if len(ancestry) > 1 and ancestry[1] not in roots:
+                roots.append(ancestry[1])
+    return len(group._cases) + sum(
+        len(g._cases) for g in walk_groups(roots)
+    )
+
+
+def _problem(tag, error):
+    """A ``failure`` or ``error`` element for a :class:`.FormattedError`."""
+    return u"<{} type={} message={}>{}</{}>".format(
+        tag,
+        _attr(error.type_name),
+        _attr(error.message),
+        escape(xml_text(error.text), NEWLINES),
+        tag,
+    )
+
+
+class JUnitXMLWriter(NestedWriter):
+    """Write the outcome of the run as JUnit XML, as it happens.
+
+    :param path: The path of the XML file to write to.
+    :type path: str
+
+    Each group is a ``testsuite``, nested inside the ``testsuite`` of its
+    parent (a session group's is split wherever another module's tests run
+    in between its modules). Its tests are ``testcase`` elements, and so are
+    its setups and teardowns that have descriptions, or that raised an
+    error, so errors in group fixtures show up along with the tests.
+
+    A group's ``testsuite`` is opened when the group is set up, its tests and
+    fixtures are written as they finish, and it's closed (and the file
+    flushed) once the group is torn down, so nothing is held on to for the
+    rest of the run. If the run is cut short, the file can be made valid
+    again with :func:`repair_junit_xml`.
+    """
+
+    def __init__(self, path):
+        super(JUnitXMLWriter, self).__init__()
+        self._path = path
+        self._file = None
+
+    def _writeln(self, line):
+        if self._file is None:
+            self._file = io.open(self._path, "w", encoding="utf-8")
+            self._file.write(u'<?xml version="1.0" encoding="utf-8"?>\n')
+            self._file.write(u"<testsuites>\n")
+        self._file.write(u"  " * (len(self._open_groups) + 1) + line + u"\n")
+
+    def _write_testcase(self, classname, name, duration, problem=None):
+        line = u"<testcase classname={} name={} time={}".format(
+            _attr(classname),
+            _attr(name),
+            _attr("{:.6f}".format(duration or 0.0)),
+        )
+        if problem is None:
+            self._writeln(line + u"/>")
+        else:
+            self._writeln(line + u">" + problem + u"</testcase>")
+
+    def _write_case(self, case):
+        problem = None
+        if case._outcome == "failed":
+            problem = _problem("failure", case._error)
+        elif case._outcome == "error":
+            problem = _problem("error", case._error)
+        elif case._outcome == "skipped":
+            problem = u"<skipped message={}/>".format(
+                _attr(str(case._skip_reason)),
+            )
+        self._write_testcase(
+            _classname(case._group),
+            case._description,
+            case._duration,
+            problem,
+        )
+
+    def _open(self, group, child, timestamp):
+        line = u"<testsuite name={} tests={}".format(
+            _attr(group._description),
+            _attr(str(_suite_tests(group, child))),
+        )
+        if group._id is not None:
+            line += u" id={}".format(_attr(group._id))
+        self._writeln(line + u">")
+
+    def _close(self, group, timestamp, exited):
+        self._writeln(u"</testsuite>")
+        if exited:
+            self._file.flush()
+
+    def fixture_end(self, fixture, timestamp):
+        if fixture._description is None and fixture._error is None:
+            return
+        problem = None
+        if fixture._error is not None:
+            problem = _problem("error", fixture._error)
+        self._nest(fixture._group, timestamp)
+        self._write_testcase(
+            _classname(fixture._group),
+            fixture.description,
+            fixture._duration,
+            problem,
+        )
+
+    def case_finish(self, case, timestamp):
+        self._nest(case._group, timestamp)
+        self._write_case(case)
+
+    def __call__(self, stream):
+        if self._file is None:
+            return
+        self._nest(None, None)
+        self._file.write(u"</testsuites>\n")
+        self._file.close()
+
+
+def repair_junit_xml(path):
+    """Make a JUnit XML file that was cut short valid again.
+
+    :param path: The path of the file written by :class:`JUnitXMLWriter`.
+    :type path: str
+    :returns: The number of ``testsuite`` elements that had to be closed.
+    :rtype: int
+
+    A partial last line is dropped, and the ``testsuite`` elements (and the
+    ``testsuites`` element) that were left open are closed, so everything
+    that was written in full is kept.
+    """
+    with io.open(path, "r", encoding="utf-8") as f:
+        lines = f.read().split(u"\n")
+    # the last piece is either empty, or a line that was cut short.
+    lines = lines[:-1]
+    if not lines:
+        lines = [u'<?xml version="1.0" encoding="utf-8"?>', u"<testsuites>"]
+    elif lines[-1] == u"</testsuites>":
+        return 0
+    if len(lines) == 1:
+        lines.append(u"<testsuites>")
+    open_suites = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith(u"<testsuite "):
+            open_suites += 1
+        elif stripped == u"</testsuite>":
+            open_suites -= 1
+    for depth in range(open_suites, 0, -1):
+        lines.append(u"  " * depth + u"</testsuite>")
+    lines.append(u"</testsuites>")
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(u"\n".join(lines) + u"\n")
+    return open_suites
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        closed = repair_junit_xml(path)
+        sys.stdout.write(
+            "{}: closed {} testsuite element(s)\n".format(path, closed),
+        )
@@ -0,0 +1,50 @@
+from __future__ import absolute_import
+
+
+class Listener(object):
+    """Base class for objects that observe tests and fixtures as they run.
+
+    Each method is passed the object the event is about, and the time (from
+    the same clock used to time fixtures and tests) the event happened at.
+    Subclasses only need to override the methods for the events they're
+    interested in. Listeners are added using
+    :meth:`.GroupContextManager.add_listener`.
+    """
+
+    def group_enter(self, group, timestamp):
+        """A :class:`.Group` was added to the level stack."""
+
+    def group_exit(self, group, timestamp):
+        """A :class:`.Group` was removed from the level stack."""
+
+    def fixture_start(self, fixture, timestamp):
+        """A group setup or teardown is about to run."""
+
+    def fixture_end(self, fixture, timestamp):
+        """A group setup or teardown finished (successfully or not)."""
+
+    def test_setup_start(self, case, timestamp):
+        """The test setups for a :class:`.Case` are about to run."""
+
+    def test_setup_end(self, case, timestamp):
+        """The test setups for a :class:`.Case` finished."""
+
+    def case_start(self, case, timestamp):
+        """The test function of a :class:`.Case` is about to run."""
+
+    def case_end(self, case, timestamp):
+        """The test function of a :class:`.Case` finished."""
+
+    def test_teardown_start(self, case, timestamp):
+        """The test teardowns for a :class:`.Case` are about to run."""
+
+    def test_teardown_end(self, case, timestamp):
+        """The test teardowns for a :class:`.Case` finished."""
+
+    def case_finish(self, case, timestamp):
+        """The outcome of a :class:`.Case` was reported.
+
+        The outcome is in the case's ``_outcome``, which is ``None`` if the
+        test wasn't run. This happens before any of the test's groups are
+        torn down.
+        """
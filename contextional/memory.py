@@ -0,0 +1,186 @@
+from __future__ import absolute_import
+
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    # only available in Python 3.4+
+    tracemalloc = None
+
+from contextional.listener import Listener
+from contextional.timing import _group_path
+
+
+def format_size(size):
+    """Format a number of bytes so it's easier to read."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return "{:.1f} {}".format(size, unit)
+        size /= 1024.0
+    return "{:.1f} GiB".format(size)
+
+
+def approximate_size(obj, limit=10000):
+    """Estimate the memory held by an object and what it refers to.
+
+    :param obj: The object to measure.
+    :param limit: The most objects to look at, so huge structures don't take
+        forever.
+    :type limit: int
+    :returns: The approximate size in bytes.
+    :rtype: int
+
+    Containers are followed into their items, and other objects into their
+    ``__dict__``. Each object is only counted once.
+    """
+    seen = set()
+    pending = [obj]
+    size = 0
+    while pending and len(seen) < limit:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        try:
+            size += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            pending.append(obj.__dict__)
+    return size
+
+
+class MemoryTracker(Listener):
+    """Find groups that hold on to memory after they've been torn down.
+
+    :param threshold: The number of bytes a group can retain before it's
+        reported.
+    :type threshold: int
+    :param top: The number of allocation sites to show for each group.
+    :type top: int
+
+    A :mod:`tracemalloc` snapshot is taken when each group is set up, and
+    another once it's been torn down. If the memory allocated between the two
+    that's still held on to is more than the threshold, the group is reported,
+    along with the places most of that memory was allocated.
+    """
+
+    def __init__(self, threshold=1024 * 1024, top=5):
+        if tracemalloc is None:
+            raise RuntimeError("memory tracking requires Python 3.4+")
+        self._threshold = threshold
+        self._top = top
+        self._snapshots = {}
+        self._leaks = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def group_enter(self, group, timestamp):
+        self._snapshots[group] = self._take_snapshot()
+
+    def group_exit(self, group, timestamp):
+        before = self._snapshots.pop(group, None)
+        if before is None:
+            return
+        stats = self._take_snapshot().compare_to(before, "lineno")
+        retained = sum(stat.size_diff for stat in stats)
+        if retained > self._threshold:
+            sites = [stat for stat in stats if stat.size_diff > 0]
+            self._leaks.append((retained, group, sites[:self._top]))
+
+    def _report(self, stream):
+        if not self._leaks:
+            return
+        stream.write(
+            "\ncontextional: groups retaining more than {} after "
+            "teardown:\n".format(format_size(self._threshold)),
+        )
+        for retained, group, sites in sorted(
+                self._leaks, key=lambda leak: leak[0], reverse=True):
+            stream.write(
+                "{:>12}  {}\n".format(
+                    format_size(retained),
+                    _group_path(group),
+                ),
+            )
+            for stat in sites:
+                frame = stat.traceback[0]
+                stream.write(
+                    "{:>12}    {}:{} ({} blocks)\n".format(
+                        "+" + format_size(stat.size_diff),
+                        frame.filename,
+                        frame.lineno,
+                        stat.count_diff,
+                    ),
+                )
+
+
+class NamespaceAuditor(Listener):
+    """Find attributes that groups' setups leave in the shared namespace.
+
+    :param remove: Remove the attributes that are left behind once their
+        group has been torn down.
+    :type remove: bool
+
+    The attributes each group's setups add to the namespace are noted, and any
+    that are still there once the group has been torn down are reported, along
+    with roughly how much memory they're holding on to.
+    """
+
+    def __init__(self, remove=False):
+        self._remove = remove
+        self._before = None
+        self._created = {}
+        self._residue = []
+
+    def fixture_start(self, fixture, timestamp):
+        if fixture._fixture_type == "setup":
+            self._before = set(fixture._helper.__dict__)
+
+    def fixture_end(self, fixture, timestamp):
+        if fixture._fixture_type == "setup" and self._before is not None:
+            created = set(fixture._helper.__dict__) - self._before
+            self._created.setdefault(fixture._group, set()).update(created)
+            self._before = None
+
+    def group_exit(self, group, timestamp):
+        created = self._created.pop(group, ())
+        namespace = group._helper.__dict__
+        for attr in sorted(created):
+            if attr not in namespace:
+                continue
+            size = approximate_size(namespace[attr])
+            self._residue.append((size, group, attr))
+            if self._remove:
+                del namespace[attr]
+
+    def _report(self, stream):
+        if not self._residue:
+            return
+        if self._remove:
+            title = "attributes removed after their group was torn down"
+        else:
+            title = "attributes left after their group was torn down"
+        stream.write("\ncontextional: {}:\n".format(title))
+        for size, group, attr in sorted(
+                self._residue, key=lambda residue: residue[0], reverse=True):
+            stream.write(
+                "{:>12}  {}  {}\n".format(
+                    format_size(size),
+                    _group_path(group),
+                    attr,
+                ),
+            )
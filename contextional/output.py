@@ -0,0 +1,128 @@
+from __future__ import absolute_import
+
+import threading
+
+
+class BufferedStream(object):
+    """Hold on to what's written to a stream, and write it in batches.
+
+    :param stream: The stream to write to (e.g. the stream of a
+        :class:`unittest.TextTestResult`).
+    :param size: The number of characters to hold on to before writing them
+        out, once a line is finished.
+    :type size: int
+    :param interval: The most seconds to hold on to anything before writing
+        it out, even if it's only part of a line.
+    :type interval: float
+
+    Everything is written in the order it was written to this, so as long as
+    the result and Contextional both write through this, their output still
+    interleaves the way it would have. Calls to :meth:`flush` (which results
+    make after every test) are treated as a request for the output to show up
+    soon, rather than right away, so they don't undo the batching; the timer
+    makes sure it shows up within ``interval`` seconds.
+    """
+
+    def __init__(self, stream, size=64 * 1024, interval=0.5):
+        self._stream = stream
+        self._size = size
+        self._interval = interval
+        self._pieces = []
+        self._length = 0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def write(self, text):
+        with self._lock:
+            self._pieces.append(text)
+            self._length += len(text)
+            if self._length >= self._size and text.endswith("\n"):
+                self._write_out()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def writeln(self, text=None):
+        if text:
+            self.write(text + "\n")
+        else:
+            self.write("\n")
+
+    def flush(self):
+        # the timer takes care of this.
+        pass
+
+    def _write_out(self):
+        """Write out everything that's been held on to.
+
+        The lock must be held when this is called.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pieces:
+            self._stream.write("".join(self._pieces))
+            self._pieces = []
+            self._length = 0
+        self._stream.flush()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._write_out()
+
+    def close(self, stream=None):
+        """Write out everything that's been held on to.
+
+        This is also run once all the tests are done, in case the result was
+        never told the run stopped.
+        """
+        with self._lock:
+            self._write_out()
+
+    def __getattr__(self, attr):
+        return getattr(self._stream, attr)
+
+
+def _stop_buffering_first(result, method):
+    """Stop buffering the result's stream before calling one of its methods.
+
+    The testing framework writes its summary to its own stream, rather than
+    the result's, after calling these, so everything that was held on to must
+    be written out first.
+    """
+
+    def stop_buffering_first(*args, **kwargs):
+        stream = result.stream
+        if isinstance(stream, BufferedStream):
+            stream.close()
+            result.stream = stream._stream
+        return method(*args, **kwargs)
+
+    return stop_buffering_first
+
+
+def buffer_result_stream(result, size=64 * 1024, interval=0.5):
+    """Have the result write its output through a :class:`BufferedStream`.
+
+    :param result: The result whose stream should be buffered.
+    :type result: :class:`unittest.TestResult`
+    :param size: The number of characters to hold on to before writing them
+        out, once a line is finished.
+    :type size: int
+    :param interval: The most seconds to hold on to anything.
+    :type interval: float
+    :returns: The buffered stream.
+    :rtype: :class:`BufferedStream`
+
+    The result's original stream is put back (once everything's been written
+    out) when its ``stopTestRun`` or ``printErrors`` is called.
+    """
+    stream = BufferedStream(result.stream, size=size, interval=interval)
+    result.stream = stream
+    for name in ("stopTestRun", "printErrors"):
+        method = getattr(result, name, None)
+        if method is not None:
+            setattr(result, name, _stop_buffering_first(result, method))
+    return stream
@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import cProfile
+import os
+import re
+
+from contextional.listener import Listener
+
+
+class SubtreeProfiler(Listener):
+    """Profile the fixtures and tests of a group and its descendants.
+
+    :param group_path: The stable ID of the group to profile (i.e. the name
+        of its module, and the descriptions of it and its ancestors, joined by
+        ``::``). The module can be left out.
+    :type group_path: str
+    :param directory: The directory to write the ``.pstats`` files to.
+    :type directory: str
+
+    Each group in the subtree gets its own :class:`cProfile.Profile`, which is
+    only enabled while that group's setups, teardowns, test setups, tests, and
+    test teardowns are running, so the overhead of the testing framework and
+    Contextional itself isn't included. Once the group is torn down, its
+    profile is written to a ``.pstats`` file named after the group's ID.
+    """
+
+    def __init__(self, group_path, directory="."):
+        self._group_path = group_path
+        self._directory = directory
+        self._profiles = {}
+
+    def _in_subtree(self, group):
+        if group._id is None:
+            return False
+        # the ID without the module, in case the path left it out.
+        path = group._id.split("::", 1)[-1]
+        return any(
+            group_id == self._group_path or
+            group_id.startswith(self._group_path + "::") or
+            group_id.startswith(self._group_path + "#")
+            for group_id in (group._id, path)
+        )
+
+    def group_enter(self, group, timestamp):
+        if self._in_subtree(group):
+            self._profiles[group] = cProfile.Profile()
+
+    def group_exit(self, group, timestamp):
+        profile = self._profiles.pop(group, None)
+        if profile is not None:
+            file_name = re.sub(r"[^\w.#-]+", "_", group._id) + ".pstats"
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            profile.dump_stats(os.path.join(self._directory, file_name))
+
+    def _enable(self, group):
+        profile = self._profiles.get(group)
+        if profile is not None:
+            profile.enable()
+
+    def _disable(self, group):
+        profile = self._profiles.get(group)
+        if profile is not None:
+            profile.disable()
+
+    def fixture_start(self, fixture, timestamp):
+        self._enable(fixture._group)
+
+    def fixture_end(self, fixture, timestamp):
+        self._disable(fixture._group)
+
+    def test_setup_start(self, case, timestamp):
+        self._enable(case._group)
+
+    def test_setup_end(self, case, timestamp):
+        self._disable(case._group)
+
+    def case_start(self, case, timestamp):
+        self._enable(case._group)
+
+    def case_end(self, case, timestamp):
+        self._disable(case._group)
+
+    def test_teardown_start(self, case, timestamp):
+        self._enable(case._group)
+
+    def test_teardown_end(self, case, timestamp):
+        self._disable(case._group)
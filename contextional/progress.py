@@ -0,0 +1,178 @@
+from __future__ import absolute_import
+
+import json
+import os
+import sys
+
+from contextional.listener import Listener
+from contextional.tree import walk_groups
+
+
+def format_seconds(seconds):
+    """Format a number of seconds as ``H:MM:SS``."""
+    seconds = int(round(seconds))
+    return "{}:{:02}:{:02}".format(
+        seconds // 3600,
+        seconds // 60 % 60,
+        seconds % 60,
+    )
+
+
+class ProgressTracker(Listener):
+    """Show how far along the run is, and roughly how long is left.
+
+    :param groups: The root groups of the run.
+    :type groups: list of :class:`.Group`
+    :param history_path: The path of a file to load the durations of previous
+        runs from, and save the durations of this one to.
+    :type history_path: str
+    :param interval: The fewest seconds between progress lines.
+    :type interval: float
+    :param stream: The stream to write the progress lines to as tests finish.
+        If ``None``, it's up to the caller to write them (see
+        :meth:`_due_line`).
+    :param result_stream: If there's no ``stream``, write them to the stream
+        of the result each test was reported to (i.e. the runner's) instead.
+    :type result_stream: bool
+
+    Only the tests that have been queued up to run are counted. The time left
+    is estimated using how long each remaining test and group fixture took
+    the last time they were run. Tests that haven't been run
+    before are assumed to take as long as the tests of this run have on
+    average (including their group fixtures).
+    """
+
+    def __init__(self, groups, history_path=None, interval=1.0, stream=None,
+                 result_stream=False):
+        self._groups = groups
+        self._history_path = history_path
+        self._interval = interval
+        self._stream = stream
+        self._result_stream = result_stream
+        self._history = {"cases": {}, "groups": {}}
+        if history_path is not None and os.path.exists(history_path):
+            with open(history_path, "r") as f:
+                self._history.update(json.load(f))
+        self._total = None
+        self._done = set()
+        self._known_left = 0.0
+        self._unknown_left = 0
+        self._start_time = None
+        self._last_time = None
+        self._last_write = None
+
+    def _start(self, timestamp):
+        self._start_time = timestamp
+        self._last_write = timestamp
+        self._total = 0
+        case_history = self._history["cases"]
+        group_history = self._history["groups"]
+        for group in walk_groups(self._groups):
+            self._known_left += group_history.get(group._id, 0.0)
+            for case in group._cases:
+                if not case._queued:
+                    continue
+                self._total += 1
+                if case._id in case_history:
+                    self._known_left += case_history[case._id]
+                else:
+                    self._unknown_left += 1
+
+    def _finish_case(self, case):
+        if case in self._done or not case._queued:
+            return
+        self._done.add(case)
+        if case._id in self._history["cases"]:
+            self._known_left -= self._history["cases"][case._id]
+        else:
+            self._unknown_left -= 1
+
+    def group_enter(self, group, timestamp):
+        if self._start_time is None:
+            self._start(timestamp)
+        self._last_time = timestamp
+
+    def group_exit(self, group, timestamp):
+        self._known_left -= self._history["groups"].get(group._id, 0.0)
+        # tests that never got to run (e.g. because of a cascading failure)
+        # are done once their group is.
+        for case in group._cases:
+            self._finish_case(case)
+        self._last_time = timestamp
+
+    def case_finish(self, case, timestamp):
+        self._finish_case(case)
+        self._last_time = timestamp
+        stream = self._stream
+        if stream is None and self._result_stream:
+            # e.g. a buffered stream (see :func:`.buffer_result_stream`), so
+            # the lines come out in order with the tests'.
+            stream = getattr(case._group._result, "stream", sys.stderr)
+        if stream is not None:
+            self._maybe_write(stream)
+
+    def _time_left(self):
+        elapsed = self._last_time - self._start_time
+        unknown_duration = 0.0
+        if self._unknown_left:
+            if self._done:
+                unknown_duration = elapsed / len(self._done)
+            elif self._known_left and self._total > self._unknown_left:
+                unknown_duration = self._known_left / (
+                    self._total - self._unknown_left
+                )
+            else:
+                return None
+        return max(
+            self._known_left + self._unknown_left * unknown_duration,
+            0.0,
+        )
+
+    def _line(self):
+        """The progress line for the current point in the run."""
+        time_left = self._time_left()
+        return "contextional: {}/{} tests, {} elapsed, {} left".format(
+            len(self._done),
+            self._total,
+            format_seconds(self._last_time - self._start_time),
+            "?" if time_left is None else format_seconds(time_left),
+        )
+
+    def _due_line(self):
+        """The progress line, if it's been long enough since the last one."""
+        if self._start_time is None:
+            return None
+        if self._last_time - self._last_write < self._interval:
+            return None
+        self._last_write = self._last_time
+        return self._line()
+
+    def _maybe_write(self, stream):
+        """Write the progress line if it's been long enough since the last.
+
+        :param stream: The stream to write to. It should be at the start of a
+            line.
+        """
+        line = self._due_line()
+        if line is not None:
+            stream.write(line + "\n")
+
+    def _save(self, stream):
+        """Record how long each test and group's fixtures took this run.
+
+        Tests and groups that weren't run keep the durations from the run
+        they were last run in.
+        """
+        if self._history_path is None:
+            return
+        for group in walk_groups(self._groups):
+            if group._id is None:
+                continue
+            duration = group._setup_duration + group._teardown_duration
+            if duration:
+                self._history["groups"][group._id] = duration
+            for case in group._cases:
+                if case._test_started:
+                    self._history["cases"][case._id] = case._duration
+        with open(self._history_path, "w") as f:
+            json.dump(self._history, f, indent=1, sort_keys=True)
@@ -1,17 +1,24 @@
 from __future__ import absolute_import
 
+import os
 from time import time
 
+from contextional.accounting import CONTEXTIONAL, OUTPUT
 from contextional.contextional import (
+    GroupContextManager,
     GroupTestCase,
     get_next_test_from_helper,
     NullGroup,
     Group,
     Fixture,
     Case,
+    BenchmarkCase,
     CascadingFailureError,
     LOGGER,
 )
+from contextional.benchmark import format_stats
+from contextional.progress import ProgressTracker
+from contextional.tracebacks import DuplicateTraceback
 
 import pytest
 from _pytest.terminal import TerminalReporter
@@ -20,13 +27,416 @@ from _pytest.runner import TestReport, skip
 from _pytest._code.code import ExceptionInfo, ReprEntry
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("contextional")
+    group.addoption(
+        "--contextional-incremental",
+        action="store_true",
+        default=False,
+        help=(
+            "only run contextional tests that changed or didn't pass the "
+            "last time they were run."
+        ),
+    )
+    group.addoption(
+        "--contextional-incremental-modules",
+        action="store_true",
+        default=False,
+        help=(
+            "also consider the source of the modules used by tests and "
+            "fixtures when deciding if they changed."
+        ),
+    )
+    group.addoption(
+        "--contextional-cache",
+        action="store",
+        default=".contextional_cache",
+        metavar="PATH",
+        help="file used to keep track of previous contextional test runs.",
+    )
+    group.addoption(
+        "--contextional-timing",
+        action="store_true",
+        default=False,
+        help="show the time spent in each contextional group and test.",
+    )
+    group.addoption(
+        "--contextional-timing-json",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="write the time spent in each contextional group to a file.",
+    )
+    group.addoption(
+        "--contextional-durations",
+        action="store",
+        type=int,
+        default=None,
+        metavar="N",
+        help="show N slowest contextional group fixtures (N=0 for all).",
+    )
+    group.addoption(
+        "--contextional-amortization",
+        action="store",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "show the fixture cost per test of the N most expensive "
+            "contextional groups (N=0 for all), and where restructuring the "
+            "groups would save time."
+        ),
+    )
+    group.addoption(
+        "--contextional-profile",
+        action="store",
+        default=None,
+        metavar="GROUP_PATH",
+        help=(
+            "profile the contextional group with this path (e.g. "
+            "'Main Group::Child Group') and its descendants."
+        ),
+    )
+    group.addoption(
+        "--contextional-profile-dir",
+        action="store",
+        default=".",
+        metavar="DIR",
+        help="directory to write contextional .pstats files to.",
+    )
+    group.addoption(
+        "--contextional-memtrack",
+        action="store_true",
+        default=False,
+        help=(
+            "report contextional groups that hold on to memory after "
+            "they're torn down."
+        ),
+    )
+    group.addoption(
+        "--contextional-memtrack-threshold",
+        action="store",
+        type=int,
+        default=1024 * 1024,
+        metavar="BYTES",
+        help=(
+            "bytes a contextional group can hold on to before it's reported."
+        ),
+    )
+    group.addoption(
+        "--contextional-audit-namespace",
+        action="store_true",
+        default=False,
+        help=(
+            "report attributes contextional groups' setups leave in the "
+            "namespace after they're torn down."
+        ),
+    )
+    group.addoption(
+        "--contextional-remove-residue",
+        action="store_true",
+        default=False,
+        help=(
+            "remove attributes contextional groups' setups leave in the "
+            "namespace after they're torn down."
+        ),
+    )
+    group.addoption(
+        "--contextional-trace",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "write a trace of the contextional groups and tests to PATH, "
+            "which can be opened in chrome://tracing or Perfetto."
+        ),
+    )
+    group.addoption(
+        "--contextional-junitxml",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "write the outcome of the contextional groups and tests to PATH "
+            "as nested JUnit XML."
+        ),
+    )
+    group.addoption(
+        "--contextional-events",
+        action="store",
+        default=None,
+        metavar="PATH_OR_FD",
+        help=(
+            "write each contextional group, fixture, and test event to "
+            "PATH_OR_FD (a path, or the number of an open file descriptor) "
+            "as a line of JSON."
+        ),
+    )
+    group.addoption(
+        "--contextional-benchmark-json",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="write the results of the contextional benchmarks to PATH.",
+    )
+    group.addoption(
+        "--contextional-benchmark-save",
+        action="store",
+        default=None,
+        metavar="NAME",
+        help="save the contextional benchmark results as baseline NAME.",
+    )
+    group.addoption(
+        "--contextional-benchmark-compare",
+        action="store",
+        default=None,
+        metavar="NAME",
+        help=(
+            "compare the contextional benchmarks against baseline NAME, and "
+            "fail those that regressed."
+        ),
+    )
+    group.addoption(
+        "--contextional-benchmark-threshold",
+        action="store",
+        type=float,
+        default=0.1,
+        metavar="FRACTION",
+        help=(
+            "how much slower a contextional benchmark's median can get before "
+            "it fails (0.1 = 10%%)."
+        ),
+    )
+    group.addoption(
+        "--contextional-benchmark-dir",
+        action="store",
+        default=".contextional_benchmarks",
+        metavar="DIR",
+        help="directory to keep contextional benchmark baselines in.",
+    )
+    group.addoption(
+        "--contextional-progress",
+        action="store_true",
+        default=False,
+        help="show how far along the run is, and roughly how long is left.",
+    )
+    group.addoption(
+        "--contextional-progress-history",
+        action="store",
+        default=".contextional_durations",
+        metavar="PATH",
+        help=(
+            "file to estimate the time left from, and to record test "
+            "durations in."
+        ),
+    )
+    group.addoption(
+        "--contextional-progress-interval",
+        action="store",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="fewest seconds between contextional progress lines.",
+    )
+    group.addoption(
+        "--contextional-cascade",
+        choices=("fail", "skip"),
+        default=None,
+        help=(
+            "fail (or skip) the tests a cascading failure reaches without "
+            "running them, and show each cascading failure once."
+        ),
+    )
+    group.addoption(
+        "--contextional-dedup",
+        action="store_true",
+        default=False,
+        help=(
+            "only show the first of each distinct traceback of the "
+            "contextional tests, and how often each happened at the end."
+        ),
+    )
+    group.addoption(
+        "--contextional-dedup-json",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="write the distinct tracebacks to PATH as JSON.",
+    )
+    group.addoption(
+        "--contextional-capture",
+        action="store_true",
+        default=False,
+        help=(
+            "capture the output of each contextional group fixture and "
+            "test, and only show it for those that fail."
+        ),
+    )
+    group.addoption(
+        "--contextional-history",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "add the outcomes and durations of the contextional tests and "
+            "groups to the sqlite database at PATH."
+        ),
+    )
+    group.addoption(
+        "--contextional-history-label",
+        action="store",
+        default=None,
+        help="a label for the run in the history (e.g. a commit hash).",
+    )
+    group.addoption(
+        "--contextional-html",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "write the outcome and durations of the contextional groups and "
+            "tests to PATH as a collapsible HTML tree."
+        ),
+    )
+    group.addoption(
+        "--contextional-time-accounting",
+        action="store_true",
+        default=False,
+        help=(
+            "show how much of the run's time was spent by tests and "
+            "fixtures, contextional, pytest, and output."
+        ),
+    )
+
+
+def get_worker_id(config):
+    """The ID of the pytest-xdist worker, if this is one."""
+    if hasattr(config, "workerinput"):
+        return config.workerinput["workerid"]
+    if hasattr(config, "slaveinput"):
+        return config.slaveinput["slaveid"]
+    return None
+
+
+def _worker_path(config, path):
+    """The path a pytest-xdist worker should write to, in place of a path.
+
+    Each worker gets its own file, with its ID put before the extension, so
+    they don't write over each other.
+    """
+    worker_id = get_worker_id(config)
+    if worker_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return "{}-{}{}".format(root, worker_id, ext)
+
+
 @pytest.mark.trylast
 def pytest_configure(config):
+    if config.getoption("contextional_incremental", False):
+        GroupContextManager.enable_incremental(
+            config.getoption("contextional_cache"),
+            modules=config.getoption("contextional_incremental_modules"),
+        )
+    show_timing = config.getoption("contextional_timing", False)
+    timing_path = config.getoption("contextional_timing_json", None)
+    if show_timing or timing_path is not None:
+        GroupContextManager.report_timing(show=show_timing, path=timing_path)
+    durations = config.getoption("contextional_durations", None)
+    if durations is not None:
+        GroupContextManager.report_durations(durations)
+    amortization = config.getoption("contextional_amortization", None)
+    if amortization is not None:
+        GroupContextManager.report_amortization(amortization)
+    profile_path = config.getoption("contextional_profile", None)
+    if profile_path is not None:
+        GroupContextManager.profile_group(
+            profile_path,
+            directory=config.getoption("contextional_profile_dir"),
+        )
+    if config.getoption("contextional_memtrack", False):
+        GroupContextManager.track_memory(
+            threshold=config.getoption("contextional_memtrack_threshold"),
+        )
+    audit_namespace = config.getoption("contextional_audit_namespace", False)
+    remove_residue = config.getoption("contextional_remove_residue", False)
+    if audit_namespace or remove_residue:
+        GroupContextManager.audit_namespace(remove=remove_residue)
+    trace_path = config.getoption("contextional_trace", None)
+    if trace_path is not None:
+        # each worker gets its own file and track.
+        GroupContextManager.write_trace(
+            _worker_path(config, trace_path),
+            process_name=get_worker_id(config),
+        )
+    junit_path = config.getoption("contextional_junitxml", None)
+    if junit_path is not None:
+        GroupContextManager.write_junit_xml(_worker_path(config, junit_path))
+    events_target = config.getoption("contextional_events", None)
+    if events_target is not None:
+        if events_target.isdigit():
+            events_target = int(events_target)
+        else:
+            events_target = _worker_path(config, events_target)
+        GroupContextManager.write_events(events_target)
+    benchmark_path = config.getoption("contextional_benchmark_json", None)
+    if benchmark_path is not None:
+        GroupContextManager.save_benchmarks(benchmark_path)
+    baseline_directory = config.getoption("contextional_benchmark_dir", None)
+    baseline_name = config.getoption("contextional_benchmark_save", None)
+    if baseline_name is not None:
+        GroupContextManager.save_benchmark_baseline(
+            baseline_name,
+            directory=baseline_directory,
+        )
+    baseline_name = config.getoption("contextional_benchmark_compare", None)
+    if baseline_name is not None:
+        try:
+            GroupContextManager.compare_benchmarks(
+                baseline_name,
+                directory=baseline_directory,
+                threshold=config.getoption("contextional_benchmark_threshold"),
+            )
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    cascade = config.getoption("contextional_cascade", None)
+    if cascade is not None:
+        GroupContextManager.aggregate_cascading_failures(
+            skip=cascade == "skip",
+        )
+    dedup_path = config.getoption("contextional_dedup_json", None)
+    if config.getoption("contextional_dedup", False) or dedup_path:
+        if dedup_path is not None:
+            dedup_path = _worker_path(config, dedup_path)
+        GroupContextManager.deduplicate_tracebacks(path=dedup_path)
+    if config.getoption("contextional_capture", False):
+        GroupContextManager.capture_output()
+    history_path = config.getoption("contextional_history", None)
+    if history_path is not None:
+        GroupContextManager.record_history(
+            _worker_path(config, history_path),
+            label=config.getoption("contextional_history_label"),
+        )
+    html_path = config.getoption("contextional_html", None)
+    if html_path is not None:
+        GroupContextManager.write_html_report(_worker_path(config, html_path))
+    if config.getoption("contextional_time_accounting", False):
+        GroupContextManager.account_time()
+    progress = None
+    if config.getoption("contextional_progress", False):
+        progress = ProgressTracker(
+            GroupTestCase._helper._root_groups,
+            history_path=config.getoption("contextional_progress_history"),
+            interval=config.getoption("contextional_progress_interval"),
+        )
+        GroupContextManager.add_listener(progress)
+        GroupTestCase._helper._finish_callbacks.append(progress._save)
     if hasattr(config, "slaveinput"):
         return
     # Get the standard terminal reporter plugin...
     standard_reporter = config.pluginmanager.getplugin("terminalreporter")
     contextional_reporter = ContextionalTerminalReporter(standard_reporter)
+    contextional_reporter._progress = progress
 
     # ...and replace it with our own instafailing reporter.
     config.pluginmanager.unregister(standard_reporter)
@@ -34,22 +444,43 @@ def pytest_configure(config):
 
 
 def pytest_runtest_protocol(item, nextitem):
-    if item.obj == GroupTestCase.runTest:
+    helper = GroupTestCase._helper
+    is_group_test = item.obj == GroupTestCase.runTest
+    if is_group_test:
         # the current test is a GroupTestCase test
-        case = get_next_test_from_helper()
-        item._nodeid = item.nodeid.split("::")[0] + "::"
-        item._nodeid += case._inline_description
-        item._location = case
+        with helper._accounting(CONTEXTIONAL):
+            case = get_next_test_from_helper()
+            item._nodeid = item.nodeid.split("::")[0] + "::"
+            item._nodeid += case._inline_description
+            item._location = case
     item.ihook.pytest_runtest_logstart(
         nodeid=item.nodeid,
         location=item.location,
     )
     runner.runtestprotocol(item, nextitem=nextitem)
-    if item.obj == GroupTestCase.runTest:
-        handle_teardowns(item)
+    if is_group_test:
+        with helper._accounting(CONTEXTIONAL):
+            handle_teardowns(item)
     return True
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_logstart(nodeid, location):
+    # the reporter writes the test's line (and sets up its groups).
+    with GroupTestCase._helper._accounting(OUTPUT):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_logreport(report):
+    with GroupTestCase._helper._accounting(OUTPUT):
+        yield
+
+
+def pytest_terminal_summary(terminalreporter):
+    GroupTestCase._helper._finish_run(terminalreporter._tw)
+
+
 class FakeItem(object):
 
     _case = None
@@ -81,6 +512,49 @@ def pytest_collection_modifyitems(session, config, items):
             if config.option.collectonly:
                 item.cls._dry_run = True
                 items[items.index(item)] = FakeItem(item)
+                # set up and tear down the test's groups without running
+                # anything, so listeners hear about them like they do in
+                # nose's dry run.
+                test = item.cls("runTest")
+                test._dry_run_setup()
+                test._dry_run_teardown()
+
+
+def make_group_error_report(fspath, group, when, duration):
+    """Make a report for the error that just occurred in a group's fixture.
+
+    This must be called while the error is being handled, so the exception
+    info is still available.
+    """
+    excinfo = ExceptionInfo()
+    nodeid = fspath + "::" + group._inline_description
+    location = group._last_location
+    keywords = {}
+    outcome = "failed"
+    longrepr = excinfo.getrepr()
+    sections = []
+    context_lines = [
+        "Context:",
+        "",
+    ]
+    context_lines += str(location).split("\n")
+    context_lines[-1] = ">" + context_lines[-1][1:]
+    entry = ReprEntry(context_lines, None, None, None, "long")
+    if hasattr(longrepr, "chain"):
+        reprtraceback = longrepr.chain[0][0]
+    else:
+        reprtraceback = longrepr.reprtraceback
+    reprtraceback.reprentries.insert(0, entry)
+    return TestReport(
+        nodeid,
+        location,
+        keywords,
+        outcome,
+        longrepr,
+        when,
+        sections,
+        duration,
+    )
 
 
 def handle_teardowns(item):
@@ -90,63 +564,63 @@ def handle_teardowns(item):
     teardown_groups = case._teardown_groups
     for group in teardown_groups:
         if group in case._helper._level_stack:
+            # the test's result is done with, so errors are raised to be
+            # reported here instead.
+            group._result = None
+            group._write_to_result = False
             start_time = time()
             try:
                 group._teardown_group()
             except:
-                # handle error during group setup
-                excinfo = ExceptionInfo()
-                stop_time = time()
-                nodeid = item.nodeid.split("::")[0] + "::"
-                nodeid += group._inline_description
-                location = group._last_location
-                keywords = {}
-                outcome = "failed"
-                longrepr = excinfo.getrepr()
-                when = "teardown"
-                sections = []
-                duration = stop_time - start_time
-                context_lines = [
-                    "Context:",
-                    "",
-                ]
-                context_lines += str(location).split("\n")
-                context_lines[-1] = ">" + context_lines[-1][1:]
-                entry = ReprEntry(
-                    context_lines,
-                    None,
-                    None,
-                    None,
-                    "long",
-                )
-                if hasattr(longrepr, "chain"):
-                    reprtraceback = longrepr.chain[0][0]
-                else:
-                    reprtraceback = longrepr.reprtraceback
-                reprtraceback.reprentries.insert(0, entry)
-                report = TestReport(
-                    nodeid,
-                    location,
-                    keywords,
-                    outcome,
-                    longrepr,
-                    when,
-                    sections,
-                    duration,
+                # handle error during group teardown
+                report = make_group_error_report(
+                    item.nodeid.split("::")[0],
+                    group,
+                    "teardown",
+                    time() - start_time,
                 )
                 item.ihook.pytest_runtest_logreport(report=report)
 
 
+def pytest_sessionfinish(session):
+    """Teardown the session groups now that all the tests are done."""
+    __tracebackhide__ = True
+    level_stack = GroupTestCase._helper._level_stack
+    for group in level_stack[::-1]:
+        group._result = None
+        group._write_to_result = False
+        start_time = time()
+        try:
+            group._teardown_group()
+        except:
+            report = make_group_error_report(
+                "",
+                group,
+                "teardown",
+                time() - start_time,
+            )
+            session.config.hook.pytest_runtest_logreport(report=report)
+
+
 class ContextionalTerminalReporter(TerminalReporter):
 
+    _progress = None
+
     def __init__(self, reporter):
         TerminalReporter.__init__(self, reporter.config)
         self._tw = reporter._tw
-        self._sessionstarttime = reporter._sessionstarttime
+        # if this plugin was loaded before the session started (e.g. with
+        # ``-p``), the session start time will be set on this reporter later.
+        if hasattr(reporter, "_sessionstarttime"):
+            self._sessionstarttime = reporter._sessionstarttime
+        # reports by category, nodeid, and phase, so the summaries don't have
+        # to search through all of them for each failure.
+        self._reports = {}
 
     def pytest_runtest_logstart(self, nodeid, location):
         if isinstance(location, Case):
-            self.setup_contextional_groups(nodeid, location)
+            with location._helper._accounting(CONTEXTIONAL):
+                self.setup_contextional_groups(nodeid, location)
         if self.showlongtestinfo:
             if isinstance(location, Case):
                 line = location._inline_description + " "
@@ -161,7 +635,10 @@ class ContextionalTerminalReporter(TerminalReporter):
     def setup_contextional_groups(self, nodeid, location):
         __tracebackhide__ = True
         for group in location._group._setup_ancestry:
-            if group not in group._helper._level_stack:
+            if group in group._helper._level_stack:
+                # its description might need to be written again.
+                group._setup_group()
+            else:
                 if self.showlongtestinfo:
                     group._pytest_writer = self
                 start_time = time()
@@ -169,38 +646,11 @@ class ContextionalTerminalReporter(TerminalReporter):
                     group._setup_group()
                 except:
                     # handle error during group setup
-                    excinfo = ExceptionInfo()
-                    stop_time = time()
-                    nodeid = nodeid.split("::")[0] + "::"
-                    nodeid += group._inline_description
-                    location = group._last_location
-                    keywords = {}
-                    outcome = "failed"
-                    longrepr = excinfo.getrepr()
-                    when = "setup"
-                    sections = []
-                    duration = stop_time - start_time
-                    context_lines = [
-                        "Context:",
-                        "",
-                    ]
-                    context_lines += str(location).split("\n")
-                    context_lines[-1] = ">" + context_lines[-1][1:]
-                    entry = ReprEntry(context_lines, None, None, None, "long")
-                    if hasattr(longrepr, "chain"):
-                        reprtraceback = longrepr.chain[0][0]
-                    else:
-                        reprtraceback = longrepr.reprtraceback
-                    reprtraceback.reprentries.insert(0, entry)
-                    report = TestReport(
-                        nodeid,
-                        location,
-                        keywords,
-                        outcome,
-                        longrepr,
-                        when,
-                        sections,
-                        duration,
+                    report = make_group_error_report(
+                        nodeid.split("::")[0],
+                        group,
+                        "setup",
+                        time() - start_time,
                     )
                     self.pytest_runtest_logreport(report)
 
@@ -210,9 +660,14 @@ class ContextionalTerminalReporter(TerminalReporter):
         res = self.config.hook.pytest_report_teststatus(report=rep)
         cat, letter, word = res
         self.stats.setdefault(cat, []).append(rep)
+        self._reports.setdefault(
+            (cat, rep.nodeid, getattr(rep, "when", None)),
+            [],
+        ).append(rep)
         self._tests_ran = True
         if not letter and not word:
             # probably passed setup/teardown
+            self.write_progress(rep)
             return
         if self.verbosity <= 0:
             if not hasattr(rep, "node") and self.showfspath:
@@ -243,6 +698,46 @@ class ContextionalTerminalReporter(TerminalReporter):
                     self._tw.write(word, **markup)
                     self._tw.write(" " + line)
                     self.currentfspath = -2
+        self.write_benchmark_stats(rep)
+        self.write_progress(rep)
+
+    def write_between_tests(self, line):
+        """Write a line of its own after the current test's line."""
+        self.ensure_newline()
+        self._tw.write(line)
+        # the next line will start with a new line, like a test's would.
+        self.currentfspath = -2
+
+    def write_benchmark_stats(self, report):
+        """Show the stats of a benchmark beneath its line."""
+        if self.verbosity <= 0 or report.when != "call":
+            return
+        case = report.location
+        if isinstance(case, BenchmarkCase) and case._stats is not None:
+            self.write_between_tests(
+                "  " * (case._group._level + 2) +
+                format_stats(case._stats),
+            )
+
+    def write_progress(self, report):
+        """Show the progress line between tests, if it's due."""
+        if self._progress is None or report.when != "teardown":
+            return
+        line = self._progress._due_line()
+        if line is not None:
+            self.write_between_tests(line)
+
+    def getindexedreports(self, name, nodeid, when):
+        """Get the reports of a category for one phase of one test.
+
+        This is like ``getreports``, but only looks at the reports of that
+        test and phase.
+        """
+        return [
+            report
+            for report in self._reports.get((name, nodeid, when), ())
+            if not hasattr(report, "_pdbshown")
+        ]
 
     def summary_failures(self):
         if self.config.option.tbstyle != "no":
@@ -262,10 +757,12 @@ class ContextionalTerminalReporter(TerminalReporter):
                     markup = {"red": True, "bold": True}
                     self.write_sep("_", msg, **markup)
                     self._outrep_summary(rep)
-                    for report in self.getreports(""):
-                        if (report.nodeid == rep.nodeid and
-                                report.when == "teardown"):
-                            self.print_teardown_sections(report)
+                    for report in self.getindexedreports(
+                        "",
+                        rep.nodeid,
+                        "teardown",
+                    ):
+                        self.print_teardown_sections(report)
 
     def summary_errors(self):
         if self.config.option.tbstyle != "no":
@@ -273,7 +770,7 @@ class ContextionalTerminalReporter(TerminalReporter):
             if not reports:
                 return
             self.write_sep("=", "ERRORS")
-            for rep in self.stats["error"]:
+            for rep in reports:
                 if isinstance(rep.location, Case):
                     msg = rep.location._group._root_group._description
                 elif isinstance(rep.location, (Group, Fixture)):
@@ -322,10 +819,27 @@ def pytest_runtest_makereport(item, call):
             outcome = "skipped"
             r = excinfo._getreprcrash()
             longrepr = (str(r.path), r.lineno, r.message)
+            if isinstance(item.location, Case):
+                # otherwise, pytest tries to point unittest skips at the
+                # item's location, which is the case itself.
+                item._evalskip = None
         else:
             outcome = "failed"
             if call.when == "call":
-                if isinstance(item.location, Case):
+                if (isinstance(item.location, Case) and
+                        excinfo.errisinstance(CascadingFailureError) and
+                        item.location._helper._cascade_aggregator
+                        is not None):
+                    # the cascading failure is reported once, at the end.
+                    longrepr = "CASCADING FAILURE: {}".format(excinfo.value)
+                elif (isinstance(item.location, Case) and
+                        item.location._duplicate_traceback is not None):
+                    # the traceback has already been reported.
+                    longrepr = "{}: {}".format(
+                        DuplicateTraceback.__name__,
+                        item.location._duplicate_traceback._placeholder()[1],
+                    )
+                elif isinstance(item.location, Case):
                     case = item.location
                     longrepr = item.repr_failure(excinfo)
                     context_lines = [
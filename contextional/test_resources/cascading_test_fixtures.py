@@ -0,0 +1,48 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Cascading Test Fixtures") as CTF:
+
+    with GCM.add_group("Test Setup"):
+
+        @GCM.add_test_setup
+        def setUpTest():
+            raise ValueError("no database")
+
+        @GCM.add_test("first")
+        def test(case):
+            pass
+
+        @GCM.add_test("second")
+        def test(case):
+            pass
+
+    with GCM.add_group("Test Teardown"):
+
+        @GCM.add_test("first")
+        def test(case):
+            pass
+
+        @GCM.add_test("second")
+        def test(case):
+            pass
+
+        @GCM.add_test_teardown
+        def tearDownTest():
+            raise RuntimeError("still connected")
+
+
+CTF.create_tests()
+
+
+expected_stream_output = [
+    "Cascading Test Fixtures",
+    "  Test Setup",
+    "    first ... ERROR",
+    "    second ... FAIL",
+    "  Test Teardown",
+    "    first ... ERROR",
+    "    second ... FAIL",
+]
@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+
+import weakref
+
+from contextional import GCM
+
+
+# weak references to an object in the frame of each test or fixture that
+# fails, so it can be checked that nothing holds on to those frames.
+references = []
+
+
+class Payload(object):
+    pass
+
+
+def make_payload():
+    payload = Payload()
+    references.append(weakref.ref(payload))
+    return payload
+
+
+with GCM("Failure References") as FR:
+
+    @GCM.add_test("fails")
+    def test(case):
+        payload = make_payload()
+        case.fail("not equal to {}".format(payload))
+
+    @GCM.add_test("errors")
+    def test(case):
+        payload = make_payload()
+        raise ValueError("no {}".format(payload))
+
+    with GCM.add_group("Test Setup"):
+
+        @GCM.add_test_setup
+        def setUp():
+            payload = make_payload()
+            raise ValueError("no {}".format(payload))
+
+        @GCM.add_test("test")
+        def test(case):
+            pass
+
+
+FR.create_tests()
@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Lazy Attributes") as LA:
+
+    @GCM.add_setup
+    def setUp():
+        GCM.made = []
+        GCM.torn_down = []
+
+    def tear_down_client(value):
+        GCM.torn_down.append(value)
+
+    @GCM.add_lazy("client", teardown=tear_down_client)
+    def make_client():
+        GCM.made.append("client")
+        return "client"
+
+    def make_unused():
+        GCM.made.append("unused")
+        return "unused"
+
+    GCM.add_lazy("unused", make_unused, teardown=tear_down_client)
+
+    @GCM.add_test("not made until accessed")
+    def test(case):
+        case.assertEqual(
+            GCM.made,
+            [],
+        )
+
+    with GCM.add_group("Child Group"):
+
+        @GCM.add_test("made when accessed in a descendant")
+        def test(case):
+            case.assertEqual(
+                case.client,
+                "client",
+            )
+
+        @GCM.add_test("only made once")
+        def test(case):
+            GCM.client
+            case.assertEqual(
+                GCM.made,
+                ["client"],
+            )
+
+        @GCM.add_test("not torn down while the group is set up")
+        def test(case):
+            case.assertEqual(
+                GCM.torn_down,
+                [],
+            )
+
+    params = (("a",), ("b",))
+    with GCM.add_group("Parameterized Group", params=params):
+
+        @GCM.add_lazy("letter")
+        def make_letter(letter):
+            return letter * 2
+
+        @GCM.add_test("factory is passed the params")
+        def test(case):
+            case.assertIn(
+                GCM.letter,
+                ("aa", "bb"),
+            )
+
+    @GCM.add_teardown
+    def tearDown():
+        # lazy attributes are torn down after the group's teardowns.
+        GCM.torn_down_before_teardowns = list(GCM.torn_down)
+
+
+LA.create_tests()
+
+
+with GCM("Lazy Attributes Part 2") as LA2:
+
+    @GCM.add_test("only accessed attributes were torn down")
+    def test(case):
+        case.assertEqual(
+            GCM.torn_down,
+            ["client"],
+        )
+
+    @GCM.add_test("torn down after the group's teardowns")
+    def test(case):
+        case.assertEqual(
+            GCM.torn_down_before_teardowns,
+            [],
+        )
+
+    @GCM.add_test("no longer available")
+    def test(case):
+        case.assertFalse(hasattr(GCM, "client"))
+
+
+LA2.create_tests()
+
+
+expected_stream_output = [
+    "Lazy Attributes",
+    "  not made until accessed ... ok",
+    "  Child Group",
+    "    made when accessed in a descendant ... ok",
+    "    only made once ... ok",
+    "    not torn down while the group is set up ... ok",
+    "  Parameterized Group ('a',)",
+    "    factory is passed the params ... ok",
+    "  Parameterized Group ('b',)",
+    "    factory is passed the params ... ok",
+    "Lazy Attributes Part 2",
+    "  only accessed attributes were torn down ... ok",
+    "  torn down after the group's teardowns ... ok",
+    "  no longer available ... ok",
+]
@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Listened Group") as LG:
+
+    @GCM.add_setup
+    def setUp():
+        pass
+
+    @GCM.add_test_setup
+    def testSetUp():
+        pass
+
+    @GCM.add_test("test")
+    def test(case):
+        pass
+
+    @GCM.add_test_teardown
+    def testTearDown():
+        pass
+
+    with GCM.add_group("Child Group"):
+
+        @GCM.add_test("child test")
+        def test(case):
+            pass
+
+    @GCM.add_teardown("described teardown")
+    def tearDown():
+        pass
+
+
+LG.create_tests()
+
+
+expected_stream_output = [
+    "Listened Group",
+    "  test ... ok",
+    "  Child Group",
+    "    child test ... ok",
+    "  # described teardown ",
+]
@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Plugin Options") as PO:
+
+    @GCM.add_setup
+    def setUp():
+        PO.value = 1
+
+    @GCM.add_test("passes")
+    def test(case):
+        print("output of a test that passes")
+        case.assertEqual(PO.value, 1)
+
+    @GCM.add_benchmark("adds", rounds=2, warmup=0, round_time=0.001)
+    def test(case):
+        PO.value + 1
+
+    with GCM.add_group("Broken Group"):
+
+        @GCM.add_setup
+        def setUp():
+            raise ValueError("no database")
+
+        @GCM.add_test("first")
+        def test(case):
+            pass
+
+        @GCM.add_test("second")
+        def test(case):
+            pass
+
+    with GCM.add_group("Failing Group"):
+
+        @GCM.add_test("fails")
+        def test(case):
+            print("output of a test that fails")
+            case.fail("not equal")
+
+        @GCM.add_test("fails too")
+        def test(case):
+            case.fail("not equal")
+
+
+PO.create_tests()
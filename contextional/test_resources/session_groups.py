@@ -0,0 +1,80 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM.session_group("Session Group") as SG:
+
+    @GCM.add_setup
+    def setUp():
+        GCM.session_setups = getattr(GCM, "session_setups", 0) + 1
+        GCM.session_teardowns = 0
+
+    @GCM.add_teardown
+    def tearDown():
+        GCM.session_teardowns += 1
+
+
+with GCM("First Module", session_group=SG) as FM:
+
+    @GCM.add_test("session group was set up")
+    def test(case):
+        case.assertEqual(
+            GCM.session_setups,
+            1,
+        )
+
+
+FM.create_tests()
+
+
+with GCM("Module Without Session Group") as MWSG:
+
+    @GCM.add_test("session group is still set up")
+    def test(case):
+        case.assertEqual(
+            GCM.session_teardowns,
+            0,
+        )
+
+
+MWSG.create_tests()
+
+
+with GCM("Included Module", session_group=SG) as IM:
+
+    @GCM.add_test("session group was only set up once")
+    def test(case):
+        case.assertEqual(
+            GCM.session_setups,
+            1,
+        )
+
+
+with GCM("Second Module", session_group=SG) as SM:
+
+    GCM.includes(IM)
+
+    @GCM.add_test("session group was not torn down")
+    def test(case):
+        case.assertEqual(
+            GCM.session_teardowns,
+            0,
+        )
+
+
+SM.create_tests()
+
+
+expected_stream_output = [
+    "Session Group",
+    "  First Module",
+    "    session group was set up ... ok",
+    "Module Without Session Group",
+    "  session group is still set up ... ok",
+    "Session Group",
+    "  Second Module",
+    "    session group was not torn down ... ok",
+    "    Included Module",
+    "      session group was only set up once ... ok",
+]
@@ -0,0 +1,17 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Skipped Tests") as ST:
+
+    @GCM.add_test("skipped")
+    def test(case):
+        case.skipTest("not today")
+
+    @GCM.add_test("not skipped")
+    def test(case):
+        pass
+
+
+ST.create_tests()
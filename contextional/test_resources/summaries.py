@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+
+from contextional import GCM
+
+
+with GCM("Summaries") as S:
+
+    with GCM.add_group("Failing Test"):
+
+        @GCM.add_test("fails")
+        def test(case):
+            case.fail("not equal")
+
+        @GCM.add_test_teardown
+        def tearDown():
+            print("output of the test teardown")
+
+    with GCM.add_group("Setup Error"):
+
+        @GCM.add_setup
+        def setUp():
+            raise ValueError("no database")
+
+        @GCM.add_test("never runs")
+        def test(case):
+            pass
+
+    with GCM.add_group("Teardown Error"):
+
+        @GCM.add_test("passes")
+        def test(case):
+            pass
+
+        @GCM.add_teardown
+        def tearDown():
+            raise RuntimeError("still connected")
+
+    with GCM.add_group("After Teardown Error"):
+
+        @GCM.add_test("passes")
+        def test(case):
+            pass
+
+
+S.create_tests()
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.accounting import (
+    CONTEXTIONAL,
+    NO_ACCOUNTING,
+    OUTPUT,
+    USER,
+    TimeAccountant,
+)
+from contextional.contextional import Case, Group, GroupTestCase, Helper
+from contextional.tests.tools import FakeStream
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimeAccountant(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.group = Group("Root Group")
+        self.case = Case(self.group, None, "test")
+        self.group._cases.append(self.case)
+        self.accountant = TimeAccountant([self.group], self.clock)
+
+    def advance(self, seconds):
+        self.clock.now += seconds
+
+    def test_nested_time_goes_to_the_innermost(self):
+        accountant = self.accountant
+        accountant._enter(CONTEXTIONAL)
+        self.advance(1.0)
+        accountant._enter(USER)
+        self.advance(4.0)
+        accountant._exit()
+        accountant._enter(OUTPUT)
+        self.advance(0.5)
+        accountant._exit()
+        self.advance(1.0)
+        accountant._exit()
+        self.advance(2.0)
+        accountant._enter(CONTEXTIONAL)
+        self.advance(1.0)
+        accountant._exit()
+        self.assertEqual(
+            accountant._totals,
+            {
+                "user": 4.0,
+                "contextional": 3.0,
+                "framework": 2.0,
+                "output": 0.5,
+            },
+        )
+
+    def test_with_blocks(self):
+        accountant = self.accountant
+        with accountant._accounting(CONTEXTIONAL):
+            self.advance(1.0)
+            try:
+                with accountant._accounting(USER):
+                    self.advance(2.0)
+                    raise ValueError()
+            except ValueError:
+                pass
+            self.advance(1.0)
+        self.assertEqual(accountant._stack, [])
+        self.assertEqual(accountant._totals["user"], 2.0)
+        self.assertEqual(accountant._totals["contextional"], 2.0)
+
+    def test_helper_without_accountant(self):
+        helper = Helper()
+        self.assertIs(helper._accounting(USER), NO_ACCOUNTING)
+        helper._accountant = self.accountant
+        with helper._accounting(OUTPUT):
+            self.advance(1.0)
+        self.assertEqual(self.accountant._totals["output"], 1.0)
+
+    def test_report(self):
+        self.case._test_started = True
+        self.accountant._enter(CONTEXTIONAL)
+        self.advance(1.0)
+        self.accountant._enter(USER)
+        self.advance(3.0)
+        self.accountant._exit()
+        self.accountant._exit()
+        stream = FakeStream()
+        self.accountant._report(stream)
+        self.assertEqual(
+            stream.output,
+            "\ncontextional: where the time went (4.000s, 1 test(s)):\n"
+            "  user code        3.000s   75.0% 3000000.0us/test\n"
+            "  contextional     1.000s   25.0% 1000000.0us/test\n"
+            "  framework        0.000s    0.0%      0.0us/test\n"
+            "  output           0.000s    0.0%      0.0us/test\n",
+        )
+
+    def test_nothing_to_report(self):
+        stream = FakeStream()
+        self.accountant._report(stream)
+        self.assertEqual(stream.output, "")
+
+
+class TestTestFixtures(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        group = Group("Root Group")
+        group._test_setups.append(lambda: self.advance(2.0))
+        group._test_teardowns.append(lambda: self.advance(3.0))
+        case = Case(group, None, "test")
+        group._cases.append(case)
+        helper = Helper()
+        helper._accountant = TimeAccountant([group], self.clock)
+        self.accountant = helper._accountant
+        self.test = type(
+            "Test",
+            (GroupTestCase,),
+            {"_helper": helper, "_group": group, "_case": case},
+        )()
+
+    def advance(self, seconds):
+        self.clock.now += seconds
+
+    def test_test_fixtures_are_user_code(self):
+        self.test.setUp()
+        self.test.tearDown()
+        self.assertEqual(self.accountant._stack, [])
+        self.assertEqual(self.accountant._totals["user"], 5.0)
+        self.assertEqual(self.accountant._totals["contextional"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+from __future__ import absolute_import
+
+import json
+import shutil
+import tempfile
+import unittest
+
+from contextional.benchmark import (
+    BenchmarkBaseline,
+    baseline_path,
+    calibrate,
+    compare_times,
+    format_time,
+    mann_whitney_u,
+    percentile,
+    run_benchmark,
+    summarize,
+)
+
+
+class FakeClock(object):
+    """A clock that moves forward a fixed amount each time it's ticked."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        return self.now
+
+    def tick(self):
+        self.now += self.step
+
+
+class TestStats(unittest.TestCase):
+
+    def test_percentile_interpolates(self):
+        self.assertAlmostEqual(percentile([1.0, 2.0, 3.0, 4.0], 0.5), 2.5)
+
+    def test_percentile_of_one_time(self):
+        self.assertEqual(percentile([1.0], 0.99), 1.0)
+
+    def test_summarize(self):
+        stats = summarize([3.0, 1.0, 2.0])
+        self.assertEqual(stats["min"], 1.0)
+        self.assertEqual(stats["max"], 3.0)
+        self.assertEqual(stats["median"], 2.0)
+        self.assertAlmostEqual(stats["stddev"], 1.0)
+        self.assertAlmostEqual(stats["p99"], 2.98)
+
+    def test_format_time(self):
+        self.assertEqual(format_time(1.5), "1.500s")
+        self.assertEqual(format_time(0.0025), "2.500ms")
+        self.assertEqual(format_time(0.0000025), "2.500us")
+        self.assertEqual(format_time(0.0000000025), "2.500ns")
+
+
+class TestRunBenchmark(unittest.TestCase):
+
+    def test_calibrate(self):
+        clock = FakeClock(0.001)
+        self.assertGreaterEqual(
+            calibrate(clock.tick, round_time=0.1, clock=clock),
+            100,
+        )
+
+    def test_run_benchmark(self):
+        clock = FakeClock(0.001)
+        calls = []
+
+        def func():
+            calls.append(None)
+            clock.tick()
+
+        stats = run_benchmark(
+            func,
+            rounds=5,
+            warmup=2,
+            round_time=0.01,
+            clock=clock,
+        )
+        self.assertEqual(stats["rounds"], 5)
+        self.assertAlmostEqual(stats["median"], 0.001)
+        self.assertAlmostEqual(stats["stddev"], 0.0)
+        timed_calls = 7 * stats["iterations"]
+        self.assertGreater(len(calls), timed_calls)
+
+
+class TestCompareTimes(unittest.TestCase):
+
+    def test_mann_whitney_u(self):
+        u, p = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+        self.assertEqual(u, 0)
+        self.assertAlmostEqual(p, 0.0122, places=4)
+
+    def test_ties(self):
+        u, p = mann_whitney_u([1, 1, 1], [1, 1, 1])
+        self.assertEqual(p, 1.0)
+
+    def test_regressed(self):
+        comparison = compare_times([1.0] * 5 + [1.1] * 5, [2.0] * 10)
+        self.assertEqual(comparison["verdict"], "regressed")
+        self.assertAlmostEqual(comparison["change"], 2.0 / 1.05 - 1)
+
+    def test_improved(self):
+        comparison = compare_times([2.0] * 10, [1.0] * 5 + [1.1] * 5)
+        self.assertEqual(comparison["verdict"], "improved")
+
+    def test_small_change_is_unchanged(self):
+        comparison = compare_times(
+            [1.0, 1.01, 1.02, 1.03, 1.04],
+            [1.05, 1.06, 1.07, 1.08, 1.09],
+        )
+        self.assertEqual(comparison["verdict"], "unchanged")
+
+    def test_zero_baseline_median(self):
+        comparison = compare_times([0.0] * 5, [0.0] * 5)
+        self.assertEqual(comparison["change"], 0.0)
+        self.assertEqual(comparison["verdict"], "unchanged")
+        comparison = compare_times([0.0] * 5, [1.0] * 5)
+        self.assertEqual(comparison["change"], float("inf"))
+        self.assertEqual(comparison["verdict"], "regressed")
+
+
+class FakeCase(object):
+
+    def __init__(self, times):
+        self._id = "Root Group::benchmark"
+        self._stats = {"times": times}
+
+
+class TestBenchmarkBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(baseline_path(self.temp_dir, "nightly"), "w") as f:
+            json.dump(
+                {
+                    "benchmarks": [
+                        {
+                            "id": "Root Group::benchmark",
+                            "stats": {"times": [1.0] * 5 + [1.1] * 5},
+                        },
+                    ],
+                },
+                f,
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_baseline(self, fail=True):
+        return BenchmarkBaseline([], "nightly", self.temp_dir, fail=fail)
+
+    def test_regression_fails(self):
+        baseline = self.make_baseline()
+        with self.assertRaises(AssertionError):
+            baseline._compare(FakeCase([2.0] * 10))
+
+    def test_regression_is_only_reported(self):
+        baseline = self.make_baseline(fail=False)
+        case = FakeCase([2.0] * 10)
+        baseline._compare(case)
+        self.assertEqual(baseline._comparisons[case]["verdict"], "regressed")
+
+    def test_missing_baseline(self):
+        with self.assertRaises(ValueError) as cm:
+            BenchmarkBaseline([], "weekly", self.temp_dir)
+        self.assertIn(
+            "no benchmark baseline named 'weekly'",
+            str(cm.exception),
+        )
+
+    def test_new_benchmark_is_not_compared(self):
+        baseline = self.make_baseline()
+        case = FakeCase([2.0] * 10)
+        case._id = "Root Group::new benchmark"
+        baseline._compare(case)
+        self.assertEqual(baseline._comparisons, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
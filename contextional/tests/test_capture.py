@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+
+import logging
+import sys
+import unittest
+
+from contextional.capture import OutputCapture
+from contextional.contextional import Case, Group, SetUpFixture
+from contextional.formatting import FormattedError
+from contextional.tests.tools import FakeStream
+
+
+class TestOutputCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.group = Group("Root Group")
+        self.group._id = "Root Group"
+        self.setup = SetUpFixture(self.group, None)
+        self.group._setups.append(self.setup)
+        self.capture = OutputCapture(max_size=10)
+
+    def run_case(self, description, outcome):
+        case = Case(self.group, None, description)
+        case._id = "Root Group::" + description
+        self.capture.test_setup_start(case, 0.0)
+        sys.stdout.write("output of " + description + "\n")
+        logging.getLogger("contextional.tests").error(description)
+        self.capture.test_teardown_end(case, 0.0)
+        case._outcome = outcome
+        self.capture.case_finish(case, 0.0)
+
+    def test_only_failures_are_kept(self):
+        stdout = sys.stdout
+        self.capture.fixture_start(self.setup, 0.0)
+        sys.stderr.write("setting up\n")
+        self.setup._error = FormattedError((ValueError, ValueError(), None))
+        self.capture.fixture_end(self.setup, 0.0)
+        self.run_case("passes", "passed")
+        self.run_case("fails", "failed")
+        self.assertIs(sys.stdout, stdout)
+        self.assertEqual(len(self.capture._kept), 2)
+
+        stream = FakeStream()
+        self.capture._report(stream)
+        self.assertEqual(
+            stream.output,
+            "\ncontextional: captured output of 2 failure(s):\n"
+            "---- Root Group (setup (1/1)) ----\n"
+            "setting up\n"
+            "---- Root Group::fails ----\n"
+            "output of fails\n"
+            "ERROR contextional.tests: fails\n",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.cascade import CascadingFailureAggregator
+from contextional.contextional import Case, Group, helper
+from contextional.tests.tools import FakeStream, SilentTestRunner
+from contextional.test_resources.cascading_test_fixtures import (
+    expected_stream_output,
+)
+
+
+class TestCascadingFailureAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Group("Root Group")
+        self.root._id = "Root Group"
+        self.child = self.root._add_child("Child Group")
+        self.child._id = "Root Group::Child Group"
+        self.grandchild = self.child._add_child("Grandchild Group")
+        self.grandchild._id = "Root Group::Child Group::Grandchild Group"
+        self.child._cascading_failure_in_progress = True
+        self.child._cascading_failure_cause = (
+            "setup (1/1)",
+            "ValueError: no database",
+        )
+        self.grandchild._cascading_failure_in_progress = True
+
+    def make_case(self, group, description):
+        case = Case(group, None, description)
+        case._id = "{}::{}".format(group._id, description)
+        return case
+
+    def test_cases_are_counted_against_the_group_that_failed(self):
+        aggregator = CascadingFailureAggregator(max_paths=2)
+        for group, description in (
+            (self.child, "a"),
+            (self.grandchild, "b"),
+            (self.grandchild, "c"),
+        ):
+            reason = aggregator._add(self.make_case(group, description))
+            self.assertEqual(
+                reason,
+                "cascading failure from Root Group::Child Group",
+            )
+
+        stream = FakeStream()
+        aggregator._report(stream)
+        self.assertEqual(
+            stream.output,
+            "\ncontextional: 1 cascading failure(s) reached 3 test(s):\n"
+            "  Root Group::Child Group\n"
+            "    setup (1/1): ValueError: no database\n"
+            "    failed 3 test(s):\n"
+            "      Root Group::Child Group::a\n"
+            "      Root Group::Child Group::Grandchild Group::b\n"
+            "      (and 1 more)\n",
+        )
+
+    def test_nothing_is_reported_without_cascading_failures(self):
+        stream = FakeStream()
+        CascadingFailureAggregator(skip=True)._report(stream)
+        self.assertEqual(stream.output, "")
+
+
+class TestCascadingTestFixtures(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aggregator = CascadingFailureAggregator()
+        helper._cascade_aggregator = cls.aggregator
+        try:
+            test_program = unittest.TestProgram(
+                module="contextional.test_resources.cascading_test_fixtures",
+                testRunner=SilentTestRunner,
+                argv=["contextional/tests/test_cascade.py"],
+                exit=False,
+                verbosity=2,
+            )
+        finally:
+            helper._cascade_aggregator = None
+        cls.test_results = test_program.result
+        cls.stream_output = cls.test_results.test_run_output
+
+    def test_stream_output(self):
+        self.assertEqual(
+            self.stream_output,
+            expected_stream_output,
+        )
+
+    def test_failing_test_fixtures_are_reported(self):
+        self.assertEqual(len(self.test_results.errors), 2)
+        self.assertEqual(len(self.test_results.failures), 2)
+        self.assertIn(
+            "\ncontextional: 2 cascading failure(s) reached 2 test(s):\n"
+            "  {0}::Test Setup\n"
+            "    test setup (1/1): ValueError: no database\n"
+            "    failed 1 test(s):\n"
+            "      {0}::Test Setup::second\n"
+            "  {0}::Test Teardown\n"
+            "    test teardown (1/1): RuntimeError: still connected\n"
+            "    failed 1 test(s):\n"
+            "      {0}::Test Teardown::second\n".format(
+                "contextional.test_resources.cascading_test_fixtures::"
+                "Cascading Test Fixtures",
+            ),
+            self.test_results.stream.output,
+        )
+
+    def test_cascading_failures_are_shown_once(self):
+        output = self.test_results.stream.output
+        self.assertEqual(output.count("cascading failure(s) reached"), 1)
+        self.assertEqual(output.count("\nERROR: "), 2)
+        self.assertNotIn("\nFAIL: ", output)
+        self.assertNotIn("CascadingFailureError", output)
+        self.assertIn("FAILED (failures=2, errors=2)", output)
+        stream = FakeStream()
+        self.aggregator._report(stream)
+        self.assertEqual(stream.output, "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.contextional import Context
+
+
+def setup_func(value):
+    pass
+
+
+def case_func(case):
+    pass
+
+
+class TestAddGroup(unittest.TestCase):
+
+    def setUp(self):
+        self.context = Context("Root Group")
+        self.root = self.context._group
+        with self.context.add_group("First Group"):
+            self.context.add_setup(setup_func)
+        self.first_group = self.root._children[0]
+        with self.context.add_group("Child Group", params=((1,), (2,))):
+            self.context.add_setup(setup_func)
+            self.context.add_test("test")(case_func)
+            with self.context.add_group("Grandchild Group"):
+                self.context.add_test("test")(case_func)
+        self.copies = self.root._children[1:]
+
+    def test_parent_and_siblings_are_shared(self):
+        self.assertEqual(len(self.root._children), 3)
+        self.assertIs(self.root._children[0], self.first_group)
+        self.assertIs(self.first_group._setups[0]._group, self.first_group)
+        for copy in self.copies:
+            self.assertIs(copy._parent, self.root)
+
+    def test_copies_are_independent(self):
+        first, second = self.copies
+        self.assertEqual(first._args, (1,))
+        self.assertEqual(second._args, (2,))
+        for copy in self.copies:
+            self.assertIs(copy._setups[0]._group, copy)
+            self.assertIs(copy._setups[0]._func, setup_func)
+            self.assertIs(copy._cases[0]._group, copy)
+            grandchild = copy._children[0]
+            self.assertIs(grandchild._parent, copy)
+            self.assertIs(grandchild._cases[0]._group, grandchild)
+        self.assertIsNot(first._setups, second._setups)
+        self.assertIsNot(first._setups[0], second._setups[0])
+        self.assertIsNot(first._cases[0], second._cases[0])
+        self.assertIsNot(first._children[0], second._children[0])
+
+        first._setups.append(first._setups[0])
+        self.assertEqual(len(second._setups), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
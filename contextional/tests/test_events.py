@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group, SetUpFixture
+from contextional.formatting import FormattedError
+from contextional.events import EventStreamWriter
+
+
+class TestEventStreamWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "events.jsonl")
+        self.group = Group("Root Group")
+        self.group._id = "Root Group"
+        self.setup = SetUpFixture(self.group, None)
+        self.group._setups.append(self.setup)
+        self.case = Case(self.group, None, "test")
+        self.case._id = "Root Group::test"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_events(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_events(self):
+        try:
+            raise KeyError("a")
+        except KeyError:
+            self.setup._error = FormattedError(sys.exc_info())
+        self.setup._duration = 0.5
+        self.case._outcome = "passed"
+        self.case._call_duration = 1.0
+
+        writer = EventStreamWriter(self.path)
+        writer.group_enter(self.group, 1.0)
+        writer.fixture_start(self.setup, 1.0)
+        writer.fixture_end(self.setup, 1.5)
+        writer.test_setup_start(self.case, 2.0)
+        writer.case_finish(self.case, 3.0)
+        writer.group_exit(self.group, 4.0)
+        writer(None)
+
+        events = self.read_events()
+        self.assertEqual(
+            [(e["event"], e["id"], e["time"]) for e in events],
+            [
+                ("group_enter", "Root Group", 1.0),
+                ("fixture_start", "Root Group", 1.0),
+                ("fixture_error", "Root Group", 1.5),
+                ("fixture_end", "Root Group", 1.5),
+                ("case_start", "Root Group::test", 2.0),
+                ("case_end", "Root Group::test", 3.0),
+                ("group_exit", "Root Group", 4.0),
+            ],
+        )
+        self.assertEqual(events[0]["parent"], None)
+        self.assertEqual(events[1]["type"], "setup")
+        self.assertEqual(events[2]["error"], "KeyError: 'a'")
+        self.assertEqual(events[3]["duration"], 0.5)
+        self.assertEqual(events[5]["outcome"], "passed")
+        self.assertEqual(events[5]["duration"], 1.0)
+
+    def test_lines_are_flushed_in_batches(self):
+        writer = EventStreamWriter(self.path, batch_size=3, interval=10.0)
+        writer.group_enter(self.group, 0.0)
+        writer.group_exit(self.group, 1.0)
+        self.assertEqual(self.read_events(), [])
+        writer.group_enter(self.group, 2.0)
+        self.assertEqual(len(self.read_events()), 3)
+        writer.group_exit(self.group, 3.0)
+        writer.group_enter(self.group, 13.0)
+        self.assertEqual(len(self.read_events()), 5)
+        writer.group_exit(self.group, 14.0)
+        writer(None)
+        self.assertEqual(len(self.read_events()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,6 +38,10 @@ class TestFailureResult(unittest.TestCase):
             4,
         )
 
+    def test_tracebacks_start_at_the_test(self):
+        for test, traceback in self.test_results.failures:
+            self.assertNotIn("_call_func", traceback)
+
     def test_stream_output(self):
         self.assertEqual(
             self.stream_output,
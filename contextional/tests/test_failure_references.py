@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+
+import gc
+import unittest
+
+from contextional import GCM, Listener
+from contextional.contextional import helper
+from contextional.tests.tools import SilentTestRunner
+from contextional.test_resources.failure_references import references
+from contextional.tracebacks import TracebackStore
+
+
+class TestFailureReferences(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        listener = Listener()
+        GCM.add_listener(listener)
+        helper._traceback_store = TracebackStore()
+        try:
+            unittest.TestProgram(
+                module="contextional.test_resources.failure_references",
+                testRunner=SilentTestRunner,
+                argv=["contextional/tests/test_failure_references.py"],
+                exit=False,
+                verbosity=2,
+            )
+        finally:
+            helper._traceback_store = None
+            GCM.remove_listener(listener)
+
+    def test_frames_are_let_go_of(self):
+        gc.collect()
+        self.assertEqual(len(references), 3)
+        self.assertEqual([ref() for ref in references], [None] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.contextional import Case, Group, Helper
+from contextional.tests.tools import FakeStream
+
+
+class TestFinishRun(unittest.TestCase):
+
+    def test_failed_callback_doesnt_stop_the_rest(self):
+        finished = []
+
+        def broken_callback(stream):
+            raise ValueError("can't save")
+
+        helper = Helper()
+        helper._finish_callbacks.extend([
+            finished.append,
+            broken_callback,
+            finished.append,
+        ])
+        stream = FakeStream()
+        helper._finish_run(stream)
+        self.assertEqual(finished, [stream, stream])
+        self.assertTrue(
+            stream.output.startswith("contextional: error finishing the run"),
+        )
+        self.assertIn("ValueError: can't save", stream.output)
+
+        helper._finish_run(stream)
+        self.assertEqual(len(finished), 2)
+
+
+class TestMakeId(unittest.TestCase):
+
+    def build(self, helper, module):
+        group = Group("Main Group")
+        child = group._add_child("Child Group")
+        for g in (group, child):
+            g._helper = helper
+            g._cases.append(Case(g, None, "test"))
+        group._build_test_cases({"__name__": module})
+        return group, child
+
+    def test_ids_include_the_module(self):
+        helper = Helper()
+        group, child = self.build(helper, "tests.test_a")
+        other_group, other_child = self.build(helper, "tests.test_b")
+        self.assertEqual(group._id, "tests.test_a::Main Group")
+        self.assertEqual(
+            child._cases[0]._id,
+            "tests.test_a::Main Group::Child Group::test",
+        )
+        self.assertEqual(other_group._id, "tests.test_b::Main Group")
+        self.assertEqual(
+            other_child._cases[0]._id,
+            "tests.test_b::Main Group::Child Group::test",
+        )
+
+    def test_repeated_ids_are_numbered(self):
+        helper = Helper()
+        self.build(helper, "tests.test_a")
+        group, child = self.build(helper, "tests.test_a")
+        self.assertEqual(group._id, "tests.test_a::Main Group#2")
+        self.assertEqual(
+            child._cases[0]._id,
+            "tests.test_a::Main Group#2::Child Group::test",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
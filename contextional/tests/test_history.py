@@ -0,0 +1,80 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group
+from contextional.history import (
+    HistoryRecorder,
+    flaky_tests,
+    growing_tests,
+    slowest_groups,
+)
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "history.sqlite")
+        self.group = Group("Root Group")
+        self.group._id = "Root Group"
+        self.steady = Case(self.group, None, "steady")
+        self.steady._id = "Root Group::steady"
+        self.slowing = Case(self.group, None, "slowing")
+        self.slowing._id = "Root Group::slowing"
+        self.group._cases.extend([self.steady, self.slowing])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def record_run(self, slowing_duration, steady_outcome):
+        recorder = HistoryRecorder(self.path)
+        recorder.group_enter(self.group, 0.0)
+        for case, outcome, duration in (
+            (self.steady, steady_outcome, 1.0),
+            (self.slowing, "passed", slowing_duration),
+        ):
+            case._outcome = outcome
+            case._call_duration = duration
+            recorder.case_finish(case, 0.0)
+        recorder.group_exit(self.group, 0.0)
+        recorder._save(None)
+
+    def test_queries(self):
+        for slowing_duration, steady_outcome in (
+            (1.0, "passed"),
+            (2.0, "failed"),
+            (3.0, "passed"),
+            (4.0, "passed"),
+        ):
+            self.record_run(slowing_duration, steady_outcome)
+
+        connection = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(
+                growing_tests(connection),
+                [("Root Group::slowing", 1.0, 4.0, 1.0)],
+            )
+            self.assertEqual(
+                growing_tests(connection, runs=1),
+                [],
+            )
+            self.assertEqual(
+                flaky_tests(connection),
+                [("Root Group::steady", 3, 1, 2)],
+            )
+            self.assertEqual(flaky_tests(connection, runs=2), [])
+            self.assertEqual(
+                slowest_groups(connection),
+                [("Root Group", 3.5, 1.0)],
+            )
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from contextional.contextional import (
+    Case,
+    Group,
+    SessionGroup,
+    SetUpFixture,
+)
+from contextional.formatting import FormattedError
+from contextional.htmlreport import HTMLReportWriter
+
+
+class TestHTMLReportWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "report.html")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_body(self):
+        with io.open(self.path, encoding="utf-8") as f:
+            lines = f.read().split(u"\n")
+        return lines[lines.index(u"<h1>Contextional Report</h1>") + 1:]
+
+    def test_groups_are_nested(self):
+        root = Group("Root <Group>")
+        child = root._add_child("Child Group")
+        setup = SetUpFixture(child, None)
+        child._setups.append(setup)
+        setup._duration = 0.5
+        try:
+            raise ValueError("no database")
+        except ValueError:
+            setup._error = FormattedError(sys.exc_info())
+        passed = Case(root, None, "passes")
+        root._cases.append(passed)
+        passed._outcome = "passed"
+        passed._call_duration = 1.5
+
+        writer = HTMLReportWriter(self.path)
+        writer.group_enter(root, 0.0)
+        writer.case_finish(passed, 1.0)
+        writer.group_enter(child, 2.0)
+        writer.fixture_end(setup, 3.0)
+        writer.group_exit(child, 4.0)
+        writer.group_exit(root, 5.0)
+        writer(None)
+
+        self.assertEqual(
+            self.read_body(),
+            [
+                u"<details open><summary>Root &lt;Group&gt;</summary>",
+                u'<div class="leaf passed" data-t="1.500000">passes</div>',
+                u"<details><summary>Child Group</summary>",
+                u'<div class="leaf error" data-t="0.500000" '
+                u'title="ValueError: no database">setup (1/1)</div>',
+                u'<i class="end" data-t="0.500000" data-o="error"></i>'
+                u"</details>",
+                u'<i class="end" data-t="2.000000" data-o="error"></i>'
+                u"</details>",
+                u"</body>",
+                u"</html>",
+                u"",
+            ],
+        )
+
+    def test_session_group_is_split_around_other_modules(self):
+        session = SessionGroup("Session Group")
+        first = Group("First Module", parent=session)
+        other = Group("Other Module")
+        second = Group("Second Module", parent=session)
+        session._children.extend([first, second])
+        cases = []
+        for group in (first, other, second):
+            case = Case(group, None, "passes")
+            group._cases.append(case)
+            case._outcome = "passed"
+            case._call_duration = 1.0
+            cases.append(case)
+
+        writer = HTMLReportWriter(self.path)
+        writer.group_enter(session, 0.0)
+        writer.group_enter(first, 0.5)
+        writer.case_finish(cases[0], 1.5)
+        writer.group_exit(first, 1.5)
+        writer.group_enter(other, 2.0)
+        writer.case_finish(cases[1], 3.0)
+        writer.group_exit(other, 3.0)
+        writer.group_enter(second, 4.0)
+        writer.case_finish(cases[2], 5.0)
+        writer.group_exit(second, 5.0)
+        writer.group_exit(session, 6.0)
+        writer(None)
+
+        self.assertEqual(
+            self.read_body(),
+            [
+                u"<details open><summary>Session Group</summary>",
+                u"<details><summary>First Module</summary>",
+                u'<div class="leaf passed" data-t="1.000000">passes</div>',
+                u'<i class="end" data-t="1.000000" data-o="passed"></i>'
+                u"</details>",
+                u'<i class="end" data-t="1.500000" data-o="passed"></i>'
+                u"</details>",
+                u"<details open><summary>Other Module</summary>",
+                u'<div class="leaf passed" data-t="1.000000">passes</div>',
+                u'<i class="end" data-t="1.000000" data-o="passed"></i>'
+                u"</details>",
+                u"<details open><summary>Session Group</summary>",
+                u"<details><summary>Second Module</summary>",
+                u'<div class="leaf passed" data-t="1.000000">passes</div>',
+                u'<i class="end" data-t="1.000000" data-o="passed"></i>'
+                u"</details>",
+                u'<i class="end" data-t="2.000000" data-o="passed"></i>'
+                u"</details>",
+                u"</body>",
+                u"</html>",
+                u"",
+            ],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group, SetUpFixture
+from contextional.incremental import IncrementalSelector
+
+
+def setup_func():
+    pass
+
+
+def case_func(case):
+    pass
+
+
+def changed_case_func(case):
+    case.assertTrue(True)
+
+
+def make_case(func):
+    group = Group("Root Group")
+    group._setups.append(SetUpFixture(group, setup_func))
+    case = Case(group, func, "test")
+    case._id = "Root Group::test"
+    return case
+
+
+class TestIncrementalSelector(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_case(self, func, outcome="passed"):
+        selector = IncrementalSelector(self.cache_path)
+        case = make_case(func)
+        skipped = selector._should_skip(case)
+        if not skipped:
+            case._outcome = outcome
+        selector._save()
+        return skipped
+
+    def test_first_run_is_not_skipped(self):
+        self.assertFalse(self.run_case(case_func))
+
+    def test_unchanged_pass_is_skipped(self):
+        self.run_case(case_func)
+        self.assertTrue(self.run_case(case_func))
+
+    def test_unchanged_failure_is_not_skipped(self):
+        self.run_case(case_func, outcome="failed")
+        self.assertFalse(self.run_case(case_func))
+
+    def test_changed_test_is_not_skipped(self):
+        self.run_case(case_func)
+        self.assertFalse(self.run_case(changed_case_func))
+
+
+if __name__ == '__main__':
+    unittest.main()
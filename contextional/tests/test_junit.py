@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from contextional.contextional import (
+    Case,
+    Group,
+    SessionGroup,
+    SetUpFixture,
+    helper,
+)
+from contextional.formatting import FormattedError
+from contextional.junit import JUnitXMLWriter, repair_junit_xml
+
+
+def make_tree():
+    root = Group("Root Group")
+    root._id = "Root Group"
+    child = root._add_child("Child Group")
+    child._id = "Root Group::Child Group"
+    setup = SetUpFixture(child, None)
+    child._setups.append(setup)
+    passed = Case(root, None, "passes")
+    failed = Case(child, None, "fails")
+    for case in (passed, failed):
+        case._group._cases.append(case)
+        case._test_started = True
+        case._call_duration = 0.5
+    passed._outcome = "passed"
+    failed._outcome = "failed"
+    try:
+        raise AssertionError("1 != 2")
+    except AssertionError:
+        failed._error = FormattedError(sys.exc_info())
+    return root, child, setup, passed, failed
+
+
+class TestJUnitXMLWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "junit.xml")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_groups_are_nested_suites(self):
+        root, child, setup, passed, failed = make_tree()
+        try:
+            raise ValueError("no database")
+        except ValueError:
+            setup._error = FormattedError(sys.exc_info())
+
+        writer = JUnitXMLWriter(self.path)
+        writer.group_enter(root, 0.0)
+        writer.case_finish(passed, 1.0)
+        writer.group_enter(child, 2.0)
+        writer.fixture_end(setup, 3.0)
+        writer.case_finish(failed, 4.0)
+        writer.group_exit(child, 5.0)
+        writer.group_exit(root, 6.0)
+        writer(None)
+
+        suites = ElementTree.parse(self.path).getroot()
+        root_suite = suites.find("testsuite")
+        self.assertEqual(root_suite.get("name"), "Root Group")
+        self.assertEqual(root_suite.get("tests"), "2")
+        self.assertEqual(
+            [(tc.get("classname"), tc.get("name"), tc.get("time"))
+             for tc in root_suite.iter("testcase")],
+            [
+                ("Root Group", "passes", "0.500000"),
+                ("Root Group.Child Group", "setup (1/1)", "0.000000"),
+                ("Root Group.Child Group", "fails", "0.500000"),
+            ],
+        )
+        child_suite = root_suite.find("testsuite")
+        error, failure = [tc[0] for tc in child_suite.iter("testcase")]
+        self.assertEqual(error.tag, "error")
+        self.assertEqual(error.get("message"), "ValueError: no database")
+        self.assertEqual(failure.tag, "failure")
+        self.assertEqual(failure.get("type"), "AssertionError")
+        self.assertIn("raise AssertionError", failure.text)
+
+    def test_repair(self):
+        root, child, setup, passed, failed = make_tree()
+        writer = JUnitXMLWriter(self.path)
+        writer.group_enter(root, 0.0)
+        writer.case_finish(passed, 1.0)
+        writer.group_enter(child, 2.0)
+        writer._file.close()
+        # simulate the run being killed part of the way through a line.
+        with io.open(self.path, "a", encoding="utf-8") as f:
+            f.write(u'    <testcase classname="Root Gr')
+
+        self.assertEqual(repair_junit_xml(self.path), 2)
+        suites = ElementTree.parse(self.path).getroot()
+        self.assertEqual(
+            [tc.get("name") for tc in suites.iter("testcase")],
+            ["passes"],
+        )
+        self.assertEqual(len(list(suites.iter("testsuite"))), 2)
+        self.assertEqual(repair_junit_xml(self.path), 0)
+
+    def test_session_group_suite_is_split_around_other_modules(self):
+        session = SessionGroup("Session Group")
+        first = Group("First Module", parent=session)
+        other = Group("Other Module")
+        second = Group("Second Module", parent=session)
+        session._children.extend([first, second])
+        cases = []
+        for group in (first, other, second):
+            case = Case(group, None, "passes")
+            group._cases.append(case)
+            case._outcome = "passed"
+            cases.append(case)
+        self.addCleanup(setattr, helper, "_cases", helper._cases)
+
+        writer = JUnitXMLWriter(self.path)
+        helper._cases = cases[1:]
+        writer.group_enter(session, 0.0)
+        writer.group_enter(first, 0.0)
+        writer.case_finish(cases[0], 1.0)
+        writer.group_exit(first, 1.0)
+        helper._cases = cases[2:]
+        writer.group_enter(other, 2.0)
+        writer.case_finish(cases[1], 3.0)
+        writer.group_exit(other, 3.0)
+        helper._cases = []
+        writer.group_enter(second, 4.0)
+        writer.case_finish(cases[2], 5.0)
+        writer.group_exit(second, 5.0)
+        writer.group_exit(session, 6.0)
+        writer(None)
+
+        suites = ElementTree.parse(self.path).getroot()
+        self.assertEqual(
+            [
+                (
+                    suite.get("name"),
+                    suite.get("tests"),
+                    [tc.get("classname") for tc in suite.iter("testcase")],
+                )
+                for suite in suites
+            ],
+            [
+                ("Session Group", "1", ["Session Group.First Module"]),
+                ("Other Module", "1", ["Other Module"]),
+                ("Session Group", "1", ["Session Group.Second Module"]),
+            ],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
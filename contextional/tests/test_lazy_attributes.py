@@ -0,0 +1,159 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional import GCM, Listener
+from contextional.contextional import (
+    Group,
+    LazyAttribute,
+    TearDownFixture,
+    helper,
+)
+from contextional.tests.tools import SilentTestRunner
+from contextional.test_resources.lazy_attributes import expected_stream_output
+
+
+class TestLazyAttributesResult(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        test_program = unittest.TestProgram(
+            module="contextional.test_resources.lazy_attributes",
+            testRunner=SilentTestRunner,
+            argv=["contextional/tests/test_lazy_attributes.py"],
+            exit=False,
+            verbosity=2,
+        )
+        cls.test_results = test_program.result
+        cls.stream_output = cls.test_results.test_run_output
+
+    def test_tests_run_count(self):
+        self.assertEqual(
+            self.test_results.testsRun,
+            9,
+        )
+
+    def test_failures_count(self):
+        self.assertEqual(
+            len(self.test_results.failures),
+            0,
+        )
+
+    def test_errors_count(self):
+        self.assertEqual(
+            len(self.test_results.errors),
+            0,
+        )
+
+    def test_stream_output(self):
+        self.assertEqual(
+            self.stream_output,
+            expected_stream_output,
+        )
+
+
+class FixtureListener(Listener):
+
+    def __init__(self):
+        self.events = []
+
+    def fixture_start(self, fixture, timestamp):
+        self.events.append(("fixture_start", fixture.description))
+
+    def fixture_end(self, fixture, timestamp):
+        self.events.append(("fixture_end", fixture.description))
+
+
+class TestLazyAttributeCalls(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = FixtureListener()
+        GCM.add_listener(self.listener)
+        self.addCleanup(GCM.remove_listener, self.listener)
+        self.lazy = LazyAttribute(
+            Group("Root Group"),
+            lambda: "client",
+            "client",
+            teardown=lambda value: None,
+        )
+
+    def test_factory_is_timed_and_reported(self):
+        self.assertEqual(self.lazy._get_value(), "client")
+        self.assertIsNotNone(self.lazy._duration)
+        self.assertEqual(self.lazy._get_value(), "client")
+        self.assertEqual(
+            self.listener.events,
+            [
+                ("fixture_start", "lazy attribute 'client'"),
+                ("fixture_end", "lazy attribute 'client'"),
+            ],
+        )
+
+    def test_teardown_is_timed_and_reported(self):
+        self.lazy._get_value()
+        self.lazy._duration = None
+        self.lazy()
+        self.assertIsNotNone(self.lazy._duration)
+        self.assertEqual(
+            self.listener.events[2:],
+            [
+                ("fixture_start", "teardown of lazy attribute 'client'"),
+                ("fixture_end", "teardown of lazy attribute 'client'"),
+            ],
+        )
+
+
+class TestLazyAttributeTeardowns(unittest.TestCase):
+
+    def setUp(self):
+        self.group = Group("Root Group")
+        self.group._write_to_result = False
+        self.group._result = unittest.TestResult()
+        self.torn_down = []
+        for name in ("first", "second"):
+            lazy = LazyAttribute(
+                self.group,
+                lambda name=name: name,
+                name,
+                teardown=self.tear_down,
+            )
+            self.group._lazy_attributes.append(lazy)
+            lazy._get_value()
+        helper._level_stack.append(self.group)
+        self.addCleanup(self.leave_level_stack)
+
+    def leave_level_stack(self):
+        if self.group in helper._level_stack:
+            helper._level_stack.remove(self.group)
+
+    def tear_down(self, value):
+        self.torn_down.append(value)
+        if value == "first":
+            raise RuntimeError("still connected")
+
+    def test_torn_down_when_a_group_teardown_fails(self):
+        def fail():
+            raise ValueError("no database")
+
+        self.group._teardowns.append(TearDownFixture(self.group, fail))
+        self.group._teardown_group()
+        self.assertEqual(self.torn_down, ["first", "second"])
+        self.assertEqual(
+            [
+                text.splitlines()[-1]
+                for test, text in self.group._result.errors
+            ],
+            [
+                "ValueError: no database",
+                "RuntimeError: still connected",
+            ],
+        )
+        self.assertNotIn(self.group, helper._level_stack)
+
+    def test_position_is_among_the_lazy_attributes(self):
+        second = self.group._lazy_attributes[1]
+        self.assertEqual(second._position_str, "(2/2)")
+
+
+if __name__ == '__main__':
+    unittest.main()
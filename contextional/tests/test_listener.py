@@ -0,0 +1,178 @@
+from __future__ import absolute_import
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextional import GCM, Listener
+from contextional.tests.tools import (
+    nose,
+    pytest,
+    run_with_events,
+    SilentTestRunner,
+)
+from contextional.test_resources.listener_events import expected_stream_output
+
+
+LISTENED_GROUP = "contextional.test_resources.listener_events::Listened Group"
+
+
+class RecordingListener(Listener):
+
+    def __init__(self):
+        self.events = []
+
+    def _record(self, event, obj):
+        self.events.append((event, obj._description))
+
+    def group_enter(self, group, timestamp):
+        self._record("group_enter", group)
+
+    def group_exit(self, group, timestamp):
+        self._record("group_exit", group)
+
+    def fixture_start(self, fixture, timestamp):
+        self.events.append(("fixture_start", fixture.description))
+
+    def fixture_end(self, fixture, timestamp):
+        self.events.append(("fixture_end", fixture.description))
+
+    def test_setup_start(self, case, timestamp):
+        self._record("test_setup_start", case)
+
+    def test_setup_end(self, case, timestamp):
+        self._record("test_setup_end", case)
+
+    def case_start(self, case, timestamp):
+        self._record("case_start", case)
+
+    def case_end(self, case, timestamp):
+        self._record("case_end", case)
+
+    def test_teardown_start(self, case, timestamp):
+        self._record("test_teardown_start", case)
+
+    def test_teardown_end(self, case, timestamp):
+        self._record("test_teardown_end", case)
+
+
+class TestListenerEvents(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.listener = RecordingListener()
+        GCM.add_listener(cls.listener)
+        try:
+            test_program = unittest.TestProgram(
+                module="contextional.test_resources.listener_events",
+                testRunner=SilentTestRunner,
+                argv=["contextional/tests/test_listener.py"],
+                exit=False,
+                verbosity=2,
+            )
+        finally:
+            GCM.remove_listener(cls.listener)
+        cls.stream_output = test_program.result.test_run_output
+
+    def test_events(self):
+        self.assertEqual(
+            self.listener.events,
+            [
+                ("group_enter", "Listened Group"),
+                ("fixture_start", "setup (1/1)"),
+                ("fixture_end", "setup (1/1)"),
+                ("test_setup_start", "test"),
+                ("test_setup_end", "test"),
+                ("case_start", "test"),
+                ("case_end", "test"),
+                ("test_teardown_start", "test"),
+                ("test_teardown_end", "test"),
+                ("group_enter", "Child Group"),
+                ("test_setup_start", "child test"),
+                ("test_setup_end", "child test"),
+                ("case_start", "child test"),
+                ("case_end", "child test"),
+                ("test_teardown_start", "child test"),
+                ("test_teardown_end", "child test"),
+                ("group_exit", "Child Group"),
+                ("fixture_start", "described teardown"),
+                ("fixture_end", "described teardown"),
+                ("group_exit", "Listened Group"),
+            ],
+        )
+
+    def test_stream_output(self):
+        self.assertEqual(
+            self.stream_output,
+            expected_stream_output,
+        )
+
+    def test_removed_listener_is_not_called(self):
+        self.assertNotIn(self.listener, GCM._listeners)
+
+
+class TestRunnersAgree(unittest.TestCase):
+    """unittest, pytest, and nose should all produce the same events."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def record(self, runner, *args):
+        path = os.path.join(self.temp_dir, runner + ".jsonl")
+        code, output = run_with_events(
+            runner,
+            "listener_events",
+            path,
+            *args
+        )
+        self.assertEqual(code, 0, output)
+        events = []
+        with io.open(path, encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                # these are different every run.
+                del event["time"]
+                event.pop("duration", None)
+                events.append(event)
+        return events
+
+    @unittest.skipIf(pytest is None, "pytest is not installed")
+    def test_pytest(self):
+        self.assertEqual(self.record("pytest"), self.record("unittest"))
+
+    @unittest.skipIf(nose is None, "nose is not installed")
+    def test_nose(self):
+        self.assertEqual(self.record("nose"), self.record("unittest"))
+
+    @unittest.skipIf(pytest is None, "pytest is not installed")
+    def test_pytest_dry_run(self):
+        events = self.record("pytest", "--collect-only")
+        self.assertEqual(
+            [(event["event"], event["id"]) for event in events],
+            [
+                ("group_enter", LISTENED_GROUP),
+                ("group_enter", LISTENED_GROUP + "::Child Group"),
+                ("group_exit", LISTENED_GROUP + "::Child Group"),
+                ("group_exit", LISTENED_GROUP),
+            ],
+        )
+
+    @unittest.skipIf(
+        pytest is None or nose is None,
+        "pytest or nose is not installed",
+    )
+    def test_nose_dry_run(self):
+        self.assertEqual(
+            self.record("nose", "--collect-only"),
+            self.record("pytest", "--collect-only"),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.contextional import Group, SetUpFixture, helper
+from contextional.memory import (
+    MemoryTracker,
+    NamespaceAuditor,
+    approximate_size,
+    format_size,
+    tracemalloc,
+)
+
+
+def setup_func():
+    pass
+
+
+class TestFormatSize(unittest.TestCase):
+
+    def test_format_size(self):
+        self.assertEqual(format_size(512), "512.0 B")
+        self.assertEqual(format_size(1536), "1.5 KiB")
+        self.assertEqual(format_size(3 * 1024 * 1024), "3.0 MiB")
+
+
+class TestApproximateSize(unittest.TestCase):
+
+    def test_approximate_size_follows_references(self):
+        data = [bytearray(1000) for i in range(10)]
+        self.assertGreater(approximate_size(data), 10 * 1000)
+        self.assertGreater(approximate_size({"data": data}), 10 * 1000)
+
+
+class TestNamespaceAuditor(unittest.TestCase):
+
+    def setUp(self):
+        self.group = Group("Root Group")
+        self.setup = SetUpFixture(self.group, setup_func)
+
+    def tearDown(self):
+        for attr in ("leftover", "cleaned_up"):
+            helper.__dict__.pop(attr, None)
+
+    def run_group(self, auditor):
+        auditor.group_enter(self.group, 0)
+        auditor.fixture_start(self.setup, 0)
+        helper.leftover = [1, 2, 3]
+        helper.cleaned_up = [4, 5, 6]
+        auditor.fixture_end(self.setup, 0)
+        del helper.cleaned_up
+        auditor.group_exit(self.group, 0)
+
+    def test_residue_is_reported(self):
+        auditor = NamespaceAuditor()
+        self.run_group(auditor)
+        self.assertEqual(
+            [(group, attr) for size, group, attr in auditor._residue],
+            [(self.group, "leftover")],
+        )
+        self.assertTrue(hasattr(helper, "leftover"))
+
+    def test_residue_is_removed(self):
+        auditor = NamespaceAuditor(remove=True)
+        self.run_group(auditor)
+        self.assertEqual(len(auditor._residue), 1)
+        self.assertFalse(hasattr(helper, "leftover"))
+
+
+@unittest.skipIf(tracemalloc is None, "tracemalloc is not available")
+class TestMemoryTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.was_tracing = tracemalloc.is_tracing()
+        self.tracker = MemoryTracker(threshold=100 * 1024)
+        self.group = Group("Root Group")
+        self.retained = None
+
+    def tearDown(self):
+        if not self.was_tracing:
+            tracemalloc.stop()
+
+    def run_group(self, keep):
+        self.tracker.group_enter(self.group, 0)
+        data = [bytearray(1024) for i in range(1000)]
+        if keep:
+            self.retained = data
+        del data
+        self.tracker.group_exit(self.group, 0)
+
+    def test_retained_memory_is_reported(self):
+        self.run_group(keep=True)
+        self.assertEqual(len(self.tracker._leaks), 1)
+        retained, group, sites = self.tracker._leaks[0]
+        self.assertIs(group, self.group)
+        self.assertGreater(retained, 1000 * 1024)
+        self.assertEqual(sites[0].traceback[0].filename, __file__)
+
+    def test_released_memory_is_not_reported(self):
+        self.run_group(keep=False)
+        self.assertEqual(self.tracker._leaks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
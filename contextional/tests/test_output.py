@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+
+import time
+import unittest
+from unittest.runner import _WritelnDecorator
+
+from contextional.output import BufferedStream, buffer_result_stream
+from contextional.tests.tools import FakeStream
+
+
+class TestBufferedStream(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = FakeStream()
+
+    def test_written_once_a_line_is_finished(self):
+        buffered = BufferedStream(self.stream, size=20, interval=10.0)
+        buffered.write("Main Group")
+        buffered.write("\n")
+        buffered.write("  thing is 1 ... ")
+        buffered.flush()
+        self.assertEqual(self.stream.output, "")
+        buffered.writeln("ok")
+        self.assertEqual(
+            self.stream.output,
+            "Main Group\n  thing is 1 ... ok\n",
+        )
+        buffered.close()
+
+    def test_written_after_interval(self):
+        buffered = BufferedStream(self.stream, interval=0.01)
+        buffered.write("  hangs ... ")
+        for _ in range(100):
+            if self.stream.output:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.stream.output, "  hangs ... ")
+
+    def test_result_stream_is_restored(self):
+        stream = _WritelnDecorator(self.stream)
+        result = unittest.TextTestResult(stream, True, 2)
+        buffered = buffer_result_stream(result, interval=10.0)
+        self.assertIs(result.stream, buffered)
+        result.stream.write("Main Group")
+        result.printErrors()
+        self.assertIs(result.stream, stream)
+        self.assertEqual(self.stream.output, "Main Group\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group
+from contextional.profiling import SubtreeProfiler
+
+
+def make_group(group_id):
+    group = Group(group_id.rsplit("::", 1)[-1])
+    group._id = group_id
+    return group
+
+
+def profiled():
+    return sum(range(100))
+
+
+class TestSubtreeProfiler(unittest.TestCase):
+
+    def test_subtree(self):
+        profiler = SubtreeProfiler("Main Group::Child Group")
+        for group_id in (
+            "Main Group::Child Group",
+            "Main Group::Child Group#2",
+            "Main Group::Child Group::Grandchild Group",
+        ):
+            self.assertTrue(profiler._in_subtree(make_group(group_id)))
+        for group_id in (
+            "Main Group",
+            "Main Group::Other Group",
+            "Main Group::Child Groups",
+        ):
+            self.assertFalse(profiler._in_subtree(make_group(group_id)))
+
+    def test_stats_are_written_once_the_group_is_torn_down(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        group = make_group("Main Group")
+        case = Case(group, profiled, "test")
+        profiler = SubtreeProfiler("Main Group", temp_dir)
+        profiler.group_enter(group, 0.0)
+        profiler.case_start(case, 1.0)
+        profiled()
+        profiler.case_end(case, 2.0)
+        self.assertEqual(os.listdir(temp_dir), [])
+        profiler.group_exit(group, 3.0)
+        stats = pstats.Stats(os.path.join(temp_dir, "Main_Group.pstats"))
+        self.assertIn(
+            "profiled",
+            [name for filename, line, name in stats.stats],
+        )
+
+    def test_path_with_or_without_module(self):
+        child = make_group("tests.test_a::Main Group::Child Group")
+        copy = make_group("tests.test_a::Main Group::Child Group#2")
+        other = make_group("tests.test_a::Main Group::Other Group")
+        for path in (
+            "Main Group::Child Group",
+            "tests.test_a::Main Group::Child Group",
+        ):
+            profiler = SubtreeProfiler(path)
+            self.assertTrue(profiler._in_subtree(child))
+            self.assertTrue(profiler._in_subtree(copy))
+            self.assertFalse(profiler._in_subtree(other))
+
+    def test_other_module_is_left_out(self):
+        profiler = SubtreeProfiler("tests.test_a::Main Group")
+        self.assertTrue(
+            profiler._in_subtree(make_group("tests.test_a::Main Group")),
+        )
+        self.assertFalse(
+            profiler._in_subtree(make_group("tests.test_b::Main Group")),
+        )
+
+    def test_directory_is_made(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        directory = os.path.join(temp_dir, "profiles")
+        group = make_group("tests.test_a::Main Group")
+        profiler = SubtreeProfiler("Main Group", directory)
+        profiler.group_enter(group, 0.0)
+        profiler.group_exit(group, 1.0)
+        self.assertEqual(
+            os.listdir(directory),
+            ["tests.test_a_Main_Group.pstats"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group
+from contextional.progress import ProgressTracker, format_seconds
+from contextional.tests.tools import FakeStream
+
+
+def make_group(tests=4):
+    group = Group("Root Group")
+    group._id = "Root Group"
+    for i in range(tests):
+        case = Case(group, None, "test {}".format(i))
+        case._id = "Root Group::test {}".format(i)
+        case._queued = True
+        group._cases.append(case)
+    return group
+
+
+class TestProgressTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_path = os.path.join(self.temp_dir, "history")
+        self.group = make_group()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_format_seconds(self):
+        self.assertEqual(format_seconds(3725.4), "1:02:05")
+
+    def test_estimate_from_this_run(self):
+        tracker = ProgressTracker([self.group])
+        tracker.group_enter(self.group, 0.0)
+        self.assertIsNone(tracker._time_left())
+        tracker.case_finish(self.group._cases[0], 10.0)
+        self.assertEqual(tracker._time_left(), 30.0)
+
+    def test_estimate_from_history(self):
+        with open(self.history_path, "w") as f:
+            json.dump(
+                {
+                    "cases": {
+                        case._id: 1.0 for case in self.group._cases
+                    },
+                    "groups": {"Root Group": 5.0},
+                },
+                f,
+            )
+        tracker = ProgressTracker([self.group], self.history_path)
+        tracker.group_enter(self.group, 0.0)
+        self.assertEqual(tracker._time_left(), 9.0)
+        tracker.case_finish(self.group._cases[0], 10.0)
+        self.assertEqual(tracker._time_left(), 8.0)
+
+    def test_unfinished_cases_are_done_with_their_group(self):
+        tracker = ProgressTracker([self.group])
+        tracker.group_enter(self.group, 0.0)
+        tracker.group_exit(self.group, 1.0)
+        self.assertEqual(
+            tracker._line(),
+            "contextional: 4/4 tests, 0:00:01 elapsed, 0:00:00 left",
+        )
+
+    def test_lines_are_rate_limited(self):
+        tracker = ProgressTracker([self.group], interval=5.0)
+        tracker.group_enter(self.group, 0.0)
+        tracker.case_finish(self.group._cases[0], 1.0)
+        self.assertIsNone(tracker._due_line())
+        tracker.case_finish(self.group._cases[1], 6.0)
+        self.assertIsNotNone(tracker._due_line())
+        self.assertIsNone(tracker._due_line())
+
+
+    def test_cases_that_are_not_queued_are_not_counted(self):
+        self.group._cases[0]._queued = False
+        tracker = ProgressTracker([self.group])
+        tracker.group_enter(self.group, 0.0)
+        tracker.group_exit(self.group, 1.0)
+        self.assertEqual(
+            tracker._line(),
+            "contextional: 3/3 tests, 0:00:01 elapsed, 0:00:00 left",
+        )
+
+    def test_lines_are_written_to_the_result_stream(self):
+        result = unittest.TextTestResult(FakeStream(), None, 1)
+        self.group._result = result
+        tracker = ProgressTracker([self.group], result_stream=True)
+        tracker.group_enter(self.group, 0.0)
+        tracker.case_finish(self.group._cases[0], 2.0)
+        self.assertEqual(
+            result.stream.output,
+            "contextional: 1/4 tests, 0:00:02 elapsed, 0:00:06 left\n",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
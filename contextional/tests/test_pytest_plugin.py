@@ -0,0 +1,365 @@
+from __future__ import absolute_import
+
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from contextional.tests.tools import pytest, run_pytest
+
+
+@unittest.skipIf(pytest is None, "pytest is not installed")
+class TestSkippedTests(unittest.TestCase):
+
+    def test_skipped_test_is_reported(self):
+        code, output = run_pytest("skipped", "-rs")
+        self.assertEqual(code, 0, output)
+        self.assertNotIn("INTERNALERROR", output)
+        self.assertIn("SKIP [1]", output)
+        self.assertIn("not today", output)
+        self.assertIn("1 passed, 1 skipped", output)
+
+
+@unittest.skipIf(pytest is None, "pytest is not installed")
+class TestFailedTests(unittest.TestCase):
+
+    def test_tracebacks_hide_contextional(self):
+        code, output = run_pytest("failure")
+        self.assertEqual(code, 1, output)
+        self.assertIn("6 failed, 5 passed, 2 error", output)
+        self.assertNotIn("contextional/contextional.py", output)
+
+
+
+@unittest.skipIf(pytest is None, "pytest is not installed")
+class TestSummaries(unittest.TestCase):
+
+    def assert_summaries(self, output):
+        self.assertIn("2 failed, 2 passed, 2 error", output)
+        errors = output.index("= ERRORS =")
+        failures = output.index("= FAILURES =")
+        self.assertLess(
+            output.index(" ERROR at setup of Setup Error "),
+            output.index(" ERROR at teardown of Teardown Error "),
+        )
+        self.assertLess(errors, output.index("ValueError: no database"))
+        self.assertLess(
+            output.index("RuntimeError: still connected"),
+            failures,
+        )
+        self.assertLess(failures, output.index("AssertionError: not equal"))
+        self.assertLess(
+            output.index("AssertionError: not equal"),
+            output.index("output of the test teardown"),
+        )
+        self.assertEqual(output.count("output of the test teardown"), 1)
+
+    def test_setup_call_and_teardown_problems_are_summarized(self):
+        code, output = run_pytest("summaries")
+        self.assertEqual(code, 1, output)
+        self.assert_summaries(output)
+
+    def test_verbose(self):
+        code, output = run_pytest("summaries", "-v")
+        self.assertEqual(code, 1, output)
+        self.assert_summaries(output)
+
+
+PLUGIN_OPTIONS = "contextional.test_resources.plugin_options::Plugin Options"
+
+
+@unittest.skipIf(pytest is None, "pytest is not installed")
+class PluginOptionsTestCase(unittest.TestCase):
+    """Run the ``plugin_options`` resource with some of the plugin's options.
+
+    Each run happens in its own directory, so the files the options write
+    can be checked.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_pytest(self, *args):
+        code, output = run_pytest(
+            "plugin_options",
+            *args,
+            cwd=self.temp_dir
+        )
+        self.assertEqual(code, 1, output)
+        self.assertNotIn("INTERNALERROR", output)
+        return output
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def read_json(self, name):
+        with io.open(self.path(name), encoding="utf-8") as f:
+            return json.load(f)
+
+
+class TestTimingOptions(PluginOptionsTestCase):
+
+    def test_timing(self):
+        output = self.run_pytest("--contextional-timing")
+        self.assertIn("contextional timing:", output)
+        self.assertIn("Failing Group", output)
+
+    def test_timing_json(self):
+        self.run_pytest("--contextional-timing-json=timing.json")
+        root, = self.read_json("timing.json")
+        self.assertEqual(root["id"], PLUGIN_OPTIONS)
+        self.assertEqual(
+            [case["description"] for case in root["cases"]],
+            ["passes", "adds"],
+        )
+
+    def test_durations(self):
+        output = self.run_pytest("--contextional-durations=0")
+        self.assertIn("contextional: slowest group fixtures:", output)
+        self.assertIn("Plugin Options::Broken Group  setup (1/1)", output)
+
+    def test_amortization(self):
+        output = self.run_pytest("--contextional-amortization=0")
+        self.assertIn("contextional: group fixture cost per test:", output)
+        self.assertIn("2 test(s)  Plugin Options::Broken Group", output)
+
+
+class TestProfileOptions(PluginOptionsTestCase):
+
+    def test_profile(self):
+        self.run_pytest(
+            "--contextional-profile=Plugin Options::Failing Group",
+            "--contextional-profile-dir=profiles",
+        )
+        self.assertEqual(
+            os.listdir(self.path("profiles")),
+            [
+                "contextional.test_resources.plugin_options_"
+                "Plugin_Options_Failing_Group.pstats",
+            ],
+        )
+
+
+class TestMemoryOptions(PluginOptionsTestCase):
+
+    def test_memtrack(self):
+        output = self.run_pytest(
+            "--contextional-memtrack",
+            "--contextional-memtrack-threshold=0",
+        )
+        self.assertIn(
+            "contextional: groups retaining more than 0.0 B after teardown:",
+            output,
+        )
+
+    def test_audit_namespace(self):
+        output = self.run_pytest("--contextional-audit-namespace")
+        self.assertIn(
+            "contextional: attributes left after their group was torn down:",
+            output,
+        )
+        self.assertIn("Plugin Options  value", output)
+
+
+class TestTraceOptions(PluginOptionsTestCase):
+
+    def test_trace(self):
+        self.run_pytest("--contextional-trace=trace.json")
+        events = self.read_json("trace.json")["traceEvents"]
+        self.assertEqual(
+            (events[0]["name"], events[0]["ph"], events[0]["args"]["id"]),
+            ("Plugin Options", "B", PLUGIN_OPTIONS),
+        )
+
+
+class TestIncrementalOptions(PluginOptionsTestCase):
+
+    def test_incremental(self):
+        self.run_pytest("--contextional-incremental")
+        output = self.run_pytest("--contextional-incremental")
+        self.assertIn(
+            "contextional: skipped 2 unchanged passing test(s)",
+            output,
+        )
+
+
+class TestReportOptions(PluginOptionsTestCase):
+
+    def test_junitxml(self):
+        self.run_pytest("--contextional-junitxml=junit.xml")
+        with io.open(self.path("junit.xml"), encoding="utf-8") as f:
+            report = f.read()
+        self.assertIn(
+            u'<testsuite name="Broken Group" tests="2" '
+            u'id="{}::Broken Group">'.format(PLUGIN_OPTIONS),
+            report,
+        )
+        self.assertIn(
+            u'<error type="ValueError" message="ValueError: no database">',
+            report,
+        )
+
+    def test_html(self):
+        self.run_pytest("--contextional-html=report.html")
+        with io.open(self.path("report.html"), encoding="utf-8") as f:
+            report = f.read()
+        self.assertIn(u"<summary>Broken Group</summary>", report)
+        self.assertIn(u'title="AssertionError: not equal">fails</div>', report)
+
+    def test_events(self):
+        self.run_pytest("--contextional-events=events.jsonl")
+        with io.open(self.path("events.jsonl"), encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(
+            (events[0]["event"], events[0]["id"]),
+            ("group_enter", PLUGIN_OPTIONS),
+        )
+        self.assertEqual(
+            (events[-1]["event"], events[-1]["id"]),
+            ("group_exit", PLUGIN_OPTIONS),
+        )
+
+    def test_history(self):
+        self.run_pytest(
+            "--contextional-history=history.db",
+            "--contextional-history-label=abc123",
+        )
+        connection = sqlite3.connect(self.path("history.db"))
+        try:
+            labels = connection.execute("SELECT label FROM runs").fetchall()
+            outcomes = connection.execute(
+                "SELECT outcome, COUNT(*) FROM cases GROUP BY outcome "
+                "ORDER BY outcome"
+            ).fetchall()
+        finally:
+            connection.close()
+        self.assertEqual(labels, [("abc123",)])
+        self.assertEqual(outcomes, [("failed", 4), ("passed", 2)])
+
+
+class TestOutputOptions(PluginOptionsTestCase):
+
+    def test_capture(self):
+        output = self.run_pytest("--contextional-capture", "-s")
+        self.assertIn(
+            "---- {}::Failing Group::fails ----\n"
+            "output of a test that fails\n".format(PLUGIN_OPTIONS),
+            output,
+        )
+        self.assertNotIn("output of a test that passes", output)
+
+    def test_progress(self):
+        output = self.run_pytest(
+            "--contextional-progress",
+            "--contextional-progress-interval=0",
+            "--contextional-progress-history=durations.json",
+        )
+        self.assertIn("contextional: 6/6 tests", output)
+        self.assertTrue(os.path.exists(self.path("durations.json")))
+
+    def test_time_accounting(self):
+        output = self.run_pytest("--contextional-time-accounting")
+        self.assertIn("contextional: where the time went", output)
+        self.assertIn("  user code  ", output)
+
+
+class TestFailureOptions(PluginOptionsTestCase):
+
+    def test_cascade(self):
+        output = self.run_pytest("--contextional-cascade=skip")
+        self.assertIn(
+            "contextional: 1 cascading failure(s) reached 2 test(s):\n"
+            "  {0}::Broken Group\n"
+            "    setup (1/1): ValueError: no database\n"
+            "    skipped 2 test(s):\n".format(PLUGIN_OPTIONS),
+            output,
+        )
+        self.assertIn("2 failed, 2 passed, 2 skipped, 1 error", output)
+
+    def test_dedup(self):
+        output = self.run_pytest(
+            "--contextional-dedup",
+            "--contextional-dedup-json=tracebacks.json",
+        )
+        self.assertIn(
+            "contextional: 4 failure(s) and error(s), 3 distinct:",
+            output,
+        )
+        tracebacks = self.read_json("tracebacks.json")["tracebacks"]
+        self.assertEqual(
+            [traceback["count"] for traceback in tracebacks],
+            [2, 1, 1],
+        )
+
+
+class TestBenchmarkOptions(PluginOptionsTestCase):
+
+    def test_benchmark_json(self):
+        self.run_pytest("--contextional-benchmark-json=benchmarks.json")
+        benchmark, = self.read_json("benchmarks.json")["benchmarks"]
+        self.assertEqual(benchmark["id"], PLUGIN_OPTIONS + "::adds")
+        self.assertEqual(benchmark["stats"]["rounds"], 2)
+
+    def test_benchmark_save_and_compare(self):
+        self.run_pytest(
+            "--contextional-benchmark-save=base",
+            "--contextional-benchmark-dir=baselines",
+        )
+        self.assertEqual(os.listdir(self.path("baselines")), ["base.json"])
+        output = self.run_pytest(
+            "--contextional-benchmark-compare=base",
+            "--contextional-benchmark-dir=baselines",
+            "--contextional-benchmark-threshold=1000",
+        )
+        self.assertIn(
+            "contextional: benchmarks compared to baseline 'base':",
+            output,
+        )
+        self.assertIn("UNCHANGED", output)
+
+    def test_benchmark_compare_missing_baseline(self):
+        code, output = run_pytest(
+            "plugin_options",
+            "--contextional-benchmark-compare=base",
+            "--contextional-benchmark-dir=baselines",
+            cwd=self.temp_dir,
+        )
+        self.assertEqual(code, 4, output)
+        self.assertNotIn("INTERNALERROR", output)
+        self.assertIn("no benchmark baseline named 'base'", output)
+
+
+class FakeConfig(object):
+    pass
+
+
+@unittest.skipIf(pytest is None, "pytest is not installed")
+class TestWorkerPath(unittest.TestCase):
+
+    def setUp(self):
+        from contextional.pytest_contextional import _worker_path
+        self.worker_path = _worker_path
+        self.config = FakeConfig()
+
+    def test_path_is_kept_outside_workers(self):
+        self.assertEqual(
+            self.worker_path(self.config, "out/report.xml"),
+            "out/report.xml",
+        )
+
+    def test_worker_id_goes_before_the_extension(self):
+        self.config.workerinput = {"workerid": "gw1"}
+        self.assertEqual(
+            self.worker_path(self.config, "out/report.xml"),
+            "out/report-gw1.xml",
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
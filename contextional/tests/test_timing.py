@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.contextional import Case, Group, SetUpFixture
+from contextional.timing import (
+    hoistable_test_setups,
+    shareable_siblings,
+    slowest_fixtures,
+    timing_tree,
+)
+
+
+def setup_func():
+    pass
+
+
+def same_setup_func():
+    pass
+
+
+def other_setup_func():
+    setup_func()
+
+
+def make_group(description, parent=None, setup_duration=None):
+    group = Group(description, parent=parent)
+    setup = SetUpFixture(group, None)
+    setup._duration = setup_duration
+    group._setups.append(setup)
+    if parent is not None:
+        parent._children.append(group)
+    return group
+
+
+def add_case(group, duration):
+    case = Case(group, None, "test")
+    case._test_started = True
+    case._setup_duration = 0.0
+    case._call_duration = duration
+    group._cases.append(case)
+    return case
+
+
+class TestTimingTree(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = make_group("Root Group", setup_duration=1.0)
+        add_case(cls.root, 2.0)
+        child = make_group("Child Group", cls.root, setup_duration=3.0)
+        add_case(child, 4.0)
+        make_group("Unused Group", cls.root)
+        cls.tree = timing_tree([cls.root])
+
+    def test_exclusive_duration(self):
+        self.assertEqual(
+            self.root._exclusive_duration,
+            3.0,
+        )
+
+    def test_inclusive_duration(self):
+        self.assertEqual(
+            self.root._inclusive_duration,
+            10.0,
+        )
+
+    def test_groups_that_did_not_run_are_left_out(self):
+        self.assertEqual(
+            [node["description"] for node in self.tree[0]["groups"]],
+            ["Child Group"],
+        )
+
+    def test_case_total(self):
+        self.assertEqual(
+            self.tree[0]["groups"][0]["cases"][0]["total"],
+            4.0,
+        )
+
+
+class TestSlowestFixtures(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        root = make_group("Root Group", setup_duration=1.0)
+        add_case(root, 2.0)
+        child = make_group("Child Group", root, setup_duration=3.0)
+        add_case(child, 4.0)
+        cls.rows = slowest_fixtures([root], count=1)
+
+    def test_count(self):
+        self.assertEqual(
+            len(self.rows),
+            1,
+        )
+
+    def test_slowest_fixture(self):
+        self.assertEqual(
+            self.rows[0][1]._group._description,
+            "Child Group",
+        )
+
+    def test_tests_served(self):
+        self.assertEqual(
+            self.rows[0][2],
+            1,
+        )
+
+
+class TestHoistableTestSetups(unittest.TestCase):
+
+    def make_group(self, test_setup_duration, tests=3):
+        group = Group("Root Group")
+        group._test_setups.append(setup_func)
+        for i in range(tests):
+            add_case(group, 0.0)._setup_duration = test_setup_duration
+        return group
+
+    def test_expensive_test_setups_are_found(self):
+        group = self.make_group(1.0)
+        self.assertEqual(
+            hoistable_test_setups([group]),
+            [(3.0, 1.0, group, 3)],
+        )
+
+    def test_cheap_test_setups_are_ignored(self):
+        group = self.make_group(0.001)
+        self.assertEqual(hoistable_test_setups([group]), [])
+
+    def test_single_test_is_ignored(self):
+        group = self.make_group(1.0, tests=1)
+        self.assertEqual(hoistable_test_setups([group]), [])
+
+
+class TestShareableSiblings(unittest.TestCase):
+
+    def add_child(self, parent, description, func, args=()):
+        group = Group(description, parent=parent, args=args)
+        group._setups.append(SetUpFixture(group, func))
+        parent._children.append(group)
+        return group
+
+    def test_identical_fixture_code_is_found(self):
+        root = Group("Root Group")
+        first = self.add_child(root, "First", setup_func)
+        second = self.add_child(root, "Second", same_setup_func)
+        self.add_child(root, "Other", other_setup_func)
+        self.assertEqual(
+            shareable_siblings([root]),
+            [(root, [first, second])],
+        )
+
+    def test_different_args_are_not_shareable(self):
+        root = Group("Root Group")
+        self.add_child(root, "First", setup_func, args=(1,))
+        self.add_child(root, "Second", setup_func, args=(2,))
+        self.assertEqual(shareable_siblings([root]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextional.contextional import Case, Group, SetUpFixture
+from contextional.trace import TraceWriter
+
+
+def setup_func():
+    pass
+
+
+def case_func(case):
+    pass
+
+
+class TestTraceWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "trace.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_spans_are_nested(self):
+        group = Group("Root Group")
+        group._id = "Root Group"
+        setup = SetUpFixture(group, setup_func)
+        group._setups.append(setup)
+        case = Case(group, case_func, "test")
+        case._id = "Root Group::test"
+
+        writer = TraceWriter(self.path, process_name="gw0")
+        writer.group_enter(group, 1.0)
+        writer.fixture_start(setup, 1.5)
+        writer.fixture_end(setup, 2.0)
+        writer.case_start(case, 2.5)
+        writer.case_end(case, 3.0)
+        writer.group_exit(group, 3.5)
+        writer(None)
+
+        with open(self.path) as f:
+            events = json.load(f)["traceEvents"]
+        self.assertEqual(events[0]["args"], {"name": "gw0"})
+        self.assertEqual(
+            [(e["ph"], e["name"], e["ts"]) for e in events[1:]],
+            [
+                ("B", "Root Group", 1e6),
+                ("B", "setup (1/1)", 1.5e6),
+                ("E", "setup (1/1)", 2e6),
+                ("B", "test", 2.5e6),
+                ("E", "test", 3e6),
+                ("E", "Root Group", 3.5e6),
+            ],
+        )
+        self.assertEqual(events[4]["args"], {"id": "Root Group::test"})
+
+
+if __name__ == '__main__':
+    unittest.main()
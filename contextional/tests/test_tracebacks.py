@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from contextional.contextional import Group
+from contextional.tests.tools import FakeStream
+from contextional.tracebacks import DuplicateTraceback, TracebackStore
+
+
+def fail(value):
+    try:
+        raise ValueError("bad value {}".format(value))
+    except ValueError:
+        return sys.exc_info()
+
+
+class TestTracebackStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "tracebacks.json")
+        self.group = Group("Root Group")
+        self.group._id = "Root Group"
+        self.other_group = Group("Other Group")
+        self.other_group._id = "Other Group"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_only_numbers_differ(self):
+        store = TracebackStore(path=self.path)
+        first = store._add(fail(1), self.group, "Root Group::a")
+        second = store._add(fail(2), self.other_group, "Other Group::b")
+        self.assertIs(first, second)
+        self.assertEqual(first._count, 2)
+        self.assertEqual(first._groups, ["Root Group", "Other Group"])
+        exc_type, exc_value, tb = first._placeholder()
+        self.assertIs(exc_type, DuplicateTraceback)
+        self.assertEqual(
+            str(exc_value),
+            "same traceback as Root Group::a (ValueError: bad value 1)",
+        )
+        self.assertIsNone(tb)
+
+        try:
+            raise ValueError("bad value 3")
+        except ValueError:
+            # raised from somewhere else, so it's a different traceback.
+            third = store._add(sys.exc_info(), self.group, "Root Group::c")
+        self.assertIsNot(third, first)
+
+        stream = FakeStream()
+        store._report(stream)
+        self.assertEqual(
+            stream.output,
+            "\ncontextional: 3 failure(s) and error(s), 2 distinct:\n"
+            "  ValueError: bad value 1 (2 occurrence(s))\n"
+            "    Root Group\n"
+            "    Other Group\n"
+            "  ValueError: bad value 3 (1 occurrence(s))\n"
+            "    Root Group\n",
+        )
+        with open(self.path) as f:
+            tracebacks = json.load(f)["tracebacks"]
+        self.assertEqual(
+            [(t["first"], t["count"]) for t in tracebacks],
+            [("Root Group::a", 2), ("Root Group::c", 1)],
+        )
+        self.assertIn(
+            'raise ValueError("bad value',
+            tracebacks[0]["traceback"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+
+import unittest
+
+from contextional.contextional import Group
+from contextional.tree import walk_groups
+
+
+class TestWalkGroups(unittest.TestCase):
+
+    def test_groups_come_in_the_order_they_run(self):
+        root = Group("Root Group")
+        child = root._add_child("Child Group")
+        grandchild = child._add_child("Grandchild Group")
+        sibling = root._add_child("Sibling Group")
+        other_root = Group("Other Root Group")
+        self.assertEqual(
+            list(walk_groups([root, other_root])),
+            [root, child, grandchild, sibling, other_root],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
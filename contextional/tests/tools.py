@@ -1,10 +1,27 @@
 from __future__ import absolute_import
 
+import os
+import subprocess
+import sys
 from unittest import (
     _TextTestResult,
     TextTestRunner,
 )
 
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+try:
+    import nose
+except ImportError:
+    nose = None
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOURCES_DIR = os.path.join(PACKAGE_DIR, "test_resources")
+
 
 class FakeStream(object):
 
@@ -32,3 +49,107 @@ class SilentTestRunner(TextTestRunner):
         kwargs["verbosity"] = 2
         kwargs["resultclass"] = TextTestResultHolder
         super(SilentTestRunner, self).__init__(*args, **kwargs)
+
+
+# run by run_with_events in a new interpreter, with the runner, the path to
+# write the events to, and the runner's arguments.
+RUN_WITH_EVENTS = """
+import sys
+
+from contextional import GCM
+
+runner, path = sys.argv[1:3]
+del sys.argv[1:3]
+GCM.write_events(path)
+if runner == "nose":
+    import nose
+    from contextional.nose_plugin import NoseDryRun
+    nose.main(addplugins=[NoseDryRun()])
+elif runner == "pytest":
+    import pytest
+    sys.exit(
+        pytest.main(
+            ["-p", "contextional.pytest_contextional"] +
+            ["-p", "no:cacheprovider"] +
+            sys.argv[1:]
+        )
+    )
+else:
+    import unittest
+    unittest.main(module=None)
+"""
+
+
+def _run(args, cwd=None):
+    """Run Python with some arguments, with contextional on its path.
+
+    :returns: The exit code, and everything it wrote.
+    :rtype: tuple
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(PACKAGE_DIR)] +
+        [path for path in [env.get("PYTHONPATH")] if path],
+    )
+    process = subprocess.Popen(
+        [sys.executable] + list(args),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        cwd=cwd,
+        env=env,
+    )
+    output = process.communicate()[0].decode("utf-8", "replace")
+    return process.returncode, output
+
+
+def run_pytest(resource, *args, **kwargs):
+    """Run a test resource module through pytest, in a new interpreter.
+
+    :param resource: The name of the module in ``test_resources``.
+    :type resource: str
+    :param cwd: The directory to run pytest in.
+    :type cwd: str
+
+    The tests of a module are queued up as soon as it's imported, so running
+    it in this interpreter would get in the way of the other tests.
+    Contextional is put on the new interpreter's path, so it can be run from
+    any directory.
+
+    :returns: The exit code, and everything pytest wrote.
+    :rtype: tuple
+    """
+    return _run(
+        [
+            "-m",
+            "pytest",
+            "-p",
+            "contextional.pytest_contextional",
+            "-p",
+            "no:cacheprovider",
+            os.path.join(RESOURCES_DIR, resource + ".py"),
+        ] + list(args),
+        cwd=kwargs.get("cwd"),
+    )
+
+
+def run_with_events(runner, resource, path, *args):
+    """Run a test resource module in a new interpreter, and write its events.
+
+    :param runner: ``"unittest"``, ``"pytest"``, or ``"nose"`` (with the
+        contextional dry run plugin available).
+    :type runner: str
+    :param resource: The name of the module in ``test_resources``.
+    :type resource: str
+    :param path: The file to write the events to, as lines of JSON.
+    :type path: str
+
+    :returns: The exit code, and everything the runner wrote.
+    :rtype: tuple
+    """
+    if runner == "unittest":
+        target = "contextional.test_resources." + resource
+    else:
+        target = os.path.join(RESOURCES_DIR, resource + ".py")
+    return _run(
+        ["-c", RUN_WITH_EVENTS, runner, path, target] + list(args),
+    )
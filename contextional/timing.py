@@ -0,0 +1,380 @@
+from __future__ import absolute_import
+
+import hashlib
+import json
+
+from contextional.incremental import update_code_digest
+from contextional.tree import walk_groups
+
+
+def _group_path(group):
+    """The descriptions of the group and its ancestors, joined by ``::``."""
+    return "::".join(g._description for g in group._setup_ancestry)
+
+
+def _ran(group):
+    """Whether or not any of the group's fixtures or tests were run."""
+    if any(case._test_started for case in group._cases):
+        return True
+    if any(f._duration is not None for f in group._setups + group._teardowns):
+        return True
+    return any(_ran(child) for child in group._children)
+
+
+def timing_tree(groups):
+    """Build a tree of the time spent in each of the groups that were run.
+
+    :param groups: The root groups of the tree.
+    :type groups: list of :class:`.Group`
+    :returns: A list with a dictionary for each group that was run, with the
+        dictionaries of its child groups in its ``"groups"``.
+    :rtype: list
+
+    All durations are in seconds. A group's ``"exclusive"`` duration is the
+    time spent on its own setups, teardowns, and tests (including their test
+    setups and test teardowns), while its ``"inclusive"`` duration also
+    includes the time spent on its descendants.
+    """
+    tree = []
+    for group in groups:
+        if not _ran(group):
+            continue
+        tree.append({
+            "id": group._id,
+            "description": group._description,
+            "setup": group._setup_duration,
+            "teardown": group._teardown_duration,
+            "exclusive": group._exclusive_duration,
+            "inclusive": group._inclusive_duration,
+            "cases": [
+                {
+                    "id": case._id,
+                    "description": case._description,
+                    "outcome": case._outcome,
+                    "setup": case._setup_duration,
+                    "call": case._call_duration,
+                    "teardown": case._teardown_duration,
+                    "total": case._duration,
+                }
+                for case in group._cases
+                if case._test_started
+            ],
+            "groups": timing_tree(group._children),
+        })
+    return tree
+
+
+def format_timing_tree(groups):
+    """Format the timing tree the same way the tests are shown when run.
+
+    Each group's line shows its inclusive and exclusive durations, and each
+    test's line shows the time spent on it (including its test setups and
+    test teardowns).
+    """
+    lines = [
+        "{:>10} {:>10}".format("inclusive", "exclusive"),
+    ]
+
+    def add_lines(nodes, level):
+        for node in nodes:
+            lines.append(
+                "{:>9.3f}s {:>9.3f}s  {}{}".format(
+                    node["inclusive"],
+                    node["exclusive"],
+                    "  " * level,
+                    node["description"],
+                ),
+            )
+            for case in node["cases"]:
+                lines.append(
+                    "{:>9.3f}s {:>10}  {}{}".format(
+                        case["total"],
+                        "",
+                        "  " * (level + 1),
+                        case["description"],
+                    ),
+                )
+            add_lines(node["groups"], level + 1)
+
+    add_lines(timing_tree(groups), 0)
+    return "\n".join(lines)
+
+
+class TimingReport(object):
+    """Report the time spent in each group once all the tests are done.
+
+    :param groups: The root groups to report on.
+    :type groups: list of :class:`.Group`
+    :param show: Write the timing tree to the output stream.
+    :type show: bool
+    :param path: The path of a file to write the timing tree to as JSON.
+    :type path: str
+    """
+
+    def __init__(self, groups, show=True, path=None):
+        self._groups = groups
+        self._show = show
+        self._path = path
+
+    def __call__(self, stream):
+        if self._show:
+            stream.write("\ncontextional timing:\n")
+            stream.write(format_timing_tree(self._groups) + "\n")
+        if self._path is not None:
+            with open(self._path, "w") as f:
+                json.dump(timing_tree(self._groups), f, indent=1)
+
+
+def _count_served(group, served):
+    """Count the tests each group served, including those of descendants."""
+    count = sum(1 for case in group._cases if case._test_started)
+    for child in group._children:
+        count += _count_served(child, served)
+    served[group] = count
+    return count
+
+
+def slowest_fixtures(groups, count=None):
+    """Find the group fixtures that took the longest.
+
+    :param groups: The root groups to look through.
+    :type groups: list of :class:`.Group`
+    :param count: The number of fixtures to return. All of them are returned
+        if ``None`` or ``0``.
+    :type count: int
+    :returns: ``(duration, fixture, tests served)`` tuples, slowest first.
+    :rtype: list
+
+    The number of tests a fixture served is the number of tests that were run
+    within its group, including those of the group's descendants.
+    """
+    served = {}
+    for group in groups:
+        _count_served(group, served)
+    rows = []
+    for group, tests_served in served.items():
+        fixtures = group._setups + group._teardowns + group._lazy_attributes
+        for fixture in fixtures:
+            if fixture._duration is not None:
+                rows.append((fixture._duration, fixture, tests_served))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    if count:
+        rows = rows[:count]
+    return rows
+
+
+def format_slowest_fixtures(groups, count=None):
+    """Format the slowest group fixtures, along with their cost per test."""
+    lines = []
+    for duration, fixture, tests_served in slowest_fixtures(groups, count):
+        path = _group_path(fixture._group)
+        per_test = duration / tests_served if tests_served else duration
+        lines.append(
+            "{:>9.3f}s {:>9.3f}s/test {:>6} test(s)  {}  {}".format(
+                duration,
+                per_test,
+                tests_served,
+                path,
+                fixture.description,
+            ),
+        )
+    return "\n".join(lines)
+
+
+class DurationsReport(object):
+    """Report the slowest group fixtures once all the tests are done.
+
+    :param groups: The root groups to report on.
+    :type groups: list of :class:`.Group`
+    :param count: The number of fixtures to show. All of them are shown if
+        ``0``.
+    :type count: int
+    """
+
+    def __init__(self, groups, count=10):
+        self._groups = groups
+        self._count = count
+
+    def __call__(self, stream):
+        if self._count:
+            title = "{} slowest group fixtures".format(self._count)
+        else:
+            title = "slowest group fixtures"
+        stream.write("\ncontextional: {}:\n".format(title))
+        stream.write(format_slowest_fixtures(self._groups, self._count) + "\n")
+
+
+def fixture_costs(groups):
+    """Find what each group's fixtures cost, and how many tests they served.
+
+    :param groups: The root groups to look through.
+    :type groups: list of :class:`.Group`
+    :returns: ``(cost, group, tests served)`` tuples, most expensive first,
+        for each group whose fixtures took any time.
+    :rtype: list
+
+    A group's cost is the time spent on its setups and teardowns (including
+    those of its lazy attributes).
+    """
+    served = {}
+    for group in groups:
+        _count_served(group, served)
+    rows = []
+    for group, tests_served in served.items():
+        cost = group._setup_duration + group._teardown_duration
+        if cost:
+            rows.append((cost, group, tests_served))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return rows
+
+
+def hoistable_test_setups(groups, min_savings=0.01):
+    """Find groups whose test setups would be cheaper as group setups.
+
+    :param groups: The root groups to look through.
+    :type groups: list of :class:`.Group`
+    :param min_savings: The fewest seconds that would have to be saved for a
+        group to be included.
+    :type min_savings: float
+    :returns: ``(total, once, group, tests)`` tuples, most expensive first,
+        where ``total`` is the time spent on the group's test setups, and
+        ``once`` is the average time they took for a single test (i.e. what
+        they'd roughly cost if they were group setups).
+    :rtype: list
+
+    This only looks at the cost, so it's up to you to decide if a test setup
+    can safely be shared by all of its group's tests.
+    """
+    rows = []
+    for group in walk_groups(groups):
+        durations = [
+            case._setup_duration
+            for case in group._cases
+            if case._setup_duration is not None
+        ]
+        if group._test_setups and len(durations) > 1:
+            total = sum(durations)
+            once = total / len(durations)
+            if total - once >= min_savings:
+                rows.append((total, once, group, len(durations)))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return rows
+
+
+def _fixture_signature(group):
+    """Fingerprint the group's arguments and the code of its fixtures."""
+    if not group._setups:
+        return None
+    digest = hashlib.sha1()
+    digest.update(repr(group._args).encode("utf-8"))
+    for fixtures in (group._setups, group._teardowns):
+        digest.update(repr(len(fixtures)).encode("utf-8"))
+        for fixture in fixtures:
+            code = getattr(fixture._func, "__code__", None)
+            if code is None:
+                digest.update(repr(fixture._func).encode("utf-8"))
+            else:
+                update_code_digest(digest, code)
+    return digest.hexdigest()
+
+
+def shareable_siblings(groups):
+    """Find sibling groups that have the same fixtures.
+
+    :param groups: The root groups to look through.
+    :type groups: list of :class:`.Group`
+    :returns: ``(parent, siblings)`` tuples, where ``parent`` is ``None`` for
+        root groups.
+    :rtype: list
+
+    Siblings have the same fixtures if they have the same arguments, and their
+    setups and teardowns have the same code (e.g. because they're copies made
+    by ``includes`` or ``combine``). Their fixtures could be moved to a group
+    they share, so they'd only be run once.
+    """
+    rows = []
+
+    def visit(parent, children):
+        matches = {}
+        order = []
+        for child in children:
+            signature = _fixture_signature(child)
+            if signature is None:
+                continue
+            if signature not in matches:
+                matches[signature] = []
+                order.append(signature)
+            matches[signature].append(child)
+        for signature in order:
+            if len(matches[signature]) > 1:
+                rows.append((parent, matches[signature]))
+        for child in children:
+            visit(child, child._children)
+
+    visit(None, groups)
+    return rows
+
+
+class AmortizationReport(object):
+    """Report where restructuring the groups would save the most time.
+
+    :param groups: The root groups to report on.
+    :type groups: list of :class:`.Group`
+    :param count: The number of groups to show the fixture costs of. All of
+        them are shown if ``0``.
+    :type count: int
+    :param min_savings: The fewest seconds hoisting a group's test setups
+        would have to save for it to be shown.
+    :type min_savings: float
+    """
+
+    def __init__(self, groups, count=10, min_savings=0.01):
+        self._groups = groups
+        self._count = count
+        self._min_savings = min_savings
+
+    def __call__(self, stream):
+        rows = fixture_costs(self._groups)
+        if self._count:
+            rows = rows[:self._count]
+        stream.write("\ncontextional: group fixture cost per test:\n")
+        for cost, group, tests_served in rows:
+            per_test = cost / tests_served if tests_served else cost
+            stream.write(
+                "{:>9.3f}s {:>9.3f}s/test {:>6} test(s)  {}\n".format(
+                    cost,
+                    per_test,
+                    tests_served,
+                    _group_path(group),
+                ),
+            )
+
+        rows = hoistable_test_setups(self._groups, self._min_savings)
+        if rows:
+            stream.write(
+                "\ncontextional: test setups that would be cheaper as group "
+                "setups:\n",
+            )
+        for total, once, group, tests in rows:
+            stream.write(
+                "{:>9.3f}s {:>9.3f}s once {:>6} test(s)  {}\n".format(
+                    total,
+                    once,
+                    tests,
+                    _group_path(group),
+                ),
+            )
+
+        rows = shareable_siblings(self._groups)
+        if rows:
+            stream.write(
+                "\ncontextional: sibling groups with the same fixtures, which "
+                "could share a parent:\n",
+            )
+        for parent, siblings in rows:
+            stream.write(
+                "  {}: {}\n".format(
+                    "(root)" if parent is None else _group_path(parent),
+                    ", ".join(group._description for group in siblings),
+                ),
+            )
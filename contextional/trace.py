@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+
+import json
+import os
+import threading
+
+from contextional.listener import Listener
+
+
+class TraceWriter(Listener):
+    """Write a timeline of the run in the Trace Event Format.
+
+    :param path: The path of the JSON file to write the trace to.
+    :type path: str
+    :param process_name: The name to show for this process's track (e.g. the
+        name of a worker when the tests are run in parallel).
+    :type process_name: str
+
+    Every group (from when it's set up to when it's torn down), group fixture,
+    test setup, test, and test teardown gets its own span, so they nest by
+    group depth when the trace is opened in ``chrome://tracing`` or Perfetto.
+    Each span has the stable ID of its group or test in its ``args``.
+
+    Timestamps come from a monotonic clock, so they're only meaningful in
+    relation to each other.
+    """
+
+    def __init__(self, path, process_name=None):
+        self._path = path
+        self._pid = os.getpid()
+        self._events = []
+        if process_name is not None:
+            self._events.append({
+                "name": "process_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": 0,
+                "args": {"name": process_name},
+            })
+
+    def _add_event(self, phase, name, category, timestamp, obj_id=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": timestamp * 1e6,
+            "pid": self._pid,
+            "tid": threading.current_thread().ident,
+        }
+        if obj_id is not None:
+            event["args"] = {"id": obj_id}
+        self._events.append(event)
+
+    def group_enter(self, group, timestamp):
+        self._add_event(
+            "B", group._description, "group", timestamp, group._id,
+        )
+
+    def group_exit(self, group, timestamp):
+        self._add_event("E", group._description, "group", timestamp)
+
+    def fixture_start(self, fixture, timestamp):
+        self._add_event(
+            "B", fixture.description, "fixture", timestamp, fixture._group._id,
+        )
+
+    def fixture_end(self, fixture, timestamp):
+        self._add_event("E", fixture.description, "fixture", timestamp)
+
+    def test_setup_start(self, case, timestamp):
+        self._add_event("B", "test setup", "test setup", timestamp, case._id)
+
+    def test_setup_end(self, case, timestamp):
+        self._add_event("E", "test setup", "test setup", timestamp)
+
+    def case_start(self, case, timestamp):
+        self._add_event("B", case._description, "test", timestamp, case._id)
+
+    def case_end(self, case, timestamp):
+        self._add_event("E", case._description, "test", timestamp)
+
+    def test_teardown_start(self, case, timestamp):
+        self._add_event(
+            "B", "test teardown", "test teardown", timestamp, case._id,
+        )
+
+    def test_teardown_end(self, case, timestamp):
+        self._add_event("E", "test teardown", "test teardown", timestamp)
+
+    def __call__(self, stream):
+        with open(self._path, "w") as f:
+            json.dump(
+                {"traceEvents": self._events, "displayTimeUnit": "ms"},
+                f,
+            )
@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+
+import json
+import re
+
+from contextional.formatting import FormattedError, format_error
+
+
+# the parts of an error's message that tend to differ between occurrences of
+# the same error (e.g. addresses, IDs, and counts).
+_VARIABLE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+class DuplicateTraceback(Exception):
+    """Stands in for an error whose traceback has already been reported."""
+
+
+def _fingerprint(exc_info):
+    """What makes two errors the same.
+
+    That's the type of error, the frames it was raised through, and its
+    message, with the numbers taken out.
+    """
+    exc_type, exc_value, tb = exc_info
+    frames = []
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+        tb = tb.tb_next
+    error = format_error(exc_info)
+    return (
+        exc_type.__module__,
+        exc_type.__name__,
+        tuple(frames),
+        _VARIABLE.sub("N", error),
+    )
+
+
+class _Traceback(object):
+    """A distinct traceback, and where it happened."""
+
+    def __init__(self, exc_info, location):
+        self._error = FormattedError(exc_info)
+        self._location = location
+        self._count = 0
+        self._groups = []
+        self._group_ids = set()
+
+    def _placeholder(self):
+        """The exc_info to report in place of another occurrence of this."""
+        return (
+            DuplicateTraceback,
+            DuplicateTraceback(
+                "same traceback as {} ({})".format(
+                    self._location,
+                    self._error.message,
+                ),
+            ),
+            None,
+        )
+
+
+class TracebackStore(object):
+    """Keep one copy of each distinct traceback.
+
+    :param path: The path of a JSON file to write the distinct tracebacks to
+        once all the tests are done.
+    :type path: str
+    :param max_paths: The most groups to show for each distinct traceback.
+    :type max_paths: int
+
+    Each failure and error is fingerprinted as it's reported (see
+    :func:`_fingerprint`). The first occurrence of a traceback is reported
+    as usual, while the rest are reported with a one line
+    :class:`DuplicateTraceback` pointing at the first, and their tests share
+    the first one's formatted traceback, rather than each having their own.
+    Only the text of each distinct traceback is kept. Once all the tests are
+    done, each distinct traceback is shown with how many times it happened,
+    and in which groups.
+    """
+
+    def __init__(self, path=None, max_paths=10):
+        self._path = path
+        self._max_paths = max_paths
+        self._tracebacks = {}
+        self._order = []
+
+    def _add(self, exc_info, group, location):
+        """Note that an error was reported.
+
+        :param exc_info: The error.
+        :param group: The group it happened in.
+        :type group: :class:`.Group`
+        :param location: The ID of the test (or fixture) it happened in.
+        :type location: str
+        :returns: The distinct traceback it's an occurrence of.
+        """
+        key = _fingerprint(exc_info)
+        entry = self._tracebacks.get(key)
+        if entry is None:
+            entry = self._tracebacks[key] = _Traceback(exc_info, location)
+            self._order.append(entry)
+        entry._count += 1
+        if group._id not in entry._group_ids:
+            entry._group_ids.add(group._id)
+            entry._groups.append(group._id)
+        return entry
+
+    def _report(self, stream):
+        if not self._order:
+            return
+        stream.write(
+            "\ncontextional: {} failure(s) and error(s), {} distinct:\n"
+            .format(
+                sum(entry._count for entry in self._order),
+                len(self._order),
+            ),
+        )
+        for entry in self._order:
+            stream.write(
+                "  {} ({} occurrence(s))\n".format(
+                    entry._error.message,
+                    entry._count,
+                ),
+            )
+            for group_id in entry._groups[:self._max_paths]:
+                stream.write("    {}\n".format(group_id))
+            if len(entry._groups) > self._max_paths:
+                stream.write(
+                    "    (and {} more)\n".format(
+                        len(entry._groups) - self._max_paths,
+                    ),
+                )
+        if self._path is not None:
+            with open(self._path, "w") as f:
+                json.dump(
+                    {
+                        "tracebacks": [
+                            {
+                                "error": entry._error.message,
+                                "first": entry._location,
+                                "count": entry._count,
+                                "groups": entry._groups,
+                                "traceback": entry._error.text,
+                            }
+                            for entry in self._order
+                        ],
+                    },
+                    f,
+                    indent=1,
+                    sort_keys=True,
+                )
@@ -0,0 +1,99 @@
+from __future__ import absolute_import
+
+from contextional.listener import Listener
+
+
+def walk_groups(groups):
+    """Go through groups and all of their descendants.
+
+    :param groups: The groups to start from (e.g. the root groups of the run).
+    :type groups: list of :class:`.Group`
+
+    Each group comes before its children, in the order they were added, so
+    the groups come in the same order as they're run.
+    """
+    for group in groups:
+        yield group
+        for descendant in walk_groups(group._children):
+            yield descendant
+
+
+class NestedWriter(Listener):
+    """A :class:`.Listener` that writes each group inside its parent.
+
+    Groups are opened and closed by their ancestry, rather than by the order
+    they're set up and torn down in. A session group stays set up while the
+    root groups of other modules run, so its element is closed before theirs
+    are opened, and opened again when one of its own root groups runs.
+
+    Subclasses write the start of a group in :meth:`_open` and its end in
+    :meth:`_close`, and call :meth:`_nest` before writing anything that
+    belongs to a group.
+    """
+
+    def __init__(self):
+        # the groups whose elements are open, from the outermost in.
+        self._open_groups = []
+
+    def _open(self, group, child, timestamp):
+        """Write the start of a group.
+
+        :param group: The group to open.
+        :type group: :class:`.Group`
+        :param child: The child of the group that's opened right after it,
+            or ``None`` if the group itself is about to be written to.
+        :type child: :class:`.Group`
+        :param timestamp: When the group was opened.
+        :type timestamp: float
+        """
+        raise NotImplementedError
+
+    def _close(self, group, timestamp, exited):
+        """Write the end of a group.
+
+        :param group: The group to close.
+        :type group: :class:`.Group`
+        :param timestamp: When the group was closed, or ``None`` if it's
+            being closed because the run is over.
+        :type timestamp: float
+        :param exited: Whether the group was torn down, rather than closed
+            to make way for another group.
+        :type exited: bool
+        """
+        raise NotImplementedError
+
+    def _nest(self, group, timestamp):
+        """Make the open groups the ancestry of a group.
+
+        :param group: The group that's about to be written to, or ``None``
+            to close every open group.
+        :type group: :class:`.Group`
+        :param timestamp: When it happened.
+        :type timestamp: float
+        """
+        ancestry = [] if group is None else group._setup_ancestry
+        kept = 0
+        for open_group, ancestor in zip(self._open_groups, ancestry):
+            if open_group is not ancestor:
+                break
+            kept += 1
+        while len(self._open_groups) > kept:
+            self._close(self._open_groups.pop(), timestamp, False)
+        for i in range(kept, len(ancestry)):
+            child = ancestry[i + 1] if i + 1 < len(ancestry) else None
+            self._open(ancestry[i], child, timestamp)
+            self._open_groups.append(ancestry[i])
+
+    def group_enter(self, group, timestamp):
+        # a session group is set up before the root group that needs it, so
+        # it's opened along with that root group instead, to know which of
+        # its root groups it's opened for.
+        if not group._session_scoped:
+            self._nest(group, timestamp)
+
+    def group_exit(self, group, timestamp):
+        if group not in self._open_groups:
+            return
+        self._nest(group, timestamp)
+        self._open_groups.pop()
+        self._close(group, timestamp, True)